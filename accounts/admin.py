@@ -2,15 +2,25 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from django.utils.translation import gettext_lazy as _
 from django.utils.html import format_html  # Bu importni qo'shing
-from .models import CustomUser
+from django.db import transaction
+from . import audit
+from .tasks import enqueue_user_activated
+from .models import AuditLog, CustomUser, Job, Warehouse, WarehouseMembership
+
+class WarehouseMembershipInline(admin.TabularInline):
+    model = WarehouseMembership
+    # Rol foydalanuvchi rolidan avtomatik olinadi
+    fields = ('warehouse', 'is_active')
+    extra = 0
 
 @admin.register(CustomUser)
 class CustomUserAdmin(UserAdmin):
     list_display = ('username', 'email', 'first_name', 'last_name', 'colored_role', 'phone_number', 'is_active', 'is_staff', 'date_joined')
-    list_filter = ('role', 'is_active', 'is_staff', 'is_superuser', 'date_joined')
+    list_filter = ('role', 'registration_status', 'is_active', 'is_staff', 'is_superuser', 'date_joined')
     search_fields = ('username', 'email', 'first_name', 'last_name', 'phone_number')
     ordering = ('-date_joined',)
-    readonly_fields = ('date_joined', 'last_login')
+    readonly_fields = ('date_joined', 'last_login', 'registration_status')
+    inlines = [WarehouseMembershipInline]
     
     fieldsets = (
         (None, {'fields': ('username', 'password')}),
@@ -19,7 +29,7 @@ class CustomUserAdmin(UserAdmin):
             'fields': ('is_active', 'is_staff', 'is_superuser', 'groups', 'user_permissions'),
         }),
         (_('Important dates'), {'fields': ('last_login', 'date_joined')}),
-        (_('Role Information'), {'fields': ('role',)}),
+        (_('Role Information'), {'fields': ('role', 'registration_status')}),
     )
     
     add_fieldsets = (
@@ -75,8 +85,25 @@ class CustomUserAdmin(UserAdmin):
     # Qo'shimcha admin actionlar
     actions = ['activate_users', 'deactivate_users']
     
+    def save_model(self, request, obj, form, change):
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            if not change:
+                audit.record('created', obj.pk, actor=request.user, source='admin')
+
     def activate_users(self, request, queryset):
-        updated = queryset.update(is_active=True)
+        # UPDATE holat mashinasini chetlab o'tadi, shuning uchun faqat ruxsat etilgan
+        # holatlar olinadi. Rad etilgan so'rov ommaviy tasdiqlanmaydi - faqat alohida
+        statuses = set(CustomUser.statuses_allowing(CustomUser.STATUS_APPROVED)) - {CustomUser.STATUS_REJECTED}
+        with transaction.atomic():
+            # Audit uchun id'lar bitta so'rov bilan olinadi, so'ng bitta UPDATE
+            targets = queryset.filter(registration_status__in=statuses)
+            user_ids = list(targets.values_list('pk', flat=True))
+            updated = targets.update(is_active=True, registration_status=CustomUser.STATUS_APPROVED)
+            audit.record('activated', user_ids, actor=request.user, source='admin')
+            # Filtr faqat haqiqiy o'tishlarni oladi - har biriga bitta xabarnoma
+            for user_id in user_ids:
+                enqueue_user_activated(user_id)
         self.message_user(request, f"{updated} ta foydalanuvchi faollashtirildi")
     activate_users.short_description = "Tanlangan foydalanuvchilarni faollashtirish"
     
@@ -87,29 +114,48 @@ class CustomUserAdmin(UserAdmin):
             self.message_user(request, "Super admin foydalanuvchilarni faolsizlantirish mumkin emas!", level='ERROR')
             return
         
-        regular_users = queryset.filter(is_superuser=False)
-        updated = regular_users.update(is_active=False)
+        with transaction.atomic():
+            targets = queryset.filter(
+                is_superuser=False,
+                registration_status__in=CustomUser.statuses_allowing(CustomUser.STATUS_DEACTIVATED),
+            )
+            user_ids = list(targets.values_list('pk', flat=True))
+            updated = targets.update(is_active=False, registration_status=CustomUser.STATUS_DEACTIVATED)
+            audit.record('deactivated', user_ids, actor=request.user, source='admin')
         self.message_user(request, f"{updated} ta foydalanuvchi faolsizlantirildi")
     deactivate_users.short_description = "Tanlangan foydalanuvchilarni faolsizlantirish"
 
-    
-from django.contrib import messages
 
-# CustomUserAdmin class ichiga qo'shing
-def activate_users(self, request, queryset):
-    """Tanlangan foydalanuvchilarni faollashtirish"""
-    updated = queryset.update(is_active=True)
-    self.message_user(request, f"{updated} ta foydalanuvchi faollashtirildi", messages.SUCCESS)
-activate_users.short_description = "Tanlangan foydalanuvchilarni faollashtirish"
+@admin.register(Warehouse)
+class WarehouseAdmin(admin.ModelAdmin):
+    list_display = ('code', 'name', 'is_main', 'is_active', 'created_at')
+    list_filter = ('is_main', 'is_active')
+    search_fields = ('code', 'name')
+    ordering = ('code',)
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'status', 'attempts', 'run_at', 'locked_by', 'updated_at')
+    list_filter = ('status', 'name')
+    readonly_fields = ('created_at', 'updated_at')
+    ordering = ('-id',)
 
-def deactivate_users(self, request, queryset):
-    """Tanlangan foydalanuvchilarni faolsizlantirish"""
-    updated = queryset.update(is_active=False)
-    self.message_user(request, f"{updated} ta foydalanuvchi faolsizlantirildi", messages.WARNING)
-deactivate_users.short_description = "Tanlangan foydalanuvchilarni faolsizlantirish"
 
-# actions ga qo'shing
-actions = [activate_users, deactivate_users]
+@admin.register(AuditLog)
+class AuditLogAdmin(admin.ModelAdmin):
+    list_display = ('created_at', 'action', 'source', 'actor', 'target')
+    list_filter = ('action', 'source')
+    list_select_related = ('actor', 'target')
+    raw_id_fields = ('actor', 'target')
+    ordering = ('-created_at',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
 
 # Admin panel sarlavhasini o'zgartirish
 admin.site.site_header = "Qurilish Mollari CRM Tizimi"
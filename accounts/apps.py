@@ -2,4 +2,8 @@ from django.apps import AppConfig
 
 class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'accounts'
\ No newline at end of file
+    name = 'accounts'
+
+    def ready(self):
+        # Fon vazifalari bajaruvchilarini ro'yxatdan o'tkazish
+        from . import tasks  # noqa: F401
@@ -0,0 +1,148 @@
+"""
+O'qish endpoint'larining native async variantlari (ASGI uchun).
+
+DRF 3.14 view'lari ASGI ostida ham sinxron thread'da bajariladi. Bu
+yerdagi view'lar oddiy Django async view'lari: JWT tekshiruvi va
+serializatsiya event loop'da, foydalanuvchi va ro'yxatlar esa async ORM
+(``aget``, ``async for``) orqali o'qiladi. Javob formati DRF variantlari
+bilan bir xil.
+
+WSGI ostida ham ishlaydi, lekin u yerda har bir so'rov uchun alohida
+event loop ochiladi - async variantlar faqat ASGI'da foydali.
+"""
+from functools import wraps
+
+from django.http import JsonResponse
+from rest_framework import serializers
+from rest_framework.permissions import IsAuthenticated
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import CustomUser, WarehouseMembership
+from .permissions import MANAGED_ROLES, CanManageUsers, scope_users
+from .serializers import UserSerializer
+from .tokens import WAREHOUSES_CLAIM
+
+
+class AsyncJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication, foydalanuvchi async ORM bilan o'qiladi"""
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+        try:
+            user = await CustomUser.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except CustomUser.DoesNotExist:
+            raise AuthenticationFailed("User not found", code='user_not_found')
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code='user_inactive')
+        return user
+
+
+authenticator = AsyncJWTAuthentication()
+
+
+def async_api_view(permission_class):
+    """``@api_view(['GET'])`` + ``@permission_classes`` ning async muqobili"""
+    permission = permission_class()
+
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return JsonResponse(
+                    {'detail': f'Method "{request.method}" not allowed.'}, status=405
+                )
+            try:
+                result = await authenticator.aauthenticate(request)
+            except (InvalidToken, AuthenticationFailed) as e:
+                detail = e.detail if isinstance(e.detail, dict) else {'detail': e.detail}
+                return JsonResponse(detail, status=401, headers={
+                    'WWW-Authenticate': authenticator.authenticate_header(request)
+                })
+            if result is None:
+                return JsonResponse(
+                    {'detail': 'Authentication credentials were not provided.'}, status=401,
+                    headers={'WWW-Authenticate': authenticator.authenticate_header(request)}
+                )
+            request.user, request.auth = result
+            if not permission.has_permission(request, view):
+                return JsonResponse(
+                    {'detail': 'You do not have permission to perform this action.'}, status=403
+                )
+            return await view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+async def aget_warehouse_ids(request):
+    if WAREHOUSES_CLAIM in request.auth:
+        return request.auth[WAREHOUSES_CLAIM]
+    return sorted([
+        warehouse_id async for warehouse_id in WarehouseMembership.objects.filter(
+            user_id=request.user.pk, is_active=True, warehouse__is_active=True
+        ).values_list('warehouse_id', flat=True)
+    ])
+
+
+async def _user_list_response(request, queryset, roles=None):
+    try:
+        fields = UserSerializer.parse_fields(request.GET.get('fields'))
+    except serializers.ValidationError as e:
+        return JsonResponse(e.detail, status=400)
+    if request.user.role != 'super_admin':
+        queryset = scope_users(
+            queryset, request, roles=roles, warehouse_ids=await aget_warehouse_ids(request)
+        )
+    # DRF variantidagi kabi: faqat kerakli ustunlar, model obyektlarisiz
+    users = [user async for user in queryset.values(*(fields or UserSerializer.Meta.fields))]
+    return JsonResponse(UserSerializer(users, many=True, fields=fields).data, safe=False)
+
+
+# ============ PROFILE & AUTH CHECK VIEWS ============
+
+@async_api_view(IsAuthenticated)
+async def user_profile(request):
+    try:
+        fields = UserSerializer.parse_fields(request.GET.get('fields'))
+    except serializers.ValidationError as e:
+        return JsonResponse(e.detail, status=400)
+    return JsonResponse(UserSerializer(request.user, fields=fields).data)
+
+
+@async_api_view(IsAuthenticated)
+async def check_auth(request):
+    return JsonResponse({
+        'user': request.user.username,
+        'is_authenticated': request.user.is_authenticated,
+        'role': request.user.role
+    })
+
+
+# ============ USER LIST VIEWS ============
+
+@async_api_view(CanManageUsers)
+async def user_list(request):
+    # Super admin uchun cheklov (shu jumladan rollar) qo'llanmaydi
+    return await _user_list_response(request, CustomUser.objects.all(), roles=MANAGED_ROLES)
+
+
+@async_api_view(CanManageUsers)
+async def pending_users(request):
+    queryset = CustomUser.objects.filter(
+        registration_status=CustomUser.STATUS_PENDING
+    ).order_by('date_joined')
+    return await _user_list_response(request, queryset)
@@ -0,0 +1,68 @@
+"""
+Foydalanuvchilarni boshqarish amallari uchun audit jurnali.
+
+Yozuvlar so'rov davomida xotirada yig'iladi va tranzaksiya commit
+qilinganda bitta ``bulk_create`` bilan saqlanadi. Tranzaksiya bekor
+qilinsa, yozuvlar ham tashlab yuboriladi.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .models import AuditLog
+
+
+class _AuditBuffer:
+    """Bitta tranzaksiyaga tegishli yozuvlar; ``on_commit`` orqali chaqiriladi"""
+
+    def __init__(self, using):
+        self.using = using
+        self.entries = []
+        self.flushed = False
+
+    def __call__(self):
+        self.flushed = True
+        entries, self.entries = self.entries, []
+        if entries:
+            AuditLog.objects.using(self.using).bulk_create(entries, batch_size=1000)
+
+
+def _pending_buffer(using):
+    # Bufer faqat aynan shu savepoint'da ro'yxatdan o'tgan bo'lsa qayta
+    # ishlatiladi: ichki savepoint bekor qilinsa, Django uning callback'ini
+    # (va yozuvlarini) o'chiradi, tashqi buferga qo'shilganlari esa qolib ketardi
+    connection = transaction.get_connection(using)
+    sids = set(connection.savepoint_ids)
+    for entry in connection.run_on_commit:
+        if isinstance(entry[1], _AuditBuffer) and not entry[1].flushed and entry[0] == sids:
+            return entry[1]
+    return None
+
+
+def record(action, target_ids, actor=None, source='api', using=None):
+    """Bir yoki bir nechta foydalanuvchi uchun audit yozuvini qo'shish.
+
+    Atomic blok ichida chaqirilsa, yozuvlar commit paytida saqlanadi;
+    aks holda darhol (baribir bitta INSERT bilan) saqlanadi.
+    """
+    if isinstance(target_ids, int):
+        target_ids = [target_ids]
+    actor_id = actor.pk if actor is not None and actor.is_authenticated else None
+    now = timezone.now()
+    entries = [
+        AuditLog(actor_id=actor_id, target_id=target_id, action=action,
+                 source=source, created_at=now)
+        for target_id in target_ids
+    ]
+    if not entries:
+        return
+
+    using = using or 'default'
+    if not transaction.get_connection(using).in_atomic_block:
+        AuditLog.objects.using(using).bulk_create(entries, batch_size=1000)
+        return
+
+    buffer = _pending_buffer(using)
+    if buffer is None:
+        buffer = _AuditBuffer(using)
+        transaction.on_commit(buffer, using=using)
+    buffer.entries.extend(entries)
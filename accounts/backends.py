@@ -0,0 +1,59 @@
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password
+from django.db.models import Q
+
+from . import password_upgrade
+from .models import CustomUser
+from .utils import classify_identifier
+
+
+class IdentifierBackend(ModelBackend):
+    """Foydalanuvchi nomi, email yoki telefon raqami orqali autentifikatsiya.
+
+    Identifikator normallashtiriladi va foydalanuvchi bitta indekslangan
+    ustun bo'yicha bitta so'rov bilan topiladi. Email yoki telefonga o'xshash
+    foydalanuvchi nomlari (``'901234567'``) uchun shu so'rovga username sharti
+    ham qo'shiladi: email/telefon bo'yicha topilmasa username ishlatiladi.
+    Foydalanuvchi topilmasa
+    ham parol xeshlanadi, shunda javob vaqti identifikator mavjudligini
+    oshkor qilmaydi.
+
+    Eskirgan parol xeshi login paytida emas, javob yuborilgandan keyin
+    fonda yangilanadi (accounts.password_upgrade).
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(CustomUser.USERNAME_FIELD)
+        if not username or password is None:
+            return None
+
+        field, value = classify_identifier(username)
+        username = username.strip()
+        lookup = Q(username=username)
+        if field != 'username':
+            lookup |= Q(**{field: value})
+        candidates = list(CustomUser._default_manager.filter(lookup)[:3])
+        users = [user for user in candidates if getattr(user, field) == value] or \
+            [user for user in candidates if user.username == username]
+        # Bir nechta foydalanuvchiga mos kelsa (masalan, umumiy telefon) - kirish rad etiladi
+        if len(users) != 1:
+            # Vaqt bo'yicha farqni yo'qotish uchun soxta xeshlash
+            CustomUser().set_password(password)
+            return None
+
+        user = users[0]
+        if request is not None:
+            # Muvaffaqiyatsiz urinish statistikada shu foydalanuvchi roli/omborlariga yoziladi
+            request._login_candidate = user
+        if self.check_password(request, user, password) and self.user_can_authenticate(user):
+            return user
+        return None
+
+    def check_password(self, request, user, password):
+        # AbstractBaseUser.check_password xeshni shu yerning o'zida qayta yozadi - uni ishlatmaymiz
+        outdated = []
+        valid = check_password(password, user.password, setter=outdated.append)
+        if valid and outdated:
+            password_upgrade.schedule(user.pk, password, user.password, request=request)
+        return valid
@@ -0,0 +1,150 @@
+"""
+Bir nechta API chaqiruvini bitta so'rovda bajarish.
+
+Batch so'rovi bir marta autentifikatsiya qilinadi; ichki chaqiruvlar
+``accounts.urls`` resolveri orqali shu jarayonning o'zida bajariladi va
+tashqi so'rovning foydalanuvchisi, tokeni va DB ulanishidan foydalanadi.
+Ichki javoblar qayta parse qilinmaydi - render qilingan JSON baytlari
+umumiy javobga to'g'ridan-to'g'ri qo'shiladi.
+
+Middleware'lar ichki chaqiruvlarga qo'llanmaydi (ular tashqi so'rovda
+bir marta ishlaydi).
+"""
+import io
+import json
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.urls import Resolver404, resolve
+
+URLCONF = 'accounts.urls'
+ALLOWED_METHODS = {'GET', 'POST', 'PUT', 'PATCH', 'DELETE'}
+# Ichki chaqiruv bu sarlavhalarni o'zgartira olmaydi - autentifikatsiya tashqi so'rovdan olinadi
+FORBIDDEN_HEADERS = {
+    'authorization', 'cookie', 'host', 'content-length', 'content-type',
+    # IP tashqi so'rovniki bo'lib qoladi - ichki chaqiruv IP throttle'ni aylanib o'tolmaydi
+    'x-forwarded-for', 'x-real-ip',
+}
+SKIPPED_RESPONSE_HEADERS = {'content-type', 'content-length'}
+
+DEFAULTS = {
+    'MAX_CALLS': 10,
+    'MAX_CALL_BODY_BYTES': 16 * 1024,
+    'MAX_CALL_RESPONSE_BYTES': 1024 * 1024,
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'BATCH_API', {}).get(name, DEFAULTS[name])
+
+
+class CallError(Exception):
+    def __init__(self, status_code, message):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _error(status_code, message):
+    return status_code, {}, json.dumps({'error': message}).encode()
+
+
+def _build_request(request, prefix, call):
+    if not isinstance(call, dict):
+        raise CallError(400, "Har bir chaqiruv obyekt bo'lishi kerak")
+    method = str(call.get('method', 'GET')).upper()
+    if method not in ALLOWED_METHODS:
+        raise CallError(405, f"'{method}' metodi qo'llab-quvvatlanmaydi")
+    path = call.get('path')
+    if not isinstance(path, str) or not path:
+        raise CallError(400, "path maydoni kiritilishi shart")
+
+    path, _, query_string = path.partition('?')
+    # 'check-auth/' va '/api/auth/check-auth/' ikkalasi ham qabul qilinadi
+    relative = path[len(prefix):] if path.startswith(prefix) else path.lstrip('/')
+    try:
+        match = resolve('/' + relative, urlconf=URLCONF)
+    except Resolver404:
+        raise CallError(404, f"'{path}' topilmadi")
+    if match.url_name == 'batch':
+        raise CallError(400, "Ichma-ich batch so'rovlari ruxsat etilmaydi")
+
+    body = b''
+    if call.get('body') is not None:
+        body = json.dumps(call['body']).encode()
+        if len(body) > get_setting('MAX_CALL_BODY_BYTES'):
+            raise CallError(413, "Chaqiruv tanasi juda katta")
+
+    headers = call.get('headers') or {}
+    if not isinstance(headers, dict):
+        raise CallError(400, "headers obyekt bo'lishi kerak")
+
+    environ = {
+        key: value for key, value in request.META.items()
+        if not key.startswith('wsgi.') and key not in ('CONTENT_LENGTH', 'CONTENT_TYPE', 'HTTP_IDEMPOTENCY_KEY')
+    }
+    for name, value in headers.items():
+        if name.lower() in FORBIDDEN_HEADERS:
+            continue
+        environ['HTTP_' + name.upper().replace('-', '_')] = str(value)
+    environ.update({
+        'REQUEST_METHOD': method,
+        'SCRIPT_NAME': '',
+        'PATH_INFO': prefix + relative,
+        'QUERY_STRING': query_string,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.url_scheme': request.scheme,
+    })
+    sub_request = WSGIRequest(environ)
+    sub_request.resolver_match = match
+    # DRF ForcedAuthentication: ichki view JWT'ni qayta tekshirmaydi va foydalanuvchini qayta o'qimaydi
+    sub_request._force_auth_user = request.user
+    sub_request._force_auth_token = request.auth
+    return sub_request, match
+
+
+def run_call(request, prefix, call):
+    """Bitta ichki chaqiruv: (status, sarlavhalar, JSON baytlari)"""
+    try:
+        sub_request, match = _build_request(request, prefix, call)
+    except CallError as e:
+        return _error(e.status_code, str(e))
+
+    try:
+        view = match.func
+        if iscoroutinefunction(view):
+            # Async view'lar - batch o'zi sinxron view
+            view = async_to_sync(view)
+        response = view(sub_request, *match.args, **match.kwargs)
+        if response.streaming:
+            return _error(406, "Oqimli javoblar batch ichida qo'llab-quvvatlanmaydi")
+        if hasattr(response, 'render') and not response.is_rendered:
+            response.render()
+    except Exception as e:
+        return _error(500, f'Server xatosi: {str(e)}')
+
+    content = response.content
+    if len(content) > get_setting('MAX_CALL_RESPONSE_BYTES'):
+        return _error(413, "Chaqiruv javobi juda katta")
+    if not content:
+        content = b'null'
+    elif not response.get('Content-Type', '').startswith('application/json'):
+        content = json.dumps(content.decode(response.charset, 'replace')).encode()
+    headers = {
+        name: value for name, value in response.items()
+        if name.lower() not in SKIPPED_RESPONSE_HEADERS
+    }
+    return response.status_code, headers, content
+
+
+def run_batch(request, prefix, calls):
+    """Barcha chaqiruvlarni ketma-ket bajarib, ``{"responses": [...]}`` JSON baytlarini qaytarish"""
+    parts = []
+    for call in calls:
+        status_code, headers, content = run_call(request, prefix, call)
+        parts.append(b'{"status":%d,"headers":%s,"body":%s}' % (
+            status_code, json.dumps(headers).encode(), content
+        ))
+    return b'{"responses":[' + b','.join(parts) + b']}'
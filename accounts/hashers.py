@@ -0,0 +1,83 @@
+"""
+Parolni bilmasdan eski PBKDF2 xeshlarini kuchaytirish.
+
+Django yangilanganda PBKDF2 iteratsiyalari oshadi, lekin eski xeshlar
+faqat foydalanuvchi login qilganda qayta xeshlanadi. Uzoq vaqt kirmagan
+foydalanuvchilar xeshini ``manage.py password_hashes --upgrade`` shu
+hasher bilan o'raydi: eski ``pbkdf2_sha256`` natijasi ustidan yetishmayotgan
+iteratsiyalar soni bilan yana PBKDF2 hisoblanadi. Tekshirish umumiy
+ishi joriy iteratsiyalarga teng bo'ladi; keyingi login'da xesh oddiy
+``pbkdf2_sha256`` ga (fon rejimida) o'tkaziladi.
+
+    pbkdf2_wrapped_pbkdf2_sha256$<tashqi iter>$<ichki iter>$<salt>$<hash>
+"""
+import base64
+import hashlib
+
+from django.contrib.auth.hashers import BasePasswordHasher, get_hasher, mask_hash
+from django.utils.crypto import constant_time_compare, pbkdf2
+from django.utils.translation import gettext_noop as _
+
+
+class PBKDF2WrappedPBKDF2PasswordHasher(BasePasswordHasher):
+    algorithm = 'pbkdf2_wrapped_pbkdf2_sha256'
+    inner_algorithm = 'pbkdf2_sha256'
+    digest = hashlib.sha256
+
+    def can_wrap(self, encoded):
+        """Xesh o'ralishi kerakmi: iteratsiyasi joriydan kam pbkdf2_sha256"""
+        if not encoded or not encoded.startswith(self.inner_algorithm + '$'):
+            return False
+        inner = get_hasher(self.inner_algorithm)
+        return inner.decode(encoded)['iterations'] < inner.iterations
+
+    def wrap(self, encoded):
+        """Eski ``pbkdf2_sha256`` xeshini parolsiz o'rash"""
+        inner = get_hasher(self.inner_algorithm)
+        decoded = inner.decode(encoded)
+        iterations = max(inner.iterations - decoded['iterations'], 1)
+        return self._encode_wrapped(decoded['hash'], decoded['salt'], decoded['iterations'], iterations)
+
+    def _encode_wrapped(self, inner_hash, salt, inner_iterations, iterations):
+        hash = pbkdf2(inner_hash, salt, iterations, digest=self.digest)
+        hash = base64.b64encode(hash).decode('ascii').strip()
+        return f'{self.algorithm}${iterations}${inner_iterations}${salt}${hash}'
+
+    def decode(self, encoded):
+        algorithm, iterations, inner_iterations, salt, hash = encoded.split('$', 4)
+        assert algorithm == self.algorithm
+        return {
+            'algorithm': algorithm,
+            'hash': hash,
+            'iterations': int(iterations),
+            'inner_iterations': int(inner_iterations),
+            'salt': salt,
+        }
+
+    def verify(self, password, encoded):
+        decoded = self.decode(encoded)
+        inner_encoded = get_hasher(self.inner_algorithm).encode(
+            password, decoded['salt'], decoded['inner_iterations']
+        )
+        encoded_2 = self._encode_wrapped(
+            inner_encoded.split('$', 3)[3], decoded['salt'],
+            decoded['inner_iterations'], decoded['iterations'],
+        )
+        return constant_time_compare(encoded, encoded_2)
+
+    def safe_summary(self, encoded):
+        decoded = self.decode(encoded)
+        return {
+            _('algorithm'): decoded['algorithm'],
+            _('iterations'): decoded['iterations'],
+            _('inner iterations'): decoded['inner_iterations'],
+            _('salt'): mask_hash(decoded['salt']),
+            _('hash'): mask_hash(decoded['hash']),
+        }
+
+    def must_update(self, encoded):
+        # Birinchi muvaffaqiyatli login'da oddiy pbkdf2_sha256 ga o'tkaziladi
+        return True
+
+    def harden_runtime(self, password, encoded):
+        pass
@@ -0,0 +1,175 @@
+"""
+``Idempotency-Key`` sarlavhasini qo'llab-quvvatlash.
+
+Kalit bilan kelgan birinchi so'rov javobi saqlanadi; shu kalit bilan
+qayta yuborilgan so'rov validatsiya, parol xeshlash va yozishlarsiz
+darhol saqlangan javobni oladi. Bir vaqtda kelgan dublikatlar uchun
+yozuvning o'zi qulf vazifasini bajaradi (unique ``key_hash``).
+"""
+import hashlib
+import json
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+
+from .models import IdempotencyRecord
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+# (modul, view nomi) -> scope; throttle'lar replay'ni tanishi uchun
+_SCOPES = {}
+
+
+def _setting(name, default):
+    return getattr(settings, 'IDEMPOTENCY', {}).get(name, default)
+
+
+def _request_hash(request):
+    # Tanada parol bor, shuning uchun oddiy sha256 emas, HMAC ishlatiladi
+    data = request.data
+    if hasattr(data, 'lists'):
+        data = dict(data.lists())
+    body = json.dumps(data, sort_keys=True, default=str)
+    return salted_hmac('accounts.idempotency', body, algorithm='sha256').hexdigest()
+
+
+def _key_hash(request, scope, key):
+    user_id = request.user.pk if request.user.is_authenticated else ''
+    return hashlib.sha256(f'{scope}:{user_id}:{key}'.encode()).hexdigest()
+
+
+def is_replay(request, view):
+    """So'rov saqlangan javobni qayta olish (replay) bo'ladimi.
+
+    Throttle'lar ``@idempotent`` dan oldin ishlaydi; replay hech qanday ish
+    bajarmaydi, shuning uchun ular uni limitga qo'shmaydi - aks holda tarmoq
+    xatosidan keyingi qayta urinish 429 olishi mumkin edi.
+    """
+    key = request.headers.get(HEADER)
+    scope = _SCOPES.get((type(view).__module__, type(view).__name__))
+    if not key or scope is None or len(key) > MAX_KEY_LENGTH:
+        return False
+    # Bir nechta throttle bitta so'rovni tekshiradi - bitta SELECT yetadi
+    replay = getattr(request, '_idempotent_replay', None)
+    if replay is None:
+        replay = request._idempotent_replay = IdempotencyRecord.objects.filter(
+            key_hash=_key_hash(request, scope, key),
+            request_hash=_request_hash(request),
+            status_code__isnull=False,
+            expires_at__gt=timezone.now(),
+        ).exists()
+    return replay
+
+
+def _acquire(key_hash, request_hash):
+    """Kalitni band qilish. Band qilinsa None, aks holda mavjud yozuv qaytadi."""
+    now = timezone.now()
+    ttl = timedelta(seconds=_setting('TTL', 24 * 3600))
+    # Qayta urinishlar uchun tez yo'l: bitta SELECT
+    record = IdempotencyRecord.objects.filter(key_hash=key_hash).first()
+    if record is None:
+        try:
+            with transaction.atomic():
+                IdempotencyRecord.objects.create(
+                    key_hash=key_hash, request_hash=request_hash, expires_at=now + ttl
+                )
+            return None
+        except IntegrityError:
+            # Parallel dublikat bizdan oldin band qildi
+            return IdempotencyRecord.objects.filter(key_hash=key_hash).first()
+
+    lock_timeout = timedelta(seconds=_setting('LOCK_TIMEOUT', 60))
+    abandoned = record.status_code is None and record.created_at < now - lock_timeout
+    if record.expires_at <= now or abandoned:
+        # Muddati o'tgan yoki to'xtab qolgan so'rov kalitini qayta egallash
+        taken = IdempotencyRecord.objects.filter(
+            pk=record.pk, created_at=record.created_at
+        ).update(
+            request_hash=request_hash, status_code=None, response=None,
+            created_at=now, expires_at=now + ttl,
+        )
+        return None if taken else record
+    return record
+
+
+def idempotent(scope):
+    """Function view'ni ``Idempotency-Key`` bilan himoyalash.
+
+    ``@api_view`` va ``@permission_classes`` dan keyin (pastda) qo'yiladi,
+    shunda autentifikatsiya va ruxsatlar avval tekshiriladi. Throttle'lar
+    ham avval ishlaydi, lekin ``is_replay`` orqali replay'ni o'tkazib yuboradi.
+    """
+    # Modul darajasida emas: rest_framework.response (renderers, compat) ~50 ms,
+    # purge_expired'ni chaqiradigan cron buyrug'iga kerak emas
+    from rest_framework import status
+    from rest_framework.response import Response
+
+    def decorator(view):
+        _SCOPES[(view.__module__, view.__name__)] = scope
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            key = request.headers.get(HEADER)
+            if not key:
+                return view(request, *args, **kwargs)
+            if len(key) > MAX_KEY_LENGTH:
+                return Response(
+                    {'error': f'{HEADER} {MAX_KEY_LENGTH} belgidan oshmasligi kerak'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            key_hash = _key_hash(request, scope, key)
+            request_hash = _request_hash(request)
+
+            record = _acquire(key_hash, request_hash)
+            if record is not None:
+                if record.request_hash != request_hash:
+                    return Response(
+                        {'error': f'Bu {HEADER} boshqa so\'rov uchun ishlatilgan'},
+                        status=status.HTTP_422_UNPROCESSABLE_ENTITY
+                    )
+                if record.status_code is None:
+                    return Response(
+                        {'error': 'Shu kalitli so\'rov hali bajarilmoqda'},
+                        status=status.HTTP_409_CONFLICT,
+                        headers={'Retry-After': '1'}
+                    )
+                return Response(
+                    record.response, status=record.status_code,
+                    headers={'Idempotent-Replayed': 'true'}
+                )
+
+            try:
+                response = view(request, *args, **kwargs)
+            except Exception:
+                IdempotencyRecord.objects.filter(key_hash=key_hash).delete()
+                raise
+
+            if response.status_code >= 500:
+                # Server xatolari saqlanmaydi - mijoz qayta urinishi mumkin
+                IdempotencyRecord.objects.filter(key_hash=key_hash).delete()
+            else:
+                IdempotencyRecord.objects.filter(key_hash=key_hash).update(
+                    status_code=response.status_code, response=response.data
+                )
+            return response
+        return wrapper
+    return decorator
+
+
+def purge_expired(batch_size=1000):
+    """Muddati o'tgan yozuvlarni bo'laklab o'chirish"""
+    deleted = 0
+    while True:
+        pks = list(
+            IdempotencyRecord.objects.filter(expires_at__lte=timezone.now())
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not pks:
+            return deleted
+        deleted += IdempotencyRecord.objects.filter(pk__in=pks).delete()[0]
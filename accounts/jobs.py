@@ -0,0 +1,133 @@
+"""
+Ma'lumotlar bazasiga asoslangan yengil fon vazifalari navbati.
+
+View'lar faqat ``enqueue()`` chaqiradi, og'ir ishlar (email, SMS va h.k.)
+``manage.py run_workers`` buyrug'i orqali alohida bajariladi.
+"""
+import logging
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = {}
+
+
+def job_handler(name):
+    """Vazifa bajaruvchisini ro'yxatdan o'tkazish uchun dekorator.
+
+    Bajaruvchilar idempotent bo'lishi kerak: vazifa qayta urinishda
+    yoki ishchi to'xtab qolganda bir necha marta bajarilishi mumkin.
+    """
+    def decorator(func):
+        HANDLERS[name] = func
+        return func
+    return decorator
+
+
+def _setting(name, default):
+    return getattr(settings, 'JOB_QUEUE', {}).get(name, default)
+
+
+def enqueue(name, payload=None, key=None, delay=0, max_attempts=None):
+    """Vazifani navbatga qo'shish.
+
+    ``key`` berilsa, shu kalitli vazifa allaqachon mavjud bo'lsa yangisi
+    yaratilmaydi va mavjud vazifa qaytariladi.
+    """
+    fields = {
+        'name': name,
+        'payload': payload or {},
+        'run_at': timezone.now() + timedelta(seconds=delay),
+        'max_attempts': max_attempts or _setting('MAX_ATTEMPTS', 5),
+    }
+    if key is None:
+        return Job.objects.create(**fields)
+
+    try:
+        with transaction.atomic():
+            return Job.objects.create(key=key, **fields)
+    except IntegrityError:
+        return Job.objects.get(key=key)
+
+
+def backoff_delay(attempts):
+    """Eksponensial kutish vaqti (soniya), tasodifiy jitter bilan"""
+    base = _setting('BACKOFF_BASE', 5)
+    cap = _setting('BACKOFF_MAX', 3600)
+    delay = min(cap, base * (2 ** (attempts - 1)))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def claim_jobs(worker_id, limit=10):
+    """Bajarish uchun vazifalarni band qilish.
+
+    ``SELECT ... FOR UPDATE SKIP LOCKED`` qo'llab-quvvatlansa (PostgreSQL,
+    MySQL 8) ishchilar bir-birini kutmaydi. SQLite'da esa shartli UPDATE
+    orqali har bir vazifani faqat bitta ishchi oladi.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        qs = Job.objects.filter(
+            status=Job.STATUS_PENDING, run_at__lte=now
+        ).order_by('run_at')
+        if connection.features.has_select_for_update_skip_locked:
+            qs = qs.select_for_update(skip_locked=True)
+        candidates = list(qs.values_list('pk', flat=True)[:limit])
+
+        claimed = []
+        for pk in candidates:
+            updated = Job.objects.filter(pk=pk, status=Job.STATUS_PENDING).update(
+                status=Job.STATUS_RUNNING,
+                locked_at=now,
+                locked_by=worker_id,
+                updated_at=now,
+            )
+            if updated:
+                claimed.append(pk)
+
+    return list(Job.objects.filter(pk__in=claimed).order_by('run_at'))
+
+
+def run_job(job):
+    """Bitta vazifani bajarish va natijani saqlash"""
+    handler = HANDLERS.get(job.name)
+    now = timezone.now()
+    job.attempts += 1
+    try:
+        if handler is None:
+            raise LookupError(f"Noma'lum vazifa: {job.name}")
+        handler(**job.payload)
+    except Exception as e:
+        logger.exception("Vazifa bajarilmadi: %s", job)
+        job.last_error = f"{type(e).__name__}: {e}"
+        if job.attempts >= job.max_attempts:
+            job.status = Job.STATUS_FAILED
+        else:
+            job.status = Job.STATUS_PENDING
+            job.run_at = now + timedelta(seconds=backoff_delay(job.attempts))
+    else:
+        job.status = Job.STATUS_DONE
+        job.last_error = ''
+
+    job.locked_at = None
+    job.locked_by = ''
+    job.save(update_fields=[
+        'status', 'attempts', 'run_at', 'locked_at', 'locked_by', 'last_error', 'updated_at'
+    ])
+    return job
+
+
+def release_stale_jobs(timeout=None):
+    """To'xtab qolgan ishchilar band qilgan vazifalarni navbatga qaytarish"""
+    timeout = timeout or _setting('LOCK_TIMEOUT', 600)
+    threshold = timezone.now() - timedelta(seconds=timeout)
+    return Job.objects.filter(
+        status=Job.STATUS_RUNNING, locked_at__lt=threshold
+    ).update(status=Job.STATUS_PENDING, locked_at=None, locked_by='')
@@ -0,0 +1,184 @@
+"""
+Login faolligi: xom hodisalar va soatlik/kunlik yig'indilar.
+
+``record()`` hodisani jarayon xotirasidagi buferga qo'shadi; bufer
+``BATCH_SIZE`` ga yetganda yoki birinchi hodisadan ``FLUSH_INTERVAL`` soniya
+o'tganda (fon taymeri, yangi login kutilmaydi) bitta ``bulk_create`` bilan
+yoziladi. Jarayon kutilmaganda to'xtasa, buferdagi
+(eng ko'pi bilan bitta paket) hodisalar yo'qoladi - bu statistika uchun
+maqbul.
+
+``rollup()`` (``manage.py rollup_login_events`` orqali, cron'da) xom
+hodisalarni LoginStat'ga yig'adi, ``prune()`` esa yig'ilgan va saqlash
+muddati o'tgan hodisalarni o'chiradi. Oxirgi ``ROLLUP_LOOKBACK_HOURS``
+soat har safar qayta hisoblanadi, shuning uchun kech yozilgan paketlar
+ham yig'indiga tushadi.
+"""
+import atexit
+import logging
+import os
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Count, Max, Q
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from .models import LoginEvent, LoginStat
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'BATCH_SIZE': 200,
+    'FLUSH_INTERVAL': 5,
+    'RETENTION_DAYS': 7,
+    'ROLLUP_LOOKBACK_HOURS': 2,
+}
+
+_lock = threading.Lock()
+_buffer = []
+_timer = None
+
+
+def get_setting(name):
+    return getattr(settings, 'LOGIN_EVENTS', {}).get(name, DEFAULTS[name])
+
+
+def record(kind, user_id=None, role='', warehouse_ids=None):
+    event = LoginEvent(
+        created_at=timezone.now(), kind=kind, user_id=user_id, role=role or '',
+        warehouse_id=min(warehouse_ids) if warehouse_ids else None,
+    )
+    global _timer
+    with _lock:
+        _buffer.append(event)
+        due = len(_buffer) >= get_setting('BATCH_SIZE')
+        if not due and _timer is None:
+            _timer = threading.Timer(get_setting('FLUSH_INTERVAL'), _flush_on_timer)
+            _timer.daemon = True
+            _timer.start()
+    if due:
+        flush()
+
+
+def record_failed(user=None):
+    """Muvaffaqiyatsiz urinish; identifikator mavjud foydalanuvchiga mos kelsa - uning roli va omborlari bilan"""
+    if user is None:
+        record(LoginEvent.KIND_FAILED)
+    else:
+        # simplejwt importi rollup_login_events buyrug'iga kerak emas
+        from .tokens import user_warehouse_ids
+        record(LoginEvent.KIND_FAILED, user.pk, user.role, user_warehouse_ids(user.pk))
+
+
+def _flush_on_timer():
+    try:
+        flush()
+    finally:
+        # Taymer thread'i o'z DB ulanishini ochgan - u qayta ishlatilmaydi
+        connections.close_all()
+
+
+def _reset_after_fork():
+    # Taymer thread'i fork'dan keyin bolada yo'q - bufer bola jarayonida yangidan boshlanadi
+    global _lock, _timer
+    _lock = threading.Lock()
+    _timer = None
+    del _buffer[:]
+
+
+def flush():
+    """Buferdagi hodisalarni bitta INSERT bilan yozish"""
+    global _timer
+    with _lock:
+        events = _buffer[:]
+        del _buffer[:]
+        if _timer is not None:
+            _timer.cancel()
+            _timer = None
+    if not events:
+        return 0
+    try:
+        LoginEvent.objects.bulk_create(events, batch_size=1000)
+    except Exception:
+        # Statistika xatosi login'ni buzmasligi kerak
+        logger.exception("%d ta login hodisasini yozib bo'lmadi", len(events))
+        return 0
+    return len(events)
+
+
+atexit.register(flush)
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+PERIODS = (
+    (LoginStat.PERIOD_HOUR, TruncHour),
+    (LoginStat.PERIOD_DAY, TruncDay),
+)
+
+
+def _recompute_start(period, now):
+    """Shu vaqtdan boshlangan bucket'lar qayta hisoblanadi (None - hammasi)"""
+    last = LoginStat.objects.filter(period=period).aggregate(Max('bucket'))['bucket__max']
+    if last is None:
+        return None
+    local = timezone.localtime(now - timedelta(hours=get_setting('ROLLUP_LOOKBACK_HOURS')))
+    if period == LoginStat.PERIOD_HOUR:
+        lookback = local.replace(minute=0, second=0, microsecond=0)
+    else:
+        lookback = local.replace(hour=0, minute=0, second=0, microsecond=0)
+    return min(last, lookback)
+
+
+def rollup(now=None):
+    """Xom hodisalarni soatlik va kunlik yig'indilarga aylantirish; {davr: qatorlar} qaytaradi"""
+    flush()
+    now = now or timezone.now()
+    result = {}
+    for period, trunc in PERIODS:
+        start = _recompute_start(period, now)
+        events = LoginEvent.objects.all()
+        if start is not None:
+            events = events.filter(created_at__gte=start)
+        rows = events.annotate(bucket=trunc('created_at')).values(
+            'bucket', 'role', 'warehouse_id'
+        ).annotate(
+            logins=Count('id', filter=Q(kind=LoginEvent.KIND_LOGIN)),
+            failed=Count('id', filter=Q(kind=LoginEvent.KIND_FAILED)),
+            refreshes=Count('id', filter=Q(kind=LoginEvent.KIND_REFRESH)),
+            active_users=Count('user_id', distinct=True, filter=Q(
+                kind__in=[LoginEvent.KIND_LOGIN, LoginEvent.KIND_REFRESH]
+            )),
+        ).order_by()
+        stats = [LoginStat(period=period, **row) for row in rows]
+        with transaction.atomic():
+            stale = LoginStat.objects.filter(period=period)
+            if start is not None:
+                stale = stale.filter(bucket__gte=start)
+            stale.delete()
+            LoginStat.objects.bulk_create(stats, batch_size=1000)
+        result[period] = len(stats)
+    return result
+
+
+def prune(now=None, batch_size=10000):
+    """Yig'ilgan va saqlash muddati o'tgan hodisalarni bo'laklab o'chirish"""
+    now = now or timezone.now()
+    # Keyingi rollup qayta hisoblaydigan bucket'lar uchun xom hodisalar saqlanadi
+    day_start = _recompute_start(LoginStat.PERIOD_DAY, now)
+    if day_start is None:
+        return 0
+    cutoff = min(now - timedelta(days=get_setting('RETENTION_DAYS')), day_start)
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            ids = list(
+                LoginEvent.objects.filter(created_at__lt=cutoff)
+                .order_by('created_at').values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            LoginEvent.objects.filter(pk__in=ids).delete()
+        deleted += len(ids)
+    return deleted
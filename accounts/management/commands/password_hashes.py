@@ -0,0 +1,115 @@
+import multiprocessing
+import time
+from collections import Counter
+
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX, get_hasher, identify_hasher
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+
+from accounts.hashers import PBKDF2WrappedPBKDF2PasswordHasher
+from accounts.models import CustomUser
+
+
+def describe(encoded, preferred):
+    """(algoritm, parametr, eskirganmi) - parolni tekshirmasdan, faqat xesh matnidan"""
+    if not encoded or encoded.startswith(UNUSABLE_PASSWORD_PREFIX):
+        return 'unusable', '-', False
+    try:
+        hasher = identify_hasher(encoded)
+        decoded = hasher.decode(encoded)
+    except Exception:
+        return encoded.split('$', 1)[0] or 'unknown', '?', True
+    params = ', '.join(
+        f'{key}={decoded[key]}' for key in
+        ('iterations', 'inner_iterations', 'work_factor', 'time_cost', 'memory_cost', 'parallelism')
+        if key in decoded
+    ) or '-'
+    if hasher.algorithm == PBKDF2WrappedPBKDF2PasswordHasher.algorithm:
+        # O'ralgan xesh login'da almashtiriladi (must_update), lekin umumiy ishi joriy bo'lsa eskirgan emas
+        outdated = preferred.algorithm != hasher.inner_algorithm or \
+            decoded['iterations'] + decoded['inner_iterations'] < preferred.iterations
+    else:
+        outdated = hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+    return hasher.algorithm, params, outdated
+
+
+def wrap_batch(rows):
+    """Pool worker: [(pk, eski xesh)] -> [(pk, eski xesh, yangi xesh)] (bazaga murojaatsiz)"""
+    hasher = PBKDF2WrappedPBKDF2PasswordHasher()
+    return [(pk, encoded, hasher.wrap(encoded)) for pk, encoded in rows]
+
+
+class Command(BaseCommand):
+    help = "Parol xeshlari algoritmi va iteratsiyalari bo'yicha hisobot; eski xeshlarni parolsiz kuchaytirish"
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--upgrade', action='store_true',
+            help="Eski pbkdf2_sha256 xeshlarini parallel ravishda o'rab kuchaytirish"
+        )
+        parser.add_argument('--workers', type=int, default=multiprocessing.cpu_count())
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--limit', type=int, default=None, help="Ko'pi bilan shuncha foydalanuvchi")
+
+    def handle(self, *args, **options):
+        self.report()
+        if options['upgrade']:
+            self.upgrade(options)
+            self.report()
+
+    def report(self):
+        preferred = get_hasher('default')
+        counts = Counter()
+        for encoded in CustomUser.objects.values_list('password', flat=True).iterator(chunk_size=5000):
+            counts[describe(encoded, preferred)] += 1
+
+        total = sum(counts.values())
+        self.stdout.write(f"Jami: {total} foydalanuvchi, joriy hasher: {preferred.algorithm}")
+        for (algorithm, params, outdated), count in counts.most_common():
+            state = 'eskirgan' if outdated else 'joriy'
+            self.stdout.write(f"  {algorithm:32s} {params:40s} {count:>9} ({count / total:6.1%})  {state}")
+
+    def pending_batches(self, batch_size, limit):
+        hasher = PBKDF2WrappedPBKDF2PasswordHasher()
+        rows = CustomUser.objects.filter(
+            password__startswith=hasher.inner_algorithm + '$'
+        ).values_list('pk', 'password')
+        batch, found = [], 0
+        for pk, encoded in rows.iterator(chunk_size=5000):
+            if not hasher.can_wrap(encoded):
+                continue
+            batch.append((pk, encoded))
+            found += 1
+            if len(batch) == batch_size or found == limit:
+                yield batch
+                batch = []
+            if found == limit:
+                return
+        if batch:
+            yield batch
+
+    def upgrade(self, options):
+        # Bo'laklar oldindan o'qiladi: fork qilingan jarayonlar ota ulanishini ishlatmasligi kerak
+        batches = list(self.pending_batches(options['batch_size'], options['limit']))
+        if not batches:
+            self.stdout.write("Kuchaytiriladigan xesh yo'q")
+            return
+        connections.close_all()
+
+        started = time.perf_counter()
+        upgraded = skipped = 0
+        with multiprocessing.get_context('fork').Pool(options['workers']) as pool:
+            for results in pool.imap_unordered(wrap_batch, batches):
+                with transaction.atomic():
+                    for pk, old, new in results:
+                        # Shu orada parol o'zgargan yoki login'da yangilangan bo'lsa tegmaymiz
+                        if CustomUser.objects.filter(pk=pk, password=old).update(password=new):
+                            upgraded += 1
+                        else:
+                            skipped += 1
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{upgraded} ta xesh kuchaytirildi, {skipped} tasi o'tkazib yuborildi "
+            f"({elapsed:.1f} s, {upgraded / elapsed:,.0f} xesh/s, {options['workers']} jarayon)"
+        ))
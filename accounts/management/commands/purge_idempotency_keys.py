@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from accounts.idempotency import purge_expired
+
+
+class Command(BaseCommand):
+    help = "Muddati o'tgan Idempotency-Key yozuvlarini o'chirish"
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        deleted = purge_expired(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"{deleted} ta yozuv o'chirildi"))
@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from accounts import audit
+from accounts.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = "N kundan eski tasdiqlanmagan ro'yxatdan o'tish so'rovlarini rad etish yoki o'chirish"
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help="Shuncha kundan eski so'rovlar")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--delete', action='store_true',
+            help="Rad etish (arxivlash) o'rniga butunlay o'chirish"
+        )
+        parser.add_argument('--dry-run', action='store_true', help="Faqat sonini ko'rsatish")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        # Qisman indeks (user_pending_joined_idx) bo'yicha o'qiladi
+        stale = CustomUser.objects.filter(
+            registration_status=CustomUser.STATUS_PENDING, date_joined__lt=cutoff
+        )
+        if options['dry_run']:
+            self.stdout.write(f"{stale.count()} ta eskirgan so'rov topildi")
+            return
+
+        processed = 0
+        while True:
+            # Har bir bo'lak alohida qisqa tranzaksiyada - jadval uzoq bloklanmaydi
+            with transaction.atomic():
+                user_ids = list(stale.order_by('date_joined').values_list('pk', flat=True)[:options['batch_size']])
+                if not user_ids:
+                    break
+                batch = CustomUser.objects.filter(pk__in=user_ids)
+                if options['delete']:
+                    batch.delete()
+                else:
+                    batch.update(registration_status=CustomUser.STATUS_REJECTED, is_active=False)
+                    audit.record('rejected', user_ids, source='retention')
+            processed += len(user_ids)
+
+        action = "o'chirildi" if options['delete'] else "rad etildi"
+        self.stdout.write(self.style.SUCCESS(f"{processed} ta eskirgan so'rov {action}"))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from accounts import login_events
+
+
+class Command(BaseCommand):
+    help = "Login hodisalarini soatlik/kunlik statistikaga yig'ish va eskilarini o'chirish (cron uchun)"
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--no-prune', action='store_true', help="Xom hodisalarni o'chirmaslik")
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        result = login_events.rollup()
+        self.stdout.write(
+            f"Yig'indilar: {result['hour']} ta soatlik, {result['day']} ta kunlik qator yangilandi"
+        )
+        if not options['no_prune']:
+            deleted = login_events.prune(batch_size=options['batch_size'])
+            self.stdout.write(f"{deleted} ta eski hodisa o'chirildi")
+        self.stdout.write(self.style.SUCCESS("Tayyor"))
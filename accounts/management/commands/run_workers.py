@@ -0,0 +1,71 @@
+import logging
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from accounts.jobs import claim_jobs, release_stale_jobs, run_job
+
+logger = logging.getLogger('accounts.jobs')
+
+
+class Command(BaseCommand):
+    help = "Fon vazifalari navbatini bajaruvchi ishchilarni ishga tushirish"
+    # Cron/CLI uchun: system check'lar URLconf va barcha view'larni import qiladi
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=4, help="Ishchi oqimlar soni")
+        parser.add_argument('--batch', type=int, default=10, help="Bir marta olinadigan vazifalar soni")
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Navbat bo'sh bo'lganda kutish (soniya)")
+        parser.add_argument('--once', action='store_true', help="Navbat bo'shaguncha ishlab, so'ng chiqish")
+
+    def handle(self, *args, **options):
+        self.stop = threading.Event()
+        released = release_stale_jobs()
+        if released:
+            self.stdout.write(f"{released} ta to'xtab qolgan vazifa navbatga qaytarildi")
+
+        workers = options['workers']
+        self.stdout.write(f"{workers} ta ishchi ishga tushirildi")
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(self.work, n, options['batch'], options['poll_interval'], options['once'])
+                for n in range(workers)
+            ]
+            try:
+                processed = sum(f.result() for f in futures)
+            except KeyboardInterrupt:
+                self.stop.set()
+                processed = sum(f.result() for f in futures)
+
+        self.stdout.write(self.style.SUCCESS(f"{processed} ta vazifa bajarildi"))
+
+    def work(self, n, batch, poll_interval, once):
+        worker_id = f"{socket.gethostname()}:{os.getpid()}:{n}"
+        processed = 0
+        try:
+            while not self.stop.is_set():
+                close_old_connections()
+                try:
+                    jobs = claim_jobs(worker_id, limit=batch)
+                    if not jobs:
+                        if once:
+                            break
+                        self.stop.wait(poll_interval)
+                        continue
+                    for job in jobs:
+                        run_job(job)
+                        processed += 1
+                except Exception:
+                    # Masalan, SQLite'da "database is locked" - ishchi to'xtamaydi, keyinroq qayta urinadi.
+                    # Band qilingan, lekin saqlanmagan vazifalarni release_stale_jobs() qaytaradi
+                    logger.exception("Ishchi %s: navbatni qayta ishlashda xato", worker_id)
+                    connection.close()
+                    self.stop.wait(poll_interval)
+        finally:
+            connection.close()
+        return processed
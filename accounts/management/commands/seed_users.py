@@ -0,0 +1,240 @@
+import base64
+import json
+import multiprocessing
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, connections, transaction
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from accounts.models import CustomUser, Warehouse, WarehouseMembership
+
+FIRST_NAMES = [
+    'Aziz', 'Bekzod', 'Dilshod', 'Eldor', 'Farrux', 'Jasur', 'Otabek', 'Sardor', 'Sherzod', 'Ulugbek',
+    'Dilnoza', 'Gulnora', 'Kamola', 'Madina', 'Malika', 'Nigora', 'Nodira', 'Sevara', 'Shahnoza', 'Zarina',
+]
+LAST_NAMES = [
+    'Abdullayev', 'Aliyev', 'Karimov', 'Rahimov', 'Tursunov', 'Usmonov', 'Xolmatov', 'Yusupov',
+    'Ergashev', 'Hasanov', 'Ismoilov', 'Mirzayev', 'Nazarov', 'Qodirov', 'Saidov', 'Toshmatov',
+]
+# Haqiqiy taqsimotga yaqin: qabul qiluvchilar ko'p, adminlar kam
+ROLE_WEIGHTS = [
+    ('super_admin', 1),
+    ('main_warehouse_admin', 4),
+    ('warehouse_admin', 15),
+    ('main_warehouse_forwarder', 30),
+    ('warehouse_receiver', 50),
+]
+STATUS_WEIGHTS = [
+    (CustomUser.STATUS_APPROVED, 85),
+    (CustomUser.STATUS_PENDING, 8),
+    (CustomUser.STATUS_DEACTIVATED, 5),
+    (CustomUser.STATUS_REJECTED, 2),
+]
+
+
+def _b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+
+def build_chunk(seed, chunk_index, start, count, password_hash, now):
+    """Bitta bo'lak uchun foydalanuvchi obyektlari (seed va bo'lak raqami bo'yicha deterministik)"""
+    rng = random.Random(f'{seed}:{chunk_index}')
+    roles, role_weights = zip(*ROLE_WEIGHTS)
+    statuses, status_weights = zip(*STATUS_WEIGHTS)
+    role_list = rng.choices(roles, role_weights, k=count)
+    status_list = rng.choices(statuses, status_weights, k=count)
+
+    users = []
+    for offset in range(count):
+        n = start + offset
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        username = f'{first}.{last}.{n}'.lower()
+        email = f'{username}@seed.warehouse.uz'
+        phone = f'+99890{n:07d}' if n < 10 ** 7 else None
+        status = status_list[offset]
+        joined = now - timedelta(seconds=rng.randrange(2 * 365 * 86400))
+        users.append(CustomUser(
+            username=username,
+            password=password_hash,
+            first_name=first,
+            last_name=last,
+            email=email,
+            email_normalized=email,
+            phone_number=phone,
+            phone_normalized=phone,
+            role=role_list[offset],
+            registration_status=status,
+            is_active=status == CustomUser.STATUS_APPROVED,
+            date_joined=joined,
+            last_login=joined + timedelta(days=rng.randrange(30)) if status != CustomUser.STATUS_PENDING else None,
+        ))
+    return rng, users
+
+
+def build_tokens(rng, user_ids, token_ratio, blacklist_ratio, now):
+    header = _b64(json.dumps({'alg': 'HS256', 'typ': 'JWT'}).encode())
+    outstanding, blacklisted_jtis = [], []
+    for user_id in user_ids:
+        if rng.random() >= token_ratio:
+            continue
+        jti = '%032x' % rng.getrandbits(128)
+        created = now - timedelta(seconds=rng.randrange(7 * 86400))
+        expires = created + timedelta(days=7)
+        payload = _b64(json.dumps({
+            'token_type': 'refresh', 'exp': int(expires.timestamp()), 'iat': int(created.timestamp()),
+            'jti': jti, 'user_id': user_id,
+        }).encode())
+        # Imzo tasodifiy: seed tokenlar faqat jadval hajmi uchun, haqiqiy login uchun emas
+        token = f'{header}.{payload}.{_b64(rng.randbytes(32))}'
+        outstanding.append(OutstandingToken(
+            user_id=user_id, jti=jti, token=token, created_at=created, expires_at=expires
+        ))
+        if rng.random() < blacklist_ratio:
+            blacklisted_jtis.append(jti)
+    return outstanding, blacklisted_jtis
+
+
+def ensure_warehouses(count):
+    """Seed omborlari (birinchisi - asosiy); id'lar ro'yxati"""
+    warehouse_ids = []
+    for n in range(count):
+        code = 'SEED-MAIN' if n == 0 else f'SEED-{n:02d}'
+        warehouse, _ = Warehouse.objects.get_or_create(
+            code=code, defaults={'name': f'Seed ombor {n}', 'is_main': n == 0}
+        )
+        warehouse_ids.append(warehouse.pk)
+    return warehouse_ids
+
+
+def build_memberships(rng, users, warehouse_ids):
+    """super_admin - a'zoliksiz, main_* rollar - asosiy ombor, qolganlar - 1-2 ta filial"""
+    main_id, branch_ids = warehouse_ids[0], warehouse_ids[1:] or warehouse_ids
+    memberships = []
+    for user in users:
+        if user.role == 'super_admin':
+            continue
+        if user.role.startswith('main_warehouse'):
+            ids = [main_id]
+        else:
+            ids = rng.sample(branch_ids, 2 if len(branch_ids) > 1 and rng.random() < 0.1 else 1)
+        memberships += [
+            WarehouseMembership(user_id=user.pk, warehouse_id=warehouse_id, role=user.role)
+            for warehouse_id in ids
+        ]
+    return memberships
+
+
+def bulk_create_with_pks(model, objs, batch_size, key):
+    """``bulk_create`` + pk'lar (keyingi jadvallar FK uchun).
+
+    PostgreSQL/SQLite pk'larni INSERT'ning o'zidan qaytaradi; MySQL/MariaDB
+    qaytarmaydi - u yerda pk'lar noyob ``key`` ustuni bo'yicha qayta o'qiladi.
+    """
+    created = model.objects.bulk_create(objs, batch_size=batch_size)
+    if not connection.features.can_return_rows_from_bulk_insert:
+        for i in range(0, len(created), batch_size):
+            batch = created[i:i + batch_size]
+            pks = dict(
+                model.objects.filter(**{f'{key}__in': [getattr(obj, key) for obj in batch]})
+                .values_list(key, 'pk')
+            )
+            for obj in batch:
+                obj.pk = pks[getattr(obj, key)]
+    return created
+
+
+def seed_chunk(args):
+    """Bitta bo'lakni bitta tranzaksiyada yozish; (users, memberships, tokens, blacklisted) qaytaradi"""
+    (seed, chunk_index, start, count, password_hash, batch_size, token_ratio, blacklist_ratio,
+     warehouse_ids, now) = args
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            # Faqat shu ulanish uchun: seed ma'lumotlari uchun fsync shart emas
+            cursor.execute('PRAGMA synchronous = OFF')
+
+    rng, users = build_chunk(seed, chunk_index, start, count, password_hash, now)
+    with transaction.atomic():
+        created = bulk_create_with_pks(CustomUser, users, batch_size, 'username')
+        # Alohida rng: a'zoliklar qo'shilishi mavjud seed'lardagi tokenlarni o'zgartirmaydi
+        memberships = WarehouseMembership.objects.bulk_create(
+            build_memberships(random.Random(f'{seed}:{chunk_index}:warehouses'), created, warehouse_ids),
+            batch_size=batch_size,
+        )
+        tokens = blacklisted = 0
+        if token_ratio > 0:
+            outstanding, blacklisted_jtis = build_tokens(
+                rng, [user.pk for user in created], token_ratio, blacklist_ratio, now
+            )
+            outstanding = bulk_create_with_pks(OutstandingToken, outstanding, batch_size, 'jti')
+            by_jti = {token.jti: token for token in outstanding}
+            BlacklistedToken.objects.bulk_create(
+                [BlacklistedToken(token=by_jti[jti], blacklisted_at=now) for jti in blacklisted_jtis],
+                batch_size=batch_size,
+            )
+            tokens, blacklisted = len(outstanding), len(blacklisted_jtis)
+    return len(created), len(memberships), tokens, blacklisted
+
+
+class Command(BaseCommand):
+    help = "Masshtab testlari uchun sintetik foydalanuvchilar va tokenlar yaratish"
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=10000, help="Yaratiladigan foydalanuvchilar soni")
+        parser.add_argument('--seed', type=int, default=42, help="Deterministik natija uchun seed")
+        parser.add_argument('--chunk-size', type=int, default=50000, help="Bitta tranzaksiyadagi qatorlar")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Bitta INSERT dagi qatorlar")
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Parallel jarayonlar (standart: SQLite uchun 1, boshqalar uchun CPU soni)")
+        parser.add_argument('--password', default='Seed12345', help="Barcha foydalanuvchilar paroli")
+        parser.add_argument('--token-ratio', type=float, default=0.3, help="Refresh tokeni bor foydalanuvchilar ulushi")
+        parser.add_argument('--blacklist-ratio', type=float, default=0.2, help="Qora ro'yxatdagi tokenlar ulushi")
+        parser.add_argument('--warehouses', type=int, default=10, help="Seed omborlari soni (asosiy ombor bilan)")
+        parser.add_argument('--start', type=int, default=None,
+                            help="Username raqamlash boshlanishi (standart: mavjud qatorlar soni)")
+
+    def handle(self, *args, **options):
+        count, chunk_size = options['count'], options['chunk_size']
+        workers = options['workers'] or (1 if connection.vendor == 'sqlite' else multiprocessing.cpu_count())
+        start = options['start'] if options['start'] is not None else CustomUser.objects.count()
+
+        # Parol bir marta xeshlanadi - PBKDF2 har bir qator uchun emas
+        password_hash = make_password(options['password'])
+        warehouse_ids = ensure_warehouses(max(1, options['warehouses']))
+        now = timezone.now()
+        tasks = [
+            (options['seed'], index, start + offset, min(chunk_size, count - offset), password_hash,
+             options['batch_size'], options['token_ratio'], options['blacklist_ratio'], warehouse_ids, now)
+            for index, offset in enumerate(range(0, count, chunk_size))
+        ]
+
+        self.stdout.write(f"{count} ta foydalanuvchi, {len(tasks)} bo'lak, {workers} jarayon...")
+        started = time.perf_counter()
+        totals = [0, 0, 0, 0]
+        if workers == 1:
+            results = map(seed_chunk, tasks)
+        else:
+            # fork qilingan jarayonlar ota jarayon ulanishini ishlatmasligi kerak
+            connections.close_all()
+            pool = multiprocessing.get_context('fork').Pool(workers)
+            results = pool.imap_unordered(seed_chunk, tasks)
+        try:
+            for result in results:
+                totals = [a + b for a, b in zip(totals, result)]
+                elapsed = time.perf_counter() - started
+                self.stdout.write(f"  {totals[0]:>10} qator, {totals[0] / elapsed:,.0f} qator/s")
+        finally:
+            if workers != 1:
+                pool.close()
+                pool.join()
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{totals[0]} foydalanuvchi, {totals[1]} a'zolik, {totals[2]} token ({totals[3]} qora ro'yxatda) "
+            f"{elapsed:.1f} s ichida yaratildi - {totals[0] / elapsed:,.0f} foydalanuvchi/s"
+        ))
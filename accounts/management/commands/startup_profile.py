@@ -0,0 +1,104 @@
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+_IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def parse_importtime(stderr):
+    """``-X importtime`` chiqishini [(modul, self_us, cumulative_us, chuqurlik)] ga aylantirish"""
+    modules = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if match:
+            modules.append((match[4], int(match[1]), int(match[2]), len(match[3]) // 2))
+    return modules
+
+
+class Command(BaseCommand):
+    help = "Ishga tushish vaqti va xotirasini ilova, modul va AppConfig.ready bo'yicha o'lchash"
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--mode', choices=['full', 'cli'], default=os.environ.get('DJANGO_STARTUP_MODE', 'full'),
+            help="Sozlamalar rejimi (DJANGO_STARTUP_MODE)"
+        )
+        parser.add_argument('--output', default='startup_profile.json', help="JSON hisobot fayli")
+        parser.add_argument('--top', type=int, default=20, help="Eng sekin modullar soni")
+        parser.add_argument('--no-urls', action='store_true',
+                            help="URLconf yuklanishini o'lchamaslik (cli rejimida doim - buyruqlar uni yuklamaydi)")
+
+    def run_probe(self, mode, *flags):
+        env = dict(os.environ, DJANGO_STARTUP_MODE=mode)
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-m', 'accounts.startup_probe', *flags],
+            capture_output=True, text=True, env=env, cwd=settings.BASE_DIR,
+        )
+        if result.returncode != 0:
+            raise CommandError(result.stderr[-2000:])
+        return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+    def handle(self, *args, **options):
+        flags = ['--no-urls'] if options['no_urls'] or options['mode'] == 'cli' else []
+        # Vaqt tracemalloc'siz o'lchanadi (u importlarni sekinlashtiradi), xotira - alohida ishga tushirishda
+        timing, stderr = self.run_probe(options['mode'], *flags)
+        memory, _ = self.run_probe(options['mode'], '--memory', *flags)
+
+        modules = parse_importtime(stderr)
+        packages = Counter()
+        for name, self_us, _, _ in modules:
+            packages[name.split('.')[0]] += self_us
+
+        steps = timing['steps']
+        for key, values in memory['steps'].items():
+            steps.setdefault(key, {}).update({k: v for k, v in values.items() if k.endswith('_kb')})
+
+        report = {
+            'mode': options['mode'],
+            'python': sys.version.split()[0],
+            'total_ms': timing['total_ms'],
+            'import_total_ms': round(sum(m[1] for m in modules) / 1000, 3),
+            'max_rss_kb': timing.get('max_rss_kb'),
+            'traced_kb': memory.get('traced_kb'),
+            'traced_peak_kb': memory.get('traced_peak_kb'),
+            'installed_apps': timing['installed_apps'],
+            'apps': {
+                key[len('app:'):]: values for key, values in steps.items() if key.startswith('app:')
+            },
+            'phases': {
+                key: values for key, values in steps.items() if not key.startswith('app:')
+            },
+            'packages_ms': {
+                name: round(us / 1000, 3) for name, us in packages.most_common()
+            },
+            'modules': [
+                {'module': name, 'self_ms': round(self_us / 1000, 3),
+                 'cumulative_ms': round(cumulative / 1000, 3), 'depth': depth}
+                for name, self_us, cumulative, depth in
+                sorted(modules, key=lambda m: m[2], reverse=True)
+            ],
+        }
+        with open(options['output'], 'w') as f:
+            json.dump(report, f, indent=2)
+
+        self.stdout.write(f"Rejim: {report['mode']}, jami: {report['total_ms']:.1f} ms, "
+                          f"importlar: {report['import_total_ms']:.1f} ms, max RSS: {report['max_rss_kb']} KB")
+        for name, values in report['phases'].items():
+            self.stdout.write(f"  {name:45s} {next(iter(values.values())):8.1f} ms")
+        self.stdout.write("\nIlovalar (import / models / ready, ms):")
+        for name, values in report['apps'].items():
+            self.stdout.write(
+                f"  {name:45s} {values.get('import_ms', 0):8.1f} {values.get('models_ms', 0):8.1f} "
+                f"{values.get('ready_ms', 0):8.1f}   {values.get('import_kb', 0) + values.get('models_kb', 0) + values.get('ready_kb', 0):8.1f} KB"
+            )
+        self.stdout.write(f"\nEng sekin {options['top']} ta paket (o'z vaqti, ms):")
+        for name, ms in list(report['packages_ms'].items())[:options['top']]:
+            self.stdout.write(f"  {name:45s} {ms:8.1f}")
+        self.stdout.write(self.style.SUCCESS(f"\nHisobot saqlandi: {options['output']}"))
@@ -0,0 +1,40 @@
+# Generated by Django 4.2 on 2026-10-19 14:06
+
+from django.db import migrations, models
+
+from accounts.utils import normalize_email, normalize_phone
+
+
+def fill_normalized_identifiers(apps, schema_editor):
+    CustomUser = apps.get_model('accounts', 'CustomUser')
+    batch = []
+    for user in CustomUser.objects.only('id', 'email', 'phone_number').iterator(chunk_size=2000):
+        user.email_normalized = normalize_email(user.email)
+        user.phone_normalized = normalize_phone(user.phone_number)
+        batch.append(user)
+        if len(batch) >= 2000:
+            CustomUser.objects.bulk_update(batch, ['email_normalized', 'phone_normalized'])
+            batch = []
+    if batch:
+        CustomUser.objects.bulk_update(batch, ['email_normalized', 'phone_normalized'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_idempotencyrecord'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='email_normalized',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=254, null=True),
+        ),
+        migrations.AddField(
+            model_name='customuser',
+            name='phone_normalized',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=16, null=True),
+        ),
+        migrations.RunPython(fill_normalized_identifiers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2 on 2026-10-19 14:07
+
+from django.db import migrations, models
+
+
+def set_initial_status(apps, schema_editor):
+    # Hech qachon kirmagan faolsiz foydalanuvchilar - tasdiq kutayotgan so'rovlar,
+    # qolgan faolsizlar - faolsizlantirilgan xodimlar
+    CustomUser = apps.get_model('accounts', 'CustomUser')
+    inactive = CustomUser.objects.filter(is_active=False)
+    inactive.filter(last_login__isnull=True).update(registration_status='pending')
+    inactive.filter(last_login__isnull=False).update(registration_status='deactivated')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_customuser_normalized_identifiers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='registration_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected'), ('deactivated', 'Deactivated')], default='approved', max_length=12),
+        ),
+        migrations.RunPython(set_initial_status, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='action',
+            field=models.CharField(choices=[('registered', 'Registered'), ('created', 'Created'), ('activated', 'Activated'), ('deactivated', 'Deactivated'), ('rejected', 'Rejected')], max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='customuser',
+            index=models.Index(condition=models.Q(('registration_status', 'pending')), fields=['date_joined'], name='user_pending_joined_idx'),
+        ),
+    ]
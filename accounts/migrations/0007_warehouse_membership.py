@@ -0,0 +1,46 @@
+# Generated by Django 4.2 on 2026-10-19 14:19
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_customuser_registration_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Warehouse',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=150)),
+                ('code', models.CharField(max_length=30, unique=True)),
+                ('address', models.CharField(blank=True, max_length=255)),
+                ('is_main', models.BooleanField(default=False)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='WarehouseMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('super_admin', 'Super Admin'), ('main_warehouse_admin', 'Main Warehouse Admin'), ('warehouse_admin', 'Warehouse Admin'), ('main_warehouse_forwarder', 'Main Warehouse Forwarder'), ('warehouse_receiver', 'Warehouse Receiver')], max_length=30)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='warehouse_memberships', to=settings.AUTH_USER_MODEL)),
+                ('warehouse', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='accounts.warehouse')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='warehousemembership',
+            index=models.Index(fields=['warehouse', 'role', 'is_active', 'user'], name='membership_scope_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='warehousemembership',
+            constraint=models.UniqueConstraint(fields=('user', 'warehouse'), name='membership_user_warehouse_uniq'),
+        ),
+    ]
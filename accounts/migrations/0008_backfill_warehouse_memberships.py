@@ -0,0 +1,41 @@
+# Generated by Django 4.2 on 2026-10-19 16:02
+
+from django.db import migrations
+
+
+def backfill_memberships(apps, schema_editor):
+    # 0007 gacha foydalanuvchilarda ombor ma'lumoti yo'q edi. A'zoliksiz qolgan
+    # xodimlar hech bir ro'yxatga tushmaydi va token'ida omborlar bo'lmaydi,
+    # shuning uchun ular asosiy omborga biriktiriladi (keyin admin'da tuzatiladi)
+    CustomUser = apps.get_model('accounts', 'CustomUser')
+    Warehouse = apps.get_model('accounts', 'Warehouse')
+    WarehouseMembership = apps.get_model('accounts', 'WarehouseMembership')
+
+    users = CustomUser.objects.exclude(role='super_admin').filter(warehouse_memberships__isnull=True)
+    if not users.exists():
+        return
+    main = Warehouse.objects.filter(is_main=True).order_by('pk').first()
+    if main is None:
+        main, _ = Warehouse.objects.get_or_create(
+            code='MAIN', defaults={'name': 'Asosiy ombor', 'is_main': True}
+        )
+    while True:
+        # A'zolik olganlar filtrdan chiqadi - har safar keyingi bo'lak
+        batch = list(users.order_by('pk').values_list('pk', 'role')[:1000])
+        if not batch:
+            return
+        WarehouseMembership.objects.bulk_create([
+            WarehouseMembership(user_id=user_id, warehouse_id=main.pk, role=role)
+            for user_id, role in batch
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_warehouse_membership'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_memberships, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2 on 2026-10-19 14:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_backfill_warehouse_memberships'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoginEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(db_index=True)),
+                ('kind', models.PositiveSmallIntegerField(choices=[(1, 'Login'), (2, 'Failed login'), (3, 'Token refresh')])),
+                ('user_id', models.IntegerField(null=True)),
+                ('role', models.CharField(blank=True, max_length=30)),
+                ('warehouse_id', models.IntegerField(null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='LoginStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('hour', 'Hour'), ('day', 'Day')], max_length=4)),
+                ('bucket', models.DateTimeField()),
+                ('role', models.CharField(blank=True, max_length=30)),
+                ('warehouse_id', models.IntegerField(null=True)),
+                ('logins', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+                ('refreshes', models.PositiveIntegerField(default=0)),
+                ('active_users', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='loginstat',
+            index=models.Index(fields=['period', 'bucket'], name='loginstat_period_bucket_idx'),
+        ),
+    ]
@@ -0,0 +1,108 @@
+"""
+Jarayonlar orasida umumiy mmap fayllar (throttle bucket'lari, kesh).
+
+Fayl mazmuniga ishoniladi (kesh qiymatlari ``pickle`` bilan o'qiladi,
+bucket'lar login limitini belgilaydi), shuning uchun:
+
+* papka shu foydalanuvchiga tegishli va boshqalar yoza olmaydigan bo'lishi,
+  fayl esa shu foydalanuvchiniki va aynan ``0600`` bo'lishi shart -
+  aks holda ``ImproperlyConfigured``;
+* fayl ``O_NOFOLLOW`` bilan ochiladi (symlink orqali boshqa faylga yozilmaydi);
+* yangi yoki boshqa formatdagi fayl joyida kesilmaydi (ishlayotgan
+  worker'larda SIGBUS) - yonida yangisi tayyorlanib, ``rename`` qilinadi.
+  Eski worker'lar qayta ishga tushguncha eski nusxadan foydalanadi.
+"""
+import mmap
+import os
+import stat
+import tempfile
+
+from django.core.exceptions import ImproperlyConfigured
+
+try:
+    import fcntl
+except ImportError:  # Windows: faqat bitta jarayon ichida himoya
+    fcntl = None
+
+_NOFOLLOW = getattr(os, 'O_NOFOLLOW', 0)
+
+
+def _check_owner(st, path, mode=None):
+    if not hasattr(os, 'getuid'):
+        return
+    if st.st_uid != os.getuid():
+        raise ImproperlyConfigured(f"{path} boshqa foydalanuvchiga tegishli")
+    if mode is not None and stat.S_IMODE(st.st_mode) != mode:
+        raise ImproperlyConfigured(f"{path} huquqlari {oct(mode)} bo'lishi kerak")
+
+
+def _check_directory(directory):
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    st = os.stat(directory)
+    _check_owner(st, directory)
+    if st.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise ImproperlyConfigured(f"{directory} boshqa foydalanuvchilar yoza oladigan papka")
+
+
+def _open_existing(path, header, size):
+    """Mos formatdagi faylni ochish; fayl yo'q yoki formati boshqa bo'lsa None"""
+    try:
+        fd = os.open(path, os.O_RDWR | _NOFOLLOW)
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        # O_NOFOLLOW: symlink bo'lsa ELOOP
+        raise ImproperlyConfigured(f"{path} ochilmadi: {e}") from e
+    try:
+        st = os.fstat(fd)
+        if not stat.S_ISREG(st.st_mode):
+            raise ImproperlyConfigured(f"{path} oddiy fayl emas")
+        _check_owner(st, path, 0o600)
+        if st.st_size == size and os.pread(fd, len(header), 0) == header:
+            return fd
+    except BaseException:
+        os.close(fd)
+        raise
+    os.close(fd)
+    return None
+
+
+def _create(path, header, size, initial):
+    """Yangi faylni yonida tayyorlab, ``path`` o'rniga atomar qo'yish"""
+    directory, name = os.path.split(path)
+    # mkstemp: O_EXCL va 0600
+    fd, tmp = tempfile.mkstemp(prefix=f'.{name}.', dir=directory)
+    try:
+        os.ftruncate(fd, size)
+        os.pwrite(fd, header + initial, 0)
+        os.rename(tmp, path)
+    except BaseException:
+        os.close(fd)
+        os.unlink(tmp)
+        raise
+    return fd
+
+
+def open_mapped(path, header, size, initial=b''):
+    """``path`` dagi umumiy faylni ochish (kerak bo'lsa yaratish) va mmap qilish.
+
+    Fayl boshida ``header`` bo'lishi va hajmi ``size`` bo'lishi kerak;
+    yangi faylga ``header + initial`` yoziladi, qolgani nollar.
+    ``(fd, mmap)`` qaytaradi.
+    """
+    path = os.path.abspath(path)
+    _check_directory(os.path.dirname(path))
+    fd = _open_existing(path, header, size)
+    if fd is None:
+        # Bir vaqtda ishga tushgan worker'lar faylni bir marta yaratadi
+        lock_fd = os.open(path + '.lock', os.O_RDWR | os.O_CREAT | _NOFOLLOW, 0o600)
+        try:
+            _check_owner(os.fstat(lock_fd), path + '.lock')
+            if fcntl is not None:
+                fcntl.lockf(lock_fd, fcntl.LOCK_EX)
+            fd = _open_existing(path, header, size)
+            if fd is None:
+                fd = _create(path, header, size, initial)
+        finally:
+            os.close(lock_fd)
+    return fd, mmap.mmap(fd, size)
@@ -1,5 +1,9 @@
 from django.contrib.auth.models import AbstractUser
+from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils import timezone
+
+from .utils import normalize_email, normalize_phone
 
 class CustomUser(AbstractUser):
     ROLE_CHOICES = (
@@ -9,10 +13,273 @@ class CustomUser(AbstractUser):
         ('main_warehouse_forwarder', 'Main Warehouse Forwarder'),
         ('warehouse_receiver', 'Warehouse Receiver'),
     )
+
+    STATUS_PENDING = 'pending'
+    STATUS_APPROVED = 'approved'
+    STATUS_REJECTED = 'rejected'
+    STATUS_DEACTIVATED = 'deactivated'
+    REGISTRATION_STATUS_CHOICES = (
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_APPROVED, 'Approved'),
+        (STATUS_REJECTED, 'Rejected'),
+        (STATUS_DEACTIVATED, 'Deactivated'),
+    )
+    # Ruxsat etilgan o'tishlar: joriy holat -> yangi holatlar
+    REGISTRATION_TRANSITIONS = {
+        STATUS_PENDING: {STATUS_APPROVED, STATUS_REJECTED},
+        STATUS_APPROVED: {STATUS_DEACTIVATED},
+        STATUS_REJECTED: {STATUS_APPROVED},
+        STATUS_DEACTIVATED: {STATUS_APPROVED},
+    }
     
     role = models.CharField(max_length=30, choices=ROLE_CHOICES, default='warehouse_receiver')
     phone_number = models.CharField(max_length=15, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Login uchun indekslangan normallashtirilgan ustunlar (save() da to'ldiriladi).
+    # queryset.update()/bulk_create() ishlatilsa, ular qo'lda to'ldirilishi kerak.
+    email_normalized = models.CharField(max_length=254, null=True, blank=True, db_index=True, editable=False)
+    phone_normalized = models.CharField(max_length=16, null=True, blank=True, db_index=True, editable=False)
+    registration_status = models.CharField(
+        max_length=12, choices=REGISTRATION_STATUS_CHOICES, default=STATUS_APPROVED
+    )
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Faqat kutilayotgan so'rovlar indekslanadi - navbat kichik va tez
+            models.Index(
+                fields=['date_joined'], name='user_pending_joined_idx',
+                condition=models.Q(registration_status='pending'),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.username} - {self.role}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # save() a'zoliklardagi rol nusxasini faqat rol o'zgarganda yangilaydi
+        instance._loaded_role = instance.__dict__.get('role')
+        return instance
+
+    @classmethod
+    def statuses_allowing(cls, new_status):
+        """``new_status`` ga o'tish mumkin bo'lgan holatlar (ommaviy UPDATE filtri uchun)"""
+        return [status for status, targets in cls.REGISTRATION_TRANSITIONS.items() if new_status in targets]
+
+    def set_registration_status(self, new_status):
+        """Ro'yxatdan o'tish holatini o'zgartirish (is_active ham moslanadi)"""
+        if new_status != self.registration_status and \
+                new_status not in self.REGISTRATION_TRANSITIONS[self.registration_status]:
+            raise ValidationError(
+                f"'{self.registration_status}' holatidan '{new_status}' holatiga o'tib bo'lmaydi."
+            )
+        self.registration_status = new_status
+        self.is_active = new_status == self.STATUS_APPROVED
+
+    def save(self, *args, **kwargs):
+        self.email_normalized = normalize_email(self.email)
+        self.phone_normalized = normalize_phone(self.phone_number)
+        # is_active to'g'ridan-to'g'ri o'zgartirilganda (masalan, admin formasida) holatni moslash
+        if self.is_active and self.registration_status != self.STATUS_APPROVED:
+            self.registration_status = self.STATUS_APPROVED
+        elif not self.is_active and self.registration_status == self.STATUS_APPROVED:
+            self.registration_status = self.STATUS_DEACTIVATED
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if 'email' in update_fields:
+                update_fields.add('email_normalized')
+            if 'phone_number' in update_fields:
+                update_fields.add('phone_normalized')
+            if 'is_active' in update_fields:
+                update_fields.add('registration_status')
+            kwargs['update_fields'] = update_fields
+        role_changed = not self._state.adding and self.role != getattr(self, '_loaded_role', None) \
+            and (update_fields is None or 'role' in update_fields)
+        super().save(*args, **kwargs)
+        # A'zolikdagi rol nusxasi (scope indeksi uchun) foydalanuvchi roli bilan mos bo'lishi kerak
+        if role_changed:
+            WarehouseMembership.objects.filter(user=self).exclude(role=self.role).update(role=self.role)
+        self._loaded_role = self.role
+
+
+class Warehouse(models.Model):
+    """Ombor (filial)"""
+    name = models.CharField(max_length=150)
+    code = models.CharField(max_length=30, unique=True)
+    address = models.CharField(max_length=255, blank=True)
+    is_main = models.BooleanField(default=False)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.code} - {self.name}"
+
+
+class WarehouseMembership(models.Model):
+    """Foydalanuvchining omborga biriktirilishi"""
+    # Alohida indekslar kerak emas: (user, warehouse) unique va scope indeksi ularni qoplaydi
+    user = models.ForeignKey(
+        CustomUser, on_delete=models.CASCADE, related_name='warehouse_memberships', db_index=False
+    )
+    warehouse = models.ForeignKey(
+        Warehouse, on_delete=models.CASCADE, related_name='memberships', db_index=False
+    )
+    # CustomUser.role nusxasi - ro'yxatlar foydalanuvchi jadvaliga o'tmasdan indeks bo'yicha filtrlanadi
+    role = models.CharField(max_length=30, choices=CustomUser.ROLE_CHOICES)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'warehouse'], name='membership_user_warehouse_uniq'),
+        ]
+        indexes = [
+            # user_id oxirida: scope so'rovi jadvalga murojaat qilmasdan faqat indeksdan o'qiladi
+            models.Index(fields=['warehouse', 'role', 'is_active', 'user'], name='membership_scope_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} @ {self.warehouse_id} ({self.role})"
+
+    def save(self, *args, **kwargs):
+        if not self.role:
+            self.role = self.user.role
+        super().save(*args, **kwargs)
+
+
+class Job(models.Model):
+    """Fon vazifalari navbati (accounts.jobs orqali ishlatiladi)"""
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = (
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    )
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    # Bir xil vazifani ikki marta navbatga qo'ymaslik uchun
+    key = models.CharField(max_length=200, unique=True, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='job_status_run_at_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} - {self.status}"
+
+
+class AuditLog(models.Model):
+    """Foydalanuvchilarni boshqarish amallari tarixi (accounts.audit orqali yoziladi)"""
+    ACTION_CHOICES = (
+        ('registered', 'Registered'),
+        ('created', 'Created'),
+        ('activated', 'Activated'),
+        ('deactivated', 'Deactivated'),
+        ('rejected', 'Rejected'),
+    )
+
+    actor = models.ForeignKey(
+        CustomUser, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    # Alohida indeks kerak emas: (target, created_at) indeksi uni qoplaydi
+    target = models.ForeignKey(
+        CustomUser, on_delete=models.SET_NULL, null=True,
+        related_name='audit_entries', db_index=False
+    )
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
+    source = models.CharField(max_length=10, default='api')
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['target', 'created_at'], name='audit_target_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.action}: {self.target_id} ({self.actor_id})"
+
+
+class IdempotencyRecord(models.Model):
+    """Idempotency-Key bo'yicha saqlangan birinchi javob (accounts.idempotency)"""
+    # sha256(scope + kalit) - kalit uzunligidan qat'i nazar ixcham
+    key_hash = models.CharField(max_length=64, unique=True)
+    request_hash = models.CharField(max_length=64)
+    # None - so'rov hali bajarilmoqda (kalit band qilingan)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response = models.JSONField(null=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.key_hash[:12]} - {self.status_code}"
+
+
+class LoginEvent(models.Model):
+    """Xom login hodisalari (accounts.login_events orqali paketlab yoziladi, faqat qo'shiladi).
+
+    Jadval ixcham: tashqi kalitlar va qo'shimcha indekslar yo'q. Hodisalar
+    LoginStat'ga yig'ilgandan so'ng saqlash muddati o'tgach o'chiriladi.
+    """
+    KIND_LOGIN = 1
+    KIND_FAILED = 2
+    KIND_REFRESH = 3
+    KIND_CHOICES = (
+        (KIND_LOGIN, 'Login'),
+        (KIND_FAILED, 'Failed login'),
+        (KIND_REFRESH, 'Token refresh'),
+    )
+
+    created_at = models.DateTimeField(db_index=True)
+    kind = models.PositiveSmallIntegerField(choices=KIND_CHOICES)
+    user_id = models.IntegerField(null=True)
+    role = models.CharField(max_length=30, blank=True)
+    # Foydalanuvchining asosiy (eng kichik id'li) ombori
+    warehouse_id = models.IntegerField(null=True)
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.user_id} ({self.created_at})"
+
+
+class LoginStat(models.Model):
+    """Login hodisalarining soatlik va kunlik yig'indilari (statistika API faqat shundan o'qiydi)"""
+    PERIOD_HOUR = 'hour'
+    PERIOD_DAY = 'day'
+    PERIOD_CHOICES = (
+        (PERIOD_HOUR, 'Hour'),
+        (PERIOD_DAY, 'Day'),
+    )
+
+    period = models.CharField(max_length=4, choices=PERIOD_CHOICES)
+    bucket = models.DateTimeField()
+    role = models.CharField(max_length=30, blank=True)
+    warehouse_id = models.IntegerField(null=True)
+    logins = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    refreshes = models.PositiveIntegerField(default=0)
+    # Davr ichida login yoki refresh qilgan turli foydalanuvchilar
+    active_users = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['period', 'bucket'], name='loginstat_period_bucket_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.username} - {self.role}"
\ No newline at end of file
+        return f"{self.period} {self.bucket}: {self.role or '-'} @ {self.warehouse_id}"
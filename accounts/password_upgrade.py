@@ -0,0 +1,60 @@
+"""
+Parol xeshini so'rov yo'lidan tashqarida yangilash.
+
+Django ``check_password`` eskirgan xeshni (masalan, PBKDF2 iteratsiyalari
+oshganda) login paytida qayta xeshlab saqlaydi - bu login'ga ikkinchi
+xeshlash va yozuv qo'shadi. ``IdentifierBackend`` buning o'rniga
+yangilashni shu yerga topshiradi: u joriy thread uchun eslab qolinadi va
+javob yuborilgach (``request_finished``) fon thread'ida bajariladi.
+
+Ochiq parol faqat xotirada turadi (ish navbatiga yozilmaydi). Jarayon
+to'xtab qolsa, yangilash keyingi login'da qayta uriniladi.
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.core.signals import request_finished
+from django.db import connection
+
+from .models import CustomUser
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='password-upgrade')
+_local = threading.local()
+
+
+def upgrade(user_id, raw_password, encoded):
+    """Xesh shu vaqt ichida o'zgarmagan bo'lsagina yangi xesh bilan almashtirish"""
+    try:
+        CustomUser.objects.filter(pk=user_id, password=encoded).update(
+            password=make_password(raw_password)
+        )
+    except Exception:
+        logger.exception("Foydalanuvchi %s parol xeshini yangilab bo'lmadi", user_id)
+    finally:
+        connection.close()
+
+
+def schedule(user_id, raw_password, encoded, request=None):
+    """Yangilashni rejalashtirish: so'rov ichida - javobdan keyin, aks holda darhol fonda"""
+    if request is None:
+        _executor.submit(upgrade, user_id, raw_password, encoded)
+        return
+    pending = getattr(_local, 'pending', None)
+    if pending is None:
+        pending = _local.pending = []
+    pending.append((user_id, raw_password, encoded))
+
+
+def _submit_pending(**kwargs):
+    pending = getattr(_local, 'pending', None)
+    if pending:
+        _local.pending = []
+        for args in pending:
+            _executor.submit(upgrade, *args)
+
+
+request_finished.connect(_submit_pending, dispatch_uid='accounts.password_upgrade')
@@ -1,5 +1,35 @@
 from rest_framework import permissions
 
+from .models import WarehouseMembership
+from .tokens import WAREHOUSES_CLAIM, user_warehouse_ids
+
+# main_warehouse_admin boshqara oladigan rollar
+MANAGED_ROLES = ['warehouse_admin', 'main_warehouse_forwarder', 'warehouse_receiver']
+
+
+def get_warehouse_ids(request):
+    """So'rov egasining omborlari - JWT claim'idan, u bo'lmasa bazadan"""
+    token = getattr(request, 'auth', None)
+    if token is not None and hasattr(token, 'payload') and WAREHOUSES_CLAIM in token:
+        return token[WAREHOUSES_CLAIM]
+    # Sessiya orqali kirish yoki claim'siz eski tokenlar
+    return user_warehouse_ids(request.user.pk)
+
+
+def scope_users(queryset, request, roles=None, warehouse_ids=None):
+    """Foydalanuvchilarni so'rov egasining omborlari bilan cheklash (super admin - cheklovsiz)"""
+    if request.user.role == 'super_admin':
+        return queryset if roles is None else queryset.filter(role__in=roles)
+    if warehouse_ids is None:
+        warehouse_ids = get_warehouse_ids(request)
+    memberships = WarehouseMembership.objects.filter(
+        warehouse_id__in=warehouse_ids, is_active=True
+    )
+    if roles is not None:
+        memberships = memberships.filter(role__in=roles)
+    # Subquery membership_scope_idx indeksidan to'liq qoplanadi (jadvalga murojaatsiz)
+    return queryset.filter(pk__in=memberships.values('user_id'))
+
 class IsSuperAdmin(permissions.BasePermission):
     def has_permission(self, request, view):
         return request.user.is_authenticated and request.user.role == 'super_admin'
@@ -21,7 +51,8 @@ class IsWarehouseReceiver(permissions.BasePermission):
         return request.user.is_authenticated and request.user.role == 'warehouse_receiver'
 
 class CanManageUsers(permissions.BasePermission):
+    # Obyekt darajasidagi tekshiruv yo'q: ro'yxatlar scope_users() bilan cheklanadi
     def has_permission(self, request, view):
         return request.user.is_authenticated and request.user.role in [
             'super_admin', 'main_warehouse_admin'
-        ]
\ No newline at end of file
+        ]
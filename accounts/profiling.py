@@ -0,0 +1,264 @@
+"""
+So'rov bo'yicha profilerlash.
+
+Super admin ``X-Profile: 1`` sarlavhasi yoki ``?_profile=1`` parametri bilan
+so'rov yuborsa (yoki so'rov ``SAMPLE_RATE`` bo'yicha tanlansa), view cProfile
+ostida bajariladi va barcha SQL so'rovlar vaqti bilan yoziladi. Hisobotlar
+diskdagi cheklangan halqada saqlanadi va admin endpoint orqali yuklab olinadi.
+
+Profilerlash yoqilmagan so'rovlar uchun xarajat - bitta sarlavha va bitta
+parametr tekshiruvi.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import re
+import time
+import uuid
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.urls import Resolver404, resolve
+from django.utils import timezone
+
+from .mmapfile import _check_directory
+
+REPORT_ID_RE = re.compile(r'^[0-9]{14}-[0-9a-f]{8}$')
+
+DEFAULTS = {
+    'SAMPLE_RATE': 0.0,
+    'HEADER': 'X-Profile',
+    'QUERY_PARAM': '_profile',
+    'DIR': None,
+    'MAX_REPORTS': 50,
+    'TOP_FUNCTIONS': 40,
+}
+
+
+def get_setting(name):
+    return getattr(settings, 'REQUEST_PROFILING', {}).get(name, DEFAULTS[name])
+
+
+def reports_dir():
+    # Hisobotlarda SQL matni va kod yo'llari bor - papka faqat shu foydalanuvchiniki (0700), /tmp emas
+    path = get_setting('DIR') or os.path.join(settings.BASE_DIR, 'var', 'profiles')
+    _check_directory(path)
+    return path
+
+
+def _is_profiler_admin(user):
+    return bool(user and user.is_authenticated and (user.is_superuser or user.role == 'super_admin'))
+
+
+class SQLRecorder:
+    """``connection.execute_wrapper`` uchun: har bir so'rov SQL matni va vaqtini yozadi"""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            # Parametrlar saqlanmaydi: ularda parol xeshlari bo'lishi mumkin
+            self.queries.append({
+                'alias': context['connection'].alias,
+                'sql': sql,
+                'many': many,
+                'ms': round((time.perf_counter() - start) * 1000, 3),
+            })
+
+    def summary(self):
+        counts = Counter(q['sql'] for q in self.queries)
+        duplicates = [
+            {'sql': sql, 'count': count,
+             'total_ms': round(sum(q['ms'] for q in self.queries if q['sql'] == sql), 3)}
+            for sql, count in counts.most_common() if count > 1
+        ]
+        return {
+            'count': len(self.queries),
+            'total_ms': round(sum(q['ms'] for q in self.queries), 3),
+            'duplicates': duplicates,
+            'queries': self.queries,
+        }
+
+
+def _top_functions(profiler, limit):
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, line, name), (cc, nc, tt, ct, _) in stats.stats.items():
+        rows.append({
+            'function': f'{filename}:{line}({name})',
+            'calls': nc,
+            'primitive_calls': cc,
+            'self_ms': round(tt * 1000, 3),
+            'cumulative_ms': round(ct * 1000, 3),
+        })
+    rows.sort(key=lambda row: row['cumulative_ms'], reverse=True)
+    return rows[:limit]
+
+
+def save_report(report, profiler):
+    """Hisobotni yozish va halqadan eskilarini o'chirish"""
+    directory = reports_dir()
+    report_id = f"{timezone.now():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}"
+    report['id'] = report_id
+    profiler.dump_stats(os.path.join(directory, f'{report_id}.prof'))
+    with open(os.path.join(directory, f'{report_id}.json'), 'w') as f:
+        json.dump(report, f)
+
+    reports = sorted(name[:-5] for name in os.listdir(directory) if name.endswith('.json'))
+    for old_id in reports[:-get_setting('MAX_REPORTS')]:
+        for ext in ('.json', '.prof'):
+            try:
+                os.remove(os.path.join(directory, old_id + ext))
+            except FileNotFoundError:
+                pass
+    return report_id
+
+
+def list_reports():
+    directory = reports_dir()
+    return sorted(
+        (name[:-5] for name in os.listdir(directory) if name.endswith('.json')),
+        reverse=True,
+    )
+
+
+def report_path(report_id, ext):
+    if not REPORT_ID_RE.match(report_id):
+        return None
+    path = os.path.join(reports_dir(), report_id + ext)
+    return path if os.path.exists(path) else None
+
+
+class RequestProfilerMiddleware:
+    """Tanlangan so'rovlarni cProfile va SQL yozuvchisi bilan bajarish"""
+    # ASGI'da async view'lar sinxron thread'ga o'tkazilmasligi uchun
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.header = 'HTTP_' + get_setting('HEADER').upper().replace('-', '_')
+        self.query_param = get_setting('QUERY_PARAM')
+        self.sample_rate = get_setting('SAMPLE_RATE')
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # Sinxron view'lar o'z thread'ida profillanadi (qarang: __acall__)
+            self.process_view = self._aprocess_view
+
+    def _trigger(self, request):
+        requested = request.META.get(self.header) == '1' or (
+            self.query_param in request.META.get('QUERY_STRING', '')
+            and request.GET.get(self.query_param) == '1'
+        )
+        if requested:
+            return 'requested'
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return 'sampled'
+        return None
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        trigger = self._trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+        if trigger == 'requested' and not self._authorized(request):
+            return self.get_response(request)
+        with self._profiling() as run:
+            response = self.get_response(request)
+        return self._finish(request, response, trigger, run)
+
+    async def __acall__(self, request):
+        trigger = self._trigger(request)
+        if trigger is None:
+            return await self.get_response(request)
+        if trigger == 'requested' and not await sync_to_async(self._authorized)(request):
+            return await self.get_response(request)
+        if self._is_sync_view(request):
+            # Sinxron view sync_to_async thread'ida bajariladi, cProfile va execute_wrapper
+            # esa faqat joriy thread'ni ko'radi - view process_view'da o'sha thread'da profillanadi
+            request._profile_run = None
+            response = await self.get_response(request)
+            if request._profile_run is None:
+                # View'gacha javob qaytarildi (masalan, CSRF)
+                return response
+            return self._finish(request, response, trigger, request._profile_run)
+        # Event loop'dagi boshqa so'rovlar ham profilga tushishi mumkin
+        with self._profiling() as run:
+            response = await self.get_response(request)
+        return self._finish(request, response, trigger, run)
+
+    def _is_sync_view(self, request):
+        try:
+            match = resolve(request.path_info, getattr(request, 'urlconf', None))
+        except Resolver404:
+            return False
+        return not iscoroutinefunction(match.func)
+
+    async def _aprocess_view(self, request, view_func, view_args, view_kwargs):
+        if not hasattr(request, '_profile_run'):
+            return None
+        return await sync_to_async(self._run_view, thread_sensitive=True)(
+            request, view_func, view_args, view_kwargs
+        )
+
+    def _run_view(self, request, view_func, view_args, view_kwargs):
+        # Django view'ni aynan shu thread'da (thread_sensitive) chaqirardi
+        with self._profiling() as run:
+            request._profile_run = run
+            response = view_func(request, *view_args, **view_kwargs)
+            # DRF javobi ham shu yerda render qilinadi (keyingi render() hech narsa qilmaydi)
+            if hasattr(response, 'render') and callable(response.render):
+                response = response.render()
+        return response
+
+    def _authorized(self, request):
+        if _is_profiler_admin(getattr(request, 'user', None)):
+            return True
+        # API so'rovlari JWT bilan keladi - uni faqat profil so'ralganda tekshiramiz
+        from rest_framework_simplejwt.authentication import JWTAuthentication
+        from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed
+        try:
+            result = JWTAuthentication().authenticate(request)
+        except (InvalidToken, AuthenticationFailed):
+            return False
+        return result is not None and _is_profiler_admin(result[0])
+
+    @contextmanager
+    def _profiling(self):
+        run = {'recorder': SQLRecorder(), 'profiler': cProfile.Profile()}
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(run['recorder']))
+            start = time.perf_counter()
+            run['profiler'].enable()
+            try:
+                yield run
+            finally:
+                run['profiler'].disable()
+                run['elapsed'] = (time.perf_counter() - start) * 1000
+
+    def _finish(self, request, response, trigger, run):
+        report = {
+            'trigger': trigger,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(run['elapsed'], 3),
+            'created_at': timezone.now().isoformat(),
+            'sql': run['recorder'].summary(),
+            'functions': _top_functions(run['profiler'], get_setting('TOP_FUNCTIONS')),
+        }
+        response['X-Profile-Id'] = save_report(report, run['profiler'])
+        return response
@@ -0,0 +1,28 @@
+"""
+drf_yasg uchun yupqa qatlam.
+
+CLI rejimida (``DJANGO_STARTUP_MODE=cli``) drf_yasg o'rnatilgan ilovalar
+ro'yxatida bo'lmaydi va import qilinmaydi; bu holda sxema dekoratorlari
+hech narsa qilmaydi.
+"""
+from django.conf import settings
+
+if 'drf_yasg' in settings.INSTALLED_APPS:
+    from drf_yasg import openapi
+    from drf_yasg.utils import swagger_auto_schema
+else:
+    class _SchemaStub:
+        """openapi.Schema(...), openapi.TYPE_STRING va h.k. uchun o'rinbosar"""
+
+        def __getattr__(self, name):
+            return self
+
+        def __call__(self, *args, **kwargs):
+            return self
+
+    openapi = _SchemaStub()
+
+    def swagger_auto_schema(*args, **kwargs):
+        return lambda view: view
+
+__all__ = ['openapi', 'swagger_auto_schema']
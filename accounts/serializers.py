@@ -1,17 +1,41 @@
 from rest_framework import serializers
 from django.contrib.auth import authenticate
-from .models import CustomUser
+from .models import AuditLog, CustomUser, LoginStat, Warehouse, WarehouseMembership
+from .utils import normalize_email
 
-class UserSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """``fields`` argumenti berilsa, faqat shu maydonlar qoladi (``?fields=id,username``)"""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def parse_fields(cls, value):
+        """'id,username' -> ('id', 'username'); bo'sh yoki noma'lum maydonlar - ValidationError"""
+        if value is None:
+            return None
+        requested = tuple(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+        unknown = [name for name in requested if name not in cls.Meta.fields]
+        if not requested or unknown:
+            raise serializers.ValidationError({
+                'fields': f"Noma'lum maydonlar: {', '.join(unknown) or '-'}. "
+                          f"Ruxsat etilganlar: {', '.join(cls.Meta.fields)}"
+            })
+        return requested
+
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = CustomUser
         fields = ('id', 'username', 'email', 'first_name', 'last_name', 
-                 'role', 'phone_number', 'is_active', 'date_joined')
-        read_only_fields = ('id', 'date_joined')
+                 'role', 'phone_number', 'is_active', 'date_joined', 'registration_status')
+        read_only_fields = ('id', 'date_joined', 'registration_status')
 
 class UserLoginSerializer(serializers.Serializer):
     username = serializers.CharField(
-        help_text="Foydalanuvchi nomi"
+        help_text="Foydalanuvchi nomi, email yoki telefon raqami"
     )
     password = serializers.CharField(
         help_text="Parol",
@@ -23,7 +47,7 @@ class UserLoginSerializer(serializers.Serializer):
         password = data.get('password')
         
         if username and password:
-            user = authenticate(username=username, password=password)
+            user = authenticate(self.context.get('request'), username=username, password=password)
             if user:
                 if user.is_active:
                     data['user'] = user
@@ -36,6 +60,25 @@ class UserLoginSerializer(serializers.Serializer):
         
         return data
 
+class WarehouseField(serializers.PrimaryKeyRelatedField):
+    def __init__(self, **kwargs):
+        kwargs.setdefault('queryset', Warehouse.objects.filter(is_active=True))
+        kwargs.setdefault('required', False)
+        kwargs.setdefault('write_only', True)
+        kwargs.setdefault('help_text', "Ombor ID (foydalanuvchi shu omborga biriktiriladi; super_admin'dan boshqa rollar uchun shart)")
+        super().__init__(**kwargs)
+
+
+def require_warehouse(data):
+    # Omborsiz foydalanuvchi hech bir ombor ro'yxatida ko'rinmaydi - faqat super_admin'ga ruxsat
+    if data.get('role') != 'super_admin' and data.get('warehouse') is None:
+        raise serializers.ValidationError({'warehouse': "Ombor tanlanishi shart."})
+
+
+def add_membership(user, warehouse):
+    if warehouse is not None:
+        WarehouseMembership.objects.create(user=user, warehouse=warehouse, role=user.role)
+
 class UserCreateSerializer(serializers.ModelSerializer):
     password = serializers.CharField(
         write_only=True,
@@ -43,11 +86,12 @@ class UserCreateSerializer(serializers.ModelSerializer):
         style={'input_type': 'password'},
         min_length=8
     )
+    warehouse = WarehouseField()
     
     class Meta:
         model = CustomUser
         fields = ('id', 'username', 'email', 'first_name', 'last_name', 
-                 'role', 'phone_number', 'password')
+                 'role', 'phone_number', 'password', 'warehouse')
         extra_kwargs = {
             'username': {'help_text': 'Foydalanuvchi nomi (unique)'},
             'email': {'help_text': 'Elektron pochta manzili'},
@@ -59,9 +103,11 @@ class UserCreateSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         password = validated_data.pop('password')
+        warehouse = validated_data.pop('warehouse', None)
         user = CustomUser.objects.create_user(**validated_data)
         user.set_password(password)
         user.save()
+        add_membership(user, warehouse)
         return user
 
     def validate_username(self, value):
@@ -69,8 +115,12 @@ class UserCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Bu foydalanuvchi nomi allaqachon mavjud.")
         return value
 
+    def validate(self, data):
+        require_warehouse(data)
+        return data
+
     def validate_email(self, value):
-        if value and CustomUser.objects.filter(email=value).exists():
+        if value and CustomUser.objects.filter(email_normalized=normalize_email(value)).exists():
             raise serializers.ValidationError("Bu email allaqachon mavjud.")
         return value
 
@@ -87,10 +137,12 @@ class RegisterSerializer(serializers.ModelSerializer):
         help_text="Parolni takrorlang",
         style={'input_type': 'password'}
     )
+    # Ro'yxatdan o'tishda super_admin roli yo'q - ombor har doim shart
+    warehouse = WarehouseField(required=True)
 
     class Meta:
         model = CustomUser
-        fields = ('first_name', 'last_name', 'email', 'role', 'password', 'password_confirm')
+        fields = ('first_name', 'last_name', 'email', 'role', 'password', 'password_confirm', 'warehouse')
         extra_kwargs = {
             'first_name': {'required': True},
             'last_name': {'required': True},
@@ -108,7 +160,7 @@ class RegisterSerializer(serializers.ModelSerializer):
         return value
 
     def validate_email(self, value):
-        if CustomUser.objects.filter(email=value).exists():
+        if CustomUser.objects.filter(email_normalized=normalize_email(value)).exists():
             raise serializers.ValidationError("Bu email allaqachon mavjud.")
         return value.lower()
 
@@ -135,10 +187,25 @@ class RegisterSerializer(serializers.ModelSerializer):
         
         # Foydalanuvchi yaratish (avtomatik faolsiz holatda)
         validated_data['is_active'] = False  # Admin tasdiqlashini kutar
+        validated_data['registration_status'] = CustomUser.STATUS_PENDING
         
         password = validated_data.pop('password')
+        warehouse = validated_data.pop('warehouse', None)
         user = CustomUser.objects.create_user(**validated_data)
         user.set_password(password)
         user.save()
+        add_membership(user, warehouse)
         
-        return user
\ No newline at end of file
+        return user
+
+class AuditLogSerializer(serializers.ModelSerializer):
+    actor_username = serializers.CharField(source='actor.username', read_only=True, default=None)
+
+    class Meta:
+        model = AuditLog
+        fields = ('id', 'action', 'source', 'actor', 'actor_username', 'target', 'created_at')
+
+class LoginStatSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = LoginStat
+        fields = ('period', 'bucket', 'role', 'warehouse_id', 'logins', 'failed', 'refreshes', 'active_users')
@@ -0,0 +1,101 @@
+"""
+Django ishga tushish jarayonini o'lchovchi zond.
+
+``manage.py startup_profile`` tomonidan alohida jarayonda ishga tushiriladi:
+
+    python -X importtime -m accounts.startup_probe [--memory] [--no-urls]
+
+Natija (JSON) stdout'ga chiqariladi. Modul darajasida faqat standart
+kutubxona import qilinadi, aks holda o'lchovlar buziladi.
+"""
+import json
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class _Recorder:
+    def __init__(self, memory):
+        self.memory = memory
+        self.steps = {}
+
+    @contextmanager
+    def measure(self, key, phase):
+        before = tracemalloc.get_traced_memory()[0] if self.memory else 0
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry = self.steps.setdefault(key, {})
+            entry[f'{phase}_ms'] = round((time.perf_counter() - start) * 1000, 3)
+            if self.memory:
+                entry[f'{phase}_kb'] = round((tracemalloc.get_traced_memory()[0] - before) / 1024, 1)
+
+
+def _instrument_app_configs(recorder):
+    from django.apps import AppConfig
+
+    original_create = AppConfig.create.__func__
+
+    def wrap(config, method_name, phase):
+        method = getattr(config, method_name)
+
+        def wrapper(*args, **kwargs):
+            with recorder.measure(f'app:{config.name}', phase):
+                return method(*args, **kwargs)
+        setattr(config, method_name, wrapper)
+
+    def create(cls, entry):
+        with recorder.measure(f'app:{entry}', 'import'):
+            config = original_create(cls, entry)
+        if config.name != entry:
+            # 'app.apps.FooConfig' ko'rinishidagi yozuvlar ilova nomi ostida saqlanadi
+            recorder.steps[f'app:{config.name}'] = recorder.steps.pop(f'app:{entry}')
+        wrap(config, 'import_models', 'models')
+        wrap(config, 'ready', 'ready')
+        return config
+
+    AppConfig.create = classmethod(create)
+
+
+def probe(memory=False, load_urls=True):
+    recorder = _Recorder(memory)
+    if memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+
+    with recorder.measure('django', 'import'):
+        import django
+        from django.conf import settings
+    with recorder.measure('settings', 'import'):
+        settings.INSTALLED_APPS
+
+    _instrument_app_configs(recorder)
+    with recorder.measure('setup', 'total'):
+        django.setup()
+
+    if load_urls:
+        with recorder.measure('urlconf', 'import'):
+            from django.urls import get_resolver
+            get_resolver().url_patterns
+
+    report = {
+        'total_ms': round((time.perf_counter() - start) * 1000, 3),
+        'installed_apps': list(settings.INSTALLED_APPS),
+        'steps': recorder.steps,
+    }
+    if memory:
+        current, peak = tracemalloc.get_traced_memory()
+        report['traced_kb'] = round(current / 1024, 1)
+        report['traced_peak_kb'] = round(peak / 1024, 1)
+    try:
+        import resource
+        report['max_rss_kb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    except ImportError:
+        pass
+    return report
+
+
+if __name__ == '__main__':
+    print(json.dumps(probe(memory='--memory' in sys.argv, load_urls='--no-urls' not in sys.argv)))
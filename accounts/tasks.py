@@ -0,0 +1,91 @@
+"""
+Fon vazifalari bajaruvchilari.
+
+Har bir bajaruvchi idempotent: foydalanuvchining joriy holatini qayta
+tekshiradi va holat o'zgargan bo'lsa hech narsa qilmaydi.
+"""
+import logging
+import uuid
+
+from django.conf import settings
+from django.core.mail import send_mail
+
+from .jobs import enqueue, job_handler
+from .models import CustomUser
+
+logger = logging.getLogger(__name__)
+
+
+def send_sms(phone_number, text):
+    """SMS yuborish (shlyuz sozlanmagan bo'lsa faqat logga yoziladi)"""
+    gateway = getattr(settings, 'SMS_BACKEND', None)
+    if gateway is None:
+        logger.info("SMS %s: %s", phone_number, text)
+        return
+    gateway(phone_number, text)
+
+
+@job_handler('registration_received')
+def registration_received(user_id):
+    """Yangi ro'yxatdan o'tish haqida adminlarni xabardor qilish"""
+    user = CustomUser.objects.filter(id=user_id, is_active=False).first()
+    if user is None:
+        # Allaqachon tasdiqlangan yoki o'chirilgan
+        return
+
+    recipients = list(
+        CustomUser.objects.filter(role='super_admin', is_active=True)
+        .exclude(email='')
+        .values_list('email', flat=True)
+    )
+    if recipients:
+        send_mail(
+            "Yangi ro'yxatdan o'tish so'rovi",
+            f"{user.first_name} {user.last_name} ({user.email}) - {user.get_role_display()}",
+            None,
+            recipients,
+        )
+
+
+def enqueue_user_activated(user_id):
+    """Faollashtirish xabarnomasini navbatga qo'yish (faqat haqiqiy holat o'zgarishida chaqiriladi).
+
+    Kalitlarga shu faollashtirishning tokeni kiradi: o'chirilib yoki rad
+    etilib, keyin qayta tasdiqlangan foydalanuvchi yana xabar oladi.
+    """
+    activation = uuid.uuid4().hex
+    return enqueue(
+        'user_activated', {'user_id': user_id, 'activation': activation},
+        key=f'user_activated:{user_id}:{activation}',
+    )
+
+
+@job_handler('user_activated')
+def user_activated(user_id, activation):
+    """Hisob faollashtirilgani haqida foydalanuvchini xabardor qilish.
+
+    Har bir kanal alohida kalitli vazifa: SMS xato berib qayta urinilsa,
+    email qayta yuborilmaydi.
+    """
+    user = CustomUser.objects.filter(id=user_id, is_active=True).first()
+    if user is None:
+        return
+
+    prefix = f'user_activated:{user_id}:{activation}'
+    text = "Hisobingiz faollashtirildi. Endi tizimga kirishingiz mumkin."
+    if user.email:
+        enqueue('send_email', {'subject': "Hisob faollashtirildi", 'text': text, 'recipient': user.email},
+                key=f'{prefix}:email')
+    if user.phone_number:
+        enqueue('send_sms', {'phone_number': user.phone_number, 'text': text},
+                key=f'{prefix}:sms')
+
+
+@job_handler('send_email')
+def send_email(subject, text, recipient):
+    send_mail(subject, text, None, [recipient])
+
+
+@job_handler('send_sms')
+def send_sms_job(phone_number, text):
+    send_sms(phone_number, text)
@@ -0,0 +1,51 @@
+"""Admin ommaviy amallari holat mashinasiga (REGISTRATION_TRANSITIONS) bo'ysunadi"""
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.models import AuditLog, CustomUser
+
+
+class BulkActionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_superuser('root', 'root@example.com', 'x', role='super_admin')
+        cls.users = {}
+        for status in ('pending', 'approved', 'rejected', 'deactivated'):
+            cls.users[status] = CustomUser.objects.create_user(
+                status, f'{status}@example.com', 'x', registration_status=status,
+                is_active=status == CustomUser.STATUS_APPROVED,
+            )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def run_action(self, action):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('admin:accounts_customuser_changelist'), {
+                'action': action, '_selected_action': [user.pk for user in self.users.values()],
+            })
+        self.assertEqual(response.status_code, 302)
+        return dict(CustomUser.objects.exclude(pk=self.admin.pk).values_list('username', 'registration_status'))
+
+    def audited(self, action):
+        return set(AuditLog.objects.filter(action=action).values_list('target__username', flat=True))
+
+    def test_activate_skips_rejected(self):
+        self.assertEqual(self.run_action('activate_users'), {
+            'pending': 'approved', 'approved': 'approved', 'rejected': 'rejected', 'deactivated': 'approved',
+        })
+        self.assertEqual(self.audited('activated'), {'pending', 'deactivated'})
+        self.assertFalse(CustomUser.objects.get(username='rejected').is_active)
+
+    def test_deactivate_only_approved(self):
+        self.assertEqual(self.run_action('deactivate_users'), {
+            'pending': 'pending', 'approved': 'deactivated', 'rejected': 'rejected', 'deactivated': 'deactivated',
+        })
+        self.assertEqual(self.audited('deactivated'), {'approved'})
+
+    def test_statuses_allowing(self):
+        self.assertEqual(
+            set(CustomUser.statuses_allowing(CustomUser.STATUS_APPROVED)),
+            {'pending', 'rejected', 'deactivated'},
+        )
+        self.assertEqual(CustomUser.statuses_allowing(CustomUser.STATUS_DEACTIVATED), ['approved'])
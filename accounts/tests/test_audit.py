@@ -0,0 +1,57 @@
+"""Audit jurnali: commit'da bitta INSERT, bekor qilingan savepoint yozuvlari tashlanadi"""
+from django.db import transaction
+from django.test import TestCase
+
+from accounts import audit
+from accounts.models import AuditLog, CustomUser
+
+
+class AuditTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.actor = CustomUser.objects.create_user('root', 'root@example.com', 'x', role='super_admin')
+        cls.users = [
+            CustomUser.objects.create_user(f'user{i}', f'user{i}@example.com', 'x') for i in range(3)
+        ]
+
+    def logged(self):
+        return list(AuditLog.objects.order_by('pk').values_list('action', 'target_id'))
+
+    def test_buffered_until_commit(self):
+        first, second, _ = self.users
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                audit.record('activated', first.pk, actor=self.actor)
+                audit.record('deactivated', [second.pk], actor=self.actor)
+                self.assertEqual(self.logged(), [])
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self.logged(), [('activated', first.pk), ('deactivated', second.pk)])
+
+    def test_rolled_back_savepoint_is_discarded(self):
+        first, second, third = self.users
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                audit.record('activated', first.pk, actor=self.actor)
+                try:
+                    with transaction.atomic():
+                        audit.record('activated', second.pk, actor=self.actor)
+                        raise ValueError
+                except ValueError:
+                    pass
+                audit.record('rejected', third.pk, actor=self.actor)
+
+        self.assertEqual(self.logged(), [('activated', first.pk), ('rejected', third.pk)])
+
+    def test_nested_rollback_writes_nothing(self):
+        first = self.users[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                try:
+                    with transaction.atomic():
+                        audit.record('activated', first.pk)
+                        raise ValueError
+                except ValueError:
+                    pass
+
+        self.assertFalse(AuditLog.objects.exists())
@@ -0,0 +1,53 @@
+"""Login identifikatori: email, telefon va username bo'yicha topish"""
+from django.contrib.auth import authenticate
+from django.test import TestCase, override_settings
+
+from accounts.models import CustomUser
+from accounts.utils import classify_identifier, normalize_phone
+
+
+class ClassifyIdentifierTests(TestCase):
+    def test_classify(self):
+        self.assertEqual(classify_identifier(' Ali@Example.COM '), ('email_normalized', 'ali@example.com'))
+        self.assertEqual(classify_identifier('90 123-45-67'), ('phone_normalized', '+998901234567'))
+        self.assertEqual(classify_identifier('ali'), ('username', 'ali'))
+
+    def test_normalize_phone(self):
+        for value in ('+998901234567', '998901234567', '00998901234567', '(90) 123 45 67'):
+            self.assertEqual(normalize_phone(value), '+998901234567', value)
+        self.assertIsNone(normalize_phone('12345'))
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class IdentifierBackendTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.ali = CustomUser.objects.create_user(
+            'ali', 'Ali@Example.com', 'secret', phone_number='+998 90 123 45 67'
+        )
+        # Telefonga o'xshash foydalanuvchi nomi
+        cls.numeric = CustomUser.objects.create_user('901112233', 'numeric@example.com', 'secret')
+
+    def login(self, identifier, password='secret'):
+        return authenticate(None, username=identifier, password=password)
+
+    def test_email_phone_and_username(self):
+        for identifier in ('ali', ' ALI@example.com', '901234567', '+998 (90) 123-45-67'):
+            self.assertEqual(self.login(identifier), self.ali, identifier)
+        self.assertIsNone(self.login('ali', 'wrong'))
+        self.assertIsNone(self.login('nobody'))
+
+    def test_numeric_username_falls_back_to_username(self):
+        self.assertEqual(self.login('901112233'), self.numeric)
+
+    def test_phone_match_wins_over_username(self):
+        CustomUser.objects.create_user('901234567', 'other@example.com', 'secret')
+        self.assertEqual(self.login('901234567'), self.ali)
+
+    def test_shared_phone_is_rejected(self):
+        CustomUser.objects.create_user('vali', 'vali@example.com', 'secret', phone_number='901234567')
+        self.assertIsNone(self.login('901234567'))
+
+    def test_single_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.login('901112233'), self.numeric)
@@ -0,0 +1,100 @@
+"""Batch endpoint: ichki chaqiruvlar, autentifikatsiya va cheklovlar"""
+import json
+
+from django.contrib.auth.hashers import make_password
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts.batch import _build_request
+from accounts.models import CustomUser
+from accounts.tokens import WarehouseRefreshToken
+
+
+class BatchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create(
+            username='root', password=make_password(None), role='super_admin', is_superuser=True,
+        )
+        cls.staff = CustomUser.objects.create(
+            username='staff', password=make_password(None), role='warehouse_admin',
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.authenticate(self.admin)
+
+    def authenticate(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {WarehouseRefreshToken.for_user(user).access_token}')
+
+    def batch(self, *calls):
+        response = self.client.post(reverse('batch'), {'requests': list(calls)}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        return json.loads(response.content)['responses']
+
+    def test_runs_calls_in_order_with_outer_user(self):
+        responses = self.batch(
+            {'path': 'check-auth/'},
+            {'path': '/api/auth/profile/'},
+            {'method': 'get', 'path': 'users/pending/?fields=id,username'},
+        )
+        self.assertEqual([r['status'] for r in responses], [200, 200, 200])
+        self.assertEqual(responses[0]['body']['user'], 'root')
+        self.assertEqual(responses[1]['body']['username'], 'root')
+        self.assertNotIn('Content-Type', responses[1]['headers'])
+
+    def test_async_view(self):
+        [response] = self.batch({'path': 'async/check-auth/'})
+        self.assertEqual(response['status'], 200)
+        self.assertEqual(response['body']['user'], 'root')
+
+    def test_inner_authorization_header_is_ignored(self):
+        staff_token = WarehouseRefreshToken.for_user(self.staff).access_token
+        [response] = self.batch({'path': 'profile/', 'headers': {'Authorization': f'Bearer {staff_token}'}})
+        self.assertEqual(response['body']['username'], 'root')
+
+    def test_inner_client_ip_headers_are_ignored(self):
+        request = RequestFactory().post('/api/auth/batch/', REMOTE_ADDR='10.0.0.1', HTTP_X_FORWARDED_FOR='10.0.0.1')
+        request.user, request.auth = self.admin, None
+        sub_request, _ = _build_request(request, '/api/auth/', {
+            'path': 'login/', 'headers': {'X-Forwarded-For': '1.2.3.4', 'X-Real-IP': '1.2.3.4'},
+        })
+        self.assertEqual(sub_request.META['REMOTE_ADDR'], '10.0.0.1')
+        self.assertEqual(sub_request.META['HTTP_X_FORWARDED_FOR'], '10.0.0.1')
+        self.assertNotIn('HTTP_X_REAL_IP', sub_request.META)
+
+    def test_inner_permissions_apply(self):
+        self.authenticate(self.staff)
+        [response] = self.batch({'path': 'audit/'})
+        self.assertEqual(response['status'], 403)
+
+    def test_call_errors_do_not_fail_batch(self):
+        responses = self.batch(
+            {'path': 'missing/'},
+            {'path': 'batch/'},
+            {'method': 'TRACE', 'path': 'profile/'},
+            'profile/',
+            {'path': 'check-auth/'},
+        )
+        self.assertEqual([r['status'] for r in responses], [404, 400, 405, 400, 200])
+        self.assertIn('error', responses[0]['body'])
+
+    @override_settings(BATCH_API={'MAX_CALL_BODY_BYTES': 10, 'MAX_CALL_RESPONSE_BYTES': 50})
+    def test_size_limits(self):
+        responses = self.batch(
+            {'method': 'POST', 'path': 'logout/', 'body': {'refresh': 'x' * 20}},
+            {'path': 'profile/'},
+        )
+        self.assertEqual([r['status'] for r in responses], [413, 413])
+
+    def test_rejects_bad_batches(self):
+        for data in ({}, {'requests': []}, {'requests': 'check-auth/'}, {'requests': [{'path': 'profile/'}] * 11}):
+            response = self.client.post(reverse('batch'), data, format='json')
+            self.assertEqual(response.status_code, 400, data)
+            self.assertIn('error', response.json())
+
+    def test_requires_authentication(self):
+        self.client.credentials()
+        response = self.client.post(reverse('batch'), {'requests': [{'path': 'profile/'}]}, format='json')
+        self.assertEqual(response.status_code, 401)
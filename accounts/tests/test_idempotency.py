@@ -0,0 +1,96 @@
+"""Idempotency-Key: replay, 409 (bajarilmoqda), 422 (boshqa tana), 5xx'da kalit bo'shatiladi"""
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts import throttling
+from accounts.models import CustomUser, IdempotencyRecord, Warehouse
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class IdempotencyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.warehouse = Warehouse.objects.create(code='MAIN', name='Asosiy', is_main=True)
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        store = throttling.SharedTokenBucketStore(os.path.join(directory, 'throttle.bin'), groups=64)
+        patcher = mock.patch.object(throttling, '_store', store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+
+    def register(self, key='retry-1', **overrides):
+        data = {
+            'first_name': 'Aziz', 'last_name': 'Karimov', 'email': 'aziz@example.com',
+            'role': 'warehouse_receiver', 'password': 'Secret123!', 'password_confirm': 'Secret123!',
+            'warehouse': self.warehouse.pk, **overrides,
+        }
+        return self.client.post(reverse('register'), data, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_stored_response(self):
+        first = self.register()
+        second = self.register()
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(CustomUser.objects.count(), 1)
+
+    def test_replay_is_not_throttled(self):
+        self.assertEqual(self.register().status_code, 201)
+        # register_email: 5/hour - replay'lar bucket'ni sarflamaydi
+        for _ in range(10):
+            self.assertEqual(self.register().status_code, 201)
+        self.assertEqual(self.register(key='other', email='new@example.com').status_code, 201)
+
+    def test_different_body_is_rejected(self):
+        self.register()
+        response = self.register(first_name='Boshqa')
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(CustomUser.objects.count(), 1)
+
+    def test_in_flight_duplicate_gets_conflict(self):
+        nested = []
+
+        def duplicate(*args, **kwargs):
+            nested.append(self.register())
+
+        with mock.patch('accounts.views.audit.record', side_effect=duplicate):
+            self.assertEqual(self.register().status_code, 201)
+        self.assertEqual(nested[0].status_code, 409)
+        self.assertEqual(nested[0]['Retry-After'], '1')
+
+    def test_server_error_releases_key(self):
+        with mock.patch('accounts.views.RegisterSerializer.save', side_effect=RuntimeError('db')):
+            self.assertEqual(self.register().status_code, 500)
+        self.assertFalse(IdempotencyRecord.objects.exists())
+
+        response = self.register()
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(response.has_header('Idempotent-Replayed'))
+
+    def test_keys_are_scoped_per_user(self):
+        admin = CustomUser.objects.create(
+            username='root', password=make_password('x'), role='super_admin', is_superuser=True,
+        )
+        self.client.force_authenticate(admin)
+        data = {
+            'username': 'ali', 'email': 'ali@example.com', 'password': 'Secret123!',
+            'first_name': 'Ali', 'last_name': 'Valiyev', 'role': 'warehouse_receiver',
+            'warehouse': self.warehouse.pk,
+        }
+        create = self.client.post(reverse('create_user'), data, format='json', HTTP_IDEMPOTENCY_KEY='retry-1')
+        self.assertEqual(create.status_code, 201)
+        # Xuddi shu kalit boshqa scope'da (register) mustaqil
+        self.client.force_authenticate(None)
+        self.assertEqual(self.register().status_code, 201)
+        self.assertEqual(IdempotencyRecord.objects.count(), 2)
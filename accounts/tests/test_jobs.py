@@ -0,0 +1,160 @@
+"""Fon vazifalari navbati: band qilish, qayta urinish, to'xtab qolganlarni qaytarish"""
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.jobs import claim_jobs, enqueue, job_handler, release_stale_jobs, run_job
+from accounts.models import CustomUser, Job
+
+calls = []
+
+
+@job_handler('test_flaky')
+def flaky(fail):
+    calls.append(fail)
+    if fail:
+        raise RuntimeError('shlyuz javob bermadi')
+
+
+def run_pending(worker='test'):
+    """Navbat bo'shaguncha bajarish (run_workers --once kabi)"""
+    while True:
+        claimed = claim_jobs(worker)
+        if not claimed:
+            return
+        for job in claimed:
+            run_job(job)
+
+
+class QueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_key_deduplicates(self):
+        first = enqueue('test_flaky', {'fail': False}, key='k')
+        second = enqueue('test_flaky', {'fail': True}, key='k')
+        self.assertEqual(first.pk, second.pk)
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_claim_is_exclusive_and_respects_run_at(self):
+        ready = enqueue('test_flaky', {'fail': False})
+        enqueue('test_flaky', {'fail': False}, delay=60)
+
+        self.assertEqual([job.pk for job in claim_jobs('a')], [ready.pk])
+        self.assertEqual(claim_jobs('b'), [])
+        ready.refresh_from_db()
+        self.assertEqual((ready.status, ready.locked_by), (Job.STATUS_RUNNING, 'a'))
+
+    def test_failure_is_retried_with_backoff(self):
+        job = enqueue('test_flaky', {'fail': True}, max_attempts=2)
+        before = timezone.now()
+
+        with self.assertLogs('accounts.jobs', 'ERROR'):
+            job = run_job(claim_jobs('a')[0])
+        self.assertEqual((job.status, job.attempts), (Job.STATUS_PENDING, 1))
+        self.assertIn('RuntimeError', job.last_error)
+        self.assertGreater(job.run_at, before)
+        self.assertEqual(claim_jobs('a'), [])
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        with self.assertLogs('accounts.jobs', 'ERROR'):
+            job = run_job(claim_jobs('a')[0])
+        self.assertEqual((job.status, job.attempts), (Job.STATUS_FAILED, 2))
+        self.assertEqual(calls, [True, True])
+
+    def test_unknown_handler_fails_the_attempt(self):
+        enqueue('no_such_job', max_attempts=1)
+        with self.assertLogs('accounts.jobs', 'ERROR'):
+            job = run_job(claim_jobs('a')[0])
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertIn('LookupError', job.last_error)
+
+    def test_worker_survives_claim_errors(self):
+        claim = mock.Mock(side_effect=[OperationalError('database is locked'), []])
+        with mock.patch('accounts.management.commands.run_workers.claim_jobs', claim), \
+                self.assertLogs('accounts.jobs', 'ERROR') as logs:
+            call_command('run_workers', '--once', '--workers', '1', '--poll-interval', '0', stdout=StringIO())
+        self.assertEqual(claim.call_count, 2)
+        self.assertIn('database is locked', logs.output[0])
+
+    def test_stale_jobs_are_released(self):
+        stale = enqueue('test_flaky', {'fail': False})
+        fresh = enqueue('test_flaky', {'fail': False})
+        claim_jobs('dead')
+        Job.objects.filter(pk=stale.pk).update(locked_at=timezone.now() - timedelta(seconds=601))
+
+        self.assertEqual(release_stale_jobs(timeout=600), 1)
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual((stale.status, stale.locked_by), (Job.STATUS_PENDING, ''))
+        self.assertEqual(fresh.status, Job.STATUS_RUNNING)
+        self.assertEqual([job.pk for job in claim_jobs('b')], [stale.pk])
+
+
+class UserActivatedTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_superuser(
+            'root', 'root@example.com', 'x', role='super_admin'
+        )
+        cls.user = CustomUser.objects.create_user(
+            'pending', 'pending@example.com', 'x', phone_number='+998901234567',
+            registration_status=CustomUser.STATUS_PENDING, is_active=False,
+        )
+
+    def activate(self):
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        response = client.post(reverse('activate_user', args=[self.user.pk]))
+        self.assertEqual(response.status_code, 200)
+
+    def activation_jobs(self):
+        return Job.objects.filter(name='user_activated', key__startswith=f'user_activated:{self.user.pk}:')
+
+    def test_activation_is_enqueued_once_per_transition(self):
+        self.activate()
+        # Allaqachon faol - yangi xabarnoma yo'q
+        self.activate()
+        self.assertEqual(self.activation_jobs().count(), 1)
+        run_pending()
+        self.assertEqual(len(mail.outbox), 1)
+
+        # O'chirilib qayta tasdiqlangan foydalanuvchi yana xabar oladi
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        self.assertEqual(client.post(reverse('deactivate_user', args=[self.user.pk])).status_code, 200)
+        self.activate()
+        self.assertEqual(self.activation_jobs().count(), 2)
+        run_pending()
+        self.assertEqual(len(mail.outbox), 2)
+
+    def test_admin_action_enqueues_activation(self):
+        self.client.force_login(self.admin)
+        for _ in range(2):
+            response = self.client.post(reverse('admin:accounts_customuser_changelist'), {
+                'action': 'activate_users', '_selected_action': [self.user.pk],
+            })
+            self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.activation_jobs().count(), 1)
+
+    def test_each_channel_is_sent_once(self):
+        self.activate()
+        gateway = mock.Mock(side_effect=[RuntimeError('timeout'), None])
+        with override_settings(SMS_BACKEND=gateway), self.assertLogs('accounts.jobs', 'ERROR'):
+            run_pending()
+            # SMS xato berdi - qayta urinishda email takrorlanmaydi
+            Job.objects.filter(status=Job.STATUS_PENDING).update(run_at=timezone.now())
+            run_pending()
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [self.user.email])
+        self.assertEqual(gateway.call_count, 2)
+        self.assertFalse(Job.objects.exclude(status=Job.STATUS_DONE).exists())
@@ -0,0 +1,125 @@
+"""Login hodisalari: buferlash, taymer bilan yozish, muvaffaqiyatsiz urinishlar va rollup"""
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.hashers import make_password
+from django.db.models import Sum
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts import login_events, throttling
+from accounts.models import CustomUser, LoginEvent, LoginStat, Warehouse, WarehouseMembership
+
+
+class BufferTests(TestCase):
+    def setUp(self):
+        self.addCleanup(login_events.flush)
+
+    @override_settings(LOGIN_EVENTS={'BATCH_SIZE': 3})
+    def test_written_in_batches(self):
+        login_events.record(LoginEvent.KIND_LOGIN, 1, 'warehouse_admin', [5, 2])
+        login_events.record(LoginEvent.KIND_FAILED)
+        self.assertFalse(LoginEvent.objects.exists())
+        with self.assertNumQueries(1):
+            login_events.record(LoginEvent.KIND_REFRESH, 1, 'warehouse_admin', [2])
+        self.assertEqual(
+            list(LoginEvent.objects.order_by('pk').values_list('kind', 'user_id', 'warehouse_id')),
+            [(LoginEvent.KIND_LOGIN, 1, 2), (LoginEvent.KIND_FAILED, None, None), (LoginEvent.KIND_REFRESH, 1, 2)],
+        )
+
+    def test_flush_cancels_timer(self):
+        login_events.record(LoginEvent.KIND_LOGIN, 1)
+        timer = login_events._timer
+        self.assertTrue(timer.daemon)
+        self.assertEqual(login_events.flush(), 1)
+        self.assertIsNone(login_events._timer)
+        self.assertTrue(timer.finished.is_set())
+        self.assertEqual(login_events.flush(), 0)
+
+
+class TimerFlushTests(TransactionTestCase):
+    @override_settings(LOGIN_EVENTS={'FLUSH_INTERVAL': 0.05})
+    def test_idle_buffer_is_flushed_without_new_events(self):
+        self.addCleanup(login_events.flush)
+        login_events.record(LoginEvent.KIND_LOGIN, 1)
+        timer = login_events._timer
+        timer.join(5)
+        self.assertFalse(timer.is_alive())
+        self.assertEqual(LoginEvent.objects.count(), 1)
+        self.assertIsNone(login_events._timer)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class FailedLoginTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.warehouse = Warehouse.objects.create(code='B1', name='Filial 1')
+        cls.user = CustomUser.objects.create(
+            username='ali', password=make_password('secret'), role='warehouse_receiver',
+        )
+        WarehouseMembership.objects.create(user=cls.user, warehouse=cls.warehouse, role=cls.user.role)
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        store = throttling.SharedTokenBucketStore(os.path.join(directory, 'throttle.bin'), groups=64)
+        patcher = mock.patch.object(throttling, '_store', store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(login_events.flush)
+
+    def test_failed_attempt_is_attributed_to_existing_user(self):
+        client = APIClient()
+        for username in ('ali', 'nobody'):
+            response = client.post(reverse('login'), {'username': username, 'password': 'wrong'}, format='json')
+            self.assertEqual(response.status_code, 400)
+        login_events.flush()
+        self.assertEqual(
+            list(LoginEvent.objects.order_by('pk').values_list('kind', 'user_id', 'role', 'warehouse_id')),
+            [
+                (LoginEvent.KIND_FAILED, self.user.pk, 'warehouse_receiver', self.warehouse.pk),
+                (LoginEvent.KIND_FAILED, None, '', None),
+            ],
+        )
+
+
+class RollupTests(TestCase):
+    def event(self, now, minutes_ago, kind, user_id=None, role='warehouse_admin', warehouse_id=1):
+        LoginEvent.objects.create(
+            created_at=now - timedelta(minutes=minutes_ago), kind=kind,
+            user_id=user_id, role=role, warehouse_id=warehouse_id,
+        )
+
+    def test_rollup_and_prune(self):
+        now = timezone.now().replace(minute=30, second=0, microsecond=0)
+        self.event(now, 10, LoginEvent.KIND_LOGIN, 1)
+        self.event(now, 20, LoginEvent.KIND_REFRESH, 1)
+        self.event(now, 25, LoginEvent.KIND_FAILED)
+        self.event(now, 15, LoginEvent.KIND_LOGIN, 2, role='warehouse_receiver', warehouse_id=2)
+        self.event(now, 60, LoginEvent.KIND_LOGIN, 3)
+        self.event(now, 60 * 24 * 10, LoginEvent.KIND_LOGIN, 4)
+
+        login_events.rollup(now)
+        hour = LoginStat.objects.filter(period=LoginStat.PERIOD_HOUR)
+        current = hour.get(bucket=now.replace(minute=0), role='warehouse_admin')
+        self.assertEqual((current.logins, current.failed, current.refreshes, current.active_users), (1, 1, 1, 1))
+        self.assertEqual(hour.filter(bucket=now.replace(minute=0)).count(), 2)
+        self.assertEqual(hour.aggregate(Sum('logins'))['logins__sum'], 4)
+        days = LoginStat.objects.filter(period=LoginStat.PERIOD_DAY)
+        self.assertEqual(days.aggregate(Sum('logins'))['logins__sum'], 4)
+
+        # Kech yozilgan hodisa qayta hisoblanadigan oynaga tushadi; takroriy rollup ikki marta sanamaydi
+        self.event(now, 5, LoginEvent.KIND_LOGIN, 5)
+        login_events.rollup(now)
+        self.assertEqual(hour.aggregate(Sum('logins'))['logins__sum'], 5)
+        self.assertEqual(days.aggregate(Sum('logins'))['logins__sum'], 5)
+
+        # Faqat saqlash muddati o'tgan (va yig'ilgan) hodisa o'chiriladi
+        self.assertEqual(login_events.prune(now), 1)
+        self.assertFalse(LoginEvent.objects.filter(user_id=4).exists())
+        self.assertEqual(LoginEvent.objects.count(), 6)
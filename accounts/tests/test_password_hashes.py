@@ -0,0 +1,51 @@
+"""manage.py password_hashes: xeshlar hisoboti va parolsiz o'rash"""
+from io import StringIO
+
+from django.contrib.auth.hashers import check_password, get_hasher, make_password
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+
+from accounts.hashers import PBKDF2WrappedPBKDF2PasswordHasher
+from accounts.management.commands.password_hashes import describe
+from accounts.models import CustomUser
+
+
+class DescribeTests(TestCase):
+    def setUp(self):
+        self.preferred = get_hasher('default')
+        self.old = get_hasher('pbkdf2_sha256').encode('secret', 'salt1234', 1000)
+
+    def test_outdated_pbkdf2(self):
+        self.assertEqual(describe(self.old, self.preferred), ('pbkdf2_sha256', 'iterations=1000', True))
+        self.assertFalse(describe(make_password('secret'), self.preferred)[2])
+        self.assertEqual(describe(make_password(None), self.preferred), ('unusable', '-', False))
+
+    def test_wrapped_hash_with_current_work_is_not_outdated(self):
+        wrapped = PBKDF2WrappedPBKDF2PasswordHasher().wrap(self.old)
+        algorithm, params, outdated = describe(wrapped, self.preferred)
+        self.assertEqual(algorithm, 'pbkdf2_wrapped_pbkdf2_sha256')
+        self.assertIn('inner_iterations=1000', params)
+        self.assertFalse(outdated)
+
+        # Keyingi Django versiyasida iteratsiyalar oshsa - yana eskirgan
+        newer = type(self.preferred)()
+        newer.iterations = self.preferred.iterations + 1
+        self.assertTrue(describe(wrapped, newer)[2])
+
+
+class UpgradeTests(TransactionTestCase):
+    def test_upgrade_wraps_outdated_hashes(self):
+        old = get_hasher('pbkdf2_sha256').encode('secret', 'salt1234', 1000)
+        user = CustomUser.objects.create(username='ali', password=old)
+        current = CustomUser.objects.create(username='vali', password=make_password('secret')).password
+
+        out = StringIO()
+        call_command('password_hashes', '--upgrade', '--workers', '1', stdout=out)
+
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith('pbkdf2_wrapped_pbkdf2_sha256$'))
+        self.assertTrue(check_password('secret', user.password))
+        self.assertEqual(CustomUser.objects.get(username='vali').password, current)
+        # Yakuniy hisobotda eskirgan xesh qolmaydi
+        report = out.getvalue().split("1 ta xesh kuchaytirildi")[1]
+        self.assertNotIn('eskirgan', report)
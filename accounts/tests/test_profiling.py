@@ -0,0 +1,137 @@
+"""So'rov bo'yicha profilerlash: trigger, ruxsat, hisobotlar halqasi va yuklab olish"""
+import json
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from accounts.models import CustomUser
+from accounts.profiling import list_reports, report_path, reports_dir
+from accounts.tokens import WarehouseRefreshToken
+
+
+class ProfilingTestMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create(
+            username='root', password=make_password(None), role='super_admin', is_superuser=True,
+        )
+        cls.staff = CustomUser.objects.create(
+            username='staff', password=make_password(None), role='warehouse_admin',
+        )
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        settings = override_settings(REQUEST_PROFILING={'DIR': directory, 'MAX_REPORTS': 2})
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def auth(self, user):
+        return {'HTTP_AUTHORIZATION': f'Bearer {WarehouseRefreshToken.for_user(user).access_token}'}
+
+    def load(self, response):
+        with open(report_path(response['X-Profile-Id'], '.json')) as f:
+            return json.load(f)
+
+    def assertProfiledView(self, report):
+        self.assertEqual(report['status'], 200)
+        self.assertGreaterEqual(report['sql']['count'], 1)
+        self.assertTrue(any('accounts_customuser' in query['sql'] for query in report['sql']['queries']))
+        self.assertTrue(
+            any('accounts/views.py' in row['function'] for row in report['functions']),
+            [row['function'] for row in report['functions']],
+        )
+
+
+class ReportsDirTests(SimpleTestCase):
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.base, ignore_errors=True)
+
+    def test_default_is_private_dir_under_var(self):
+        with override_settings(BASE_DIR=self.base, REQUEST_PROFILING={}):
+            path = reports_dir()
+        self.assertEqual(path, os.path.join(self.base, 'var', 'profiles'))
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o700)
+
+    def test_refuses_shared_directory(self):
+        os.chmod(self.base, 0o777)
+        with override_settings(REQUEST_PROFILING={'DIR': self.base}):
+            with self.assertRaises(ImproperlyConfigured):
+                reports_dir()
+
+
+class RequestProfilerTests(ProfilingTestMixin, TestCase):
+    def test_header_profiles_view_and_sql(self):
+        response = self.client.get(reverse('user_list'), HTTP_X_PROFILE='1', **self.auth(self.admin))
+        self.assertEqual(response.status_code, 200)
+        report = self.load(response)
+        self.assertEqual((report['trigger'], report['path']), ('requested', reverse('user_list')))
+        self.assertProfiledView(report)
+
+    def test_query_param(self):
+        response = self.client.get(reverse('check_auth') + '?_profile=1', **self.auth(self.admin))
+        self.assertIn('X-Profile-Id', response)
+
+    def test_not_profiled_without_permission(self):
+        for headers in (self.auth(self.staff), {}):
+            response = self.client.get(reverse('check_auth'), HTTP_X_PROFILE='1', **headers)
+            self.assertNotIn('X-Profile-Id', response)
+        self.assertEqual(list_reports(), [])
+
+    def test_sampling(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        with override_settings(REQUEST_PROFILING={'DIR': directory, 'SAMPLE_RATE': 1.0}):
+            # Sozlama middleware yaratilganda o'qiladi - yangi client
+            response = self.client_class().get(reverse('check_auth'))
+            self.assertEqual(self.load(response)['trigger'], 'sampled')
+
+    def test_ring_and_download(self):
+        headers = {'HTTP_X_PROFILE': '1', **self.auth(self.admin)}
+        ids = [self.client.get(reverse('check_auth'), **headers)['X-Profile-Id'] for _ in range(3)]
+        # MAX_REPORTS=2: halqada eng yangi ikkitasi qoladi
+        kept = list_reports()
+        self.assertEqual(len(kept), 2)
+        self.assertLessEqual(set(kept), set(ids))
+        removed = (set(ids) - set(kept)).pop()
+
+        listed = self.client.get(reverse('profile_reports'), **self.auth(self.admin))
+        self.assertEqual(listed.json()['reports'], kept)
+        report = self.client.get(reverse('profile_report', args=[kept[0]]), **self.auth(self.admin))
+        self.assertEqual(json.loads(b''.join(report.streaming_content))['id'], kept[0])
+        pstats = self.client.get(reverse('profile_report_pstats', args=[kept[0]]), **self.auth(self.admin))
+        self.assertIn('attachment', pstats['Content-Disposition'])
+        self.assertEqual(
+            self.client.get(reverse('profile_report', args=[removed]), **self.auth(self.admin)).status_code, 404
+        )
+        self.assertEqual(
+            self.client.get(reverse('profile_report', args=[kept[0]]), **self.auth(self.staff)).status_code, 403
+        )
+
+    def test_report_path_rejects_traversal(self):
+        self.assertIsNone(report_path('../../etc/passwd', '.json'))
+
+
+class AsgiRequestProfilerTests(ProfilingTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        # Token bazadan o'qiladi - async test ichida emas
+        self.headers = {'X-Profile': '1', 'Authorization': self.auth(self.admin)['HTTP_AUTHORIZATION']}
+
+    async def test_sync_view_is_profiled_in_its_thread(self):
+        response = await self.async_client.get(reverse('user_list'), headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        report = self.load(response)
+        self.assertEqual(report['path'], reverse('user_list'))
+        self.assertProfiledView(report)
+
+    async def test_not_found(self):
+        response = await self.async_client.get('/api/auth/missing/', headers=self.headers)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.load(response)['status'], 404)
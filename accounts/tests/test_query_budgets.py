@@ -0,0 +1,360 @@
+"""
+accounts endpoint'lari uchun SQL so'rovlar byudjeti.
+
+Har bir marshrut (``accounts.urls``) bir necha jadval hajmida (``SIZES``
+ta seed foydalanuvchi) chaqiriladi va so'rovlar soni, yozuvlar
+(INSERT/UPDATE/DELETE), SELECT'lar qaytargan qatorlar va vaqt o'lchanadi.
+Chegaralar faqat ``BUDGETS`` da belgilanadi. Byudjet oshsa, xato xabarida
+takrorlangan so'rovlar va eng kichik hajmdagi chaqiruvga nisbatan SQL
+diff'i chiqadi - N+1 odatda shu diff'da darhol ko'rinadi.
+
+    python manage.py test accounts
+    QUERY_BUDGET_REPORT=budget.txt python manage.py test accounts   # o'lchovlar jadvali faylga
+
+Byudjetni oshirish kerak bo'lsa (yangi so'rov asosli bo'lsa), sababini
+shu yerda izoh bilan yozing.
+"""
+import cProfile
+import difflib
+import os
+import re
+import shutil
+import tempfile
+import time
+from collections import Counter
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from accounts import login_events, throttling
+from accounts.management.commands.seed_users import build_chunk, build_tokens
+from accounts.models import AuditLog, CustomUser, LoginStat, Warehouse, WarehouseMembership
+from accounts.profiling import SQLRecorder, save_report
+from accounts.tokens import WarehouseRefreshToken
+from accounts.urls import urlpatterns
+
+# Seed foydalanuvchilar soni (o'sib boradi: har bosqich oldingisiga qo'shiladi)
+SIZES = (10, 100, 1000)
+
+# queries - jami SQL so'rovlar, writes - ulardan INSERT/UPDATE/DELETE,
+# rows - SELECT'lar qaytargan qatorlar: rows + rows_per_user * seed hajmi.
+# Kalit - URL nomi; bitta marshrutning bir nechta varianti "nom:variant".
+BUDGETS = {
+    # Foydalanuvchi + omborlar claim'i; OutstandingToken yozuvi
+    'login': {'queries': 3, 'writes': 1, 'rows': 2},
+    # Blacklist tekshiruvi + omborlar va rol claim'larini yangilash
+    'token_refresh': {'queries': 3, 'rows': 2},
+    'user_profile': {'queries': 1, 'rows': 1},
+    'logout': {'queries': 5, 'writes': 1, 'rows': 2},
+    'check_auth': {'queries': 1, 'rows': 1},
+    # Ichki chaqiruvlar tashqi so'rov foydalanuvchisini qayta o'qimaydi
+    'batch': {'queries': 2, 'rows': 3, 'rows_per_user': 0.1},
+    'user_list': {'queries': 2, 'rows': 5, 'rows_per_user': 0.5},
+    'user_list:super_admin': {'queries': 2, 'rows': 5, 'rows_per_user': 1},
+    # Uniqueness tekshiruvlari, INSERT + set_password UPDATE, a'zolik, audit
+    'create_user': {'queries': 10, 'writes': 5, 'rows': 2},
+    # + Job navbati
+    'register': {'queries': 8, 'writes': 6, 'rows': 1},
+    'activate_user': {'queries': 6, 'writes': 4, 'rows': 2},
+    'deactivate_user': {'queries': 5, 'writes': 3, 'rows': 2},
+    'reject_user': {'queries': 5, 'writes': 3, 'rows': 2},
+    'pending_users': {'queries': 2, 'rows': 3, 'rows_per_user': 0.1},
+    # Cursor pagination: sahifadan ortiq o'qilmaydi (COUNT ham yo'q)
+    'user_audit_log': {'queries': 2, 'rows': 52},
+    'audit_log': {'queries': 2, 'rows': 52},
+    'login_stats': {'queries': 2, 'rows': 202},
+    'profile_reports': {'queries': 1, 'rows': 1},
+    'profile_report': {'queries': 1, 'rows': 1},
+    'profile_report_pstats': {'queries': 1, 'rows': 1},
+    'async_user_profile': {'queries': 1, 'rows': 1},
+    'async_check_auth': {'queries': 1, 'rows': 1},
+    'async_user_list': {'queries': 2, 'rows': 5, 'rows_per_user': 0.5},
+    'async_pending_users': {'queries': 2, 'rows': 3, 'rows_per_user': 0.1},
+}
+
+PASSWORD = 'Budget12345'
+WRITE_PREFIXES = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+# Tranzaksiya boshqaruvi so'rov hisoblanmaydi
+CONTROL_PREFIXES = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT', 'BEGIN', 'COMMIT')
+IN_LIST_RE = re.compile(r'\(%s(?:, %s)+\)')
+
+
+def normalize_sql(sql):
+    """Taqqoslash uchun: IN (...) ro'yxati uzunligi ahamiyatsiz"""
+    return IN_LIST_RE.sub('(%s, ...)', ' '.join(sql.split()))
+
+
+class BudgetRecorder(SQLRecorder):
+    """SQLRecorder + har bir SELECT qaytargan qatorlar soni"""
+
+    def __init__(self):
+        super().__init__()
+        self._counting = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if self._counting:
+            return execute(sql, params, many, context)
+        if sql.lstrip().upper().startswith(CONTROL_PREFIXES):
+            return execute(sql, params, many, context)
+        result = super().__call__(execute, sql, params, many, context)
+        query = self.queries[-1]
+        query['rows'] = 0
+        if not many and sql.lstrip().upper().startswith('SELECT') and 'FOR UPDATE' not in sql.upper():
+            query['rows'] = self._count_rows(context['connection'], sql, params)
+        return result
+
+    def _count_rows(self, db, sql, params):
+        # So'rov natijasi chaqiruvchi tomonidan hali o'qilmagan - alohida cursor'da sanaymiz
+        self._counting = True
+        try:
+            with db.cursor() as cursor:
+                cursor.execute(f'SELECT COUNT(*) FROM ({sql}) budget_rows', params)
+                return cursor.fetchone()[0]
+        finally:
+            self._counting = False
+
+    @property
+    def writes(self):
+        return sum(1 for q in self.queries if q['sql'].lstrip().upper().startswith(WRITE_PREFIXES))
+
+    @property
+    def rows(self):
+        return sum(q['rows'] for q in self.queries)
+
+    def statements(self):
+        return [normalize_sql(q['sql']) for q in self.queries]
+
+
+def collapse(statements):
+    """Ketma-ket bir xil so'rovlar bitta qatorga: N+1 diff'da "[50x]" bo'lib ko'rinadi"""
+    lines = []
+    for sql in statements:
+        if lines and lines[-1][1] == sql:
+            lines[-1][0] += 1
+        else:
+            lines.append([1, sql])
+    return [sql if count == 1 else f'[{count}x] {sql}' for count, sql in lines]
+
+
+def write_report(path, report):
+    """O'lchovlar jadvali (test natijasi chiqishini buzmaslik uchun faylga)"""
+    with open(path, 'w') as f:
+        f.write(f"{'endpoint':28s} {'size':>6s} {'queries':>8s} {'writes':>7s} {'rows':>7s} {'ms':>9s}\n")
+        for key, size, queries, writes, rows, elapsed in report:
+            f.write(f'{key:28s} {size:6d} {queries:8d} {writes:7d} {rows:7d} {elapsed:9.2f}\n')
+
+
+def route_names():
+    return {pattern.name for pattern in urlpatterns if isinstance(pattern, URLPattern)}
+
+
+@override_settings(
+    # Tez xeshlash: byudjet parol algoritmiga bog'liq emas (fonda yangilash ham ishlamaydi)
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+    # Login hodisalari o'lchov davomida buferdan yozilmasin
+    LOGIN_EVENTS={'BATCH_SIZE': 10 ** 6, 'FLUSH_INTERVAL': 10 ** 6},
+)
+class QueryBudgetTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls._profiles_dir = tempfile.mkdtemp()
+        cls._throttle_dir = tempfile.mkdtemp()
+        # Throttle holati /tmp'dagi umumiy faylga yozilmasin (takroriy ishga tushirishda 429)
+        cls._throttle_patch = mock.patch.object(
+            throttling, '_store',
+            throttling.SharedTokenBucketStore(os.path.join(cls._throttle_dir, 'throttle.bin'), groups=256),
+        )
+        cls._throttle_patch.start()
+        cls._profiles_settings = override_settings(REQUEST_PROFILING={'DIR': cls._profiles_dir})
+        cls._profiles_settings.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls._profiles_settings.disable()
+        cls._throttle_patch.stop()
+        shutil.rmtree(cls._profiles_dir, ignore_errors=True)
+        shutil.rmtree(cls._throttle_dir, ignore_errors=True)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.main = Warehouse.objects.create(name='Asosiy ombor', code='MAIN', is_main=True)
+        cls.branch = Warehouse.objects.create(name='Filial', code='BR1')
+        cls.root = cls._create_user('root', 'super_admin')
+        cls.manager = cls._create_user('manager', 'main_warehouse_admin', cls.main)
+        cls.storekeeper = cls._create_user('storekeeper', 'warehouse_receiver', cls.main)
+        cls.pending = cls._create_user(
+            'pending', 'warehouse_receiver', cls.main,
+            is_active=False, registration_status=CustomUser.STATUS_PENDING,
+        )
+        cls.refresh = str(WarehouseRefreshToken.for_user(cls.storekeeper))
+        cls.report_id = save_report({}, cls._profiled())
+
+    @classmethod
+    def _create_user(cls, username, role, warehouse=None, **extra):
+        user = CustomUser.objects.create_user(
+            username, f'{username}@budget.uz', PASSWORD, role=role, **extra
+        )
+        if warehouse is not None:
+            WarehouseMembership.objects.create(user=user, warehouse=warehouse, role=role)
+        return user
+
+    @staticmethod
+    def _profiled():
+        profiler = cProfile.Profile()
+        profiler.enable()
+        profiler.disable()
+        return profiler
+
+    def tearDown(self):
+        # Buferdagi login hodisalari test bazasi yopilishidan oldin yoziladi
+        login_events.flush()
+
+    def seed(self, start, count):
+        """``count`` ta seed foydalanuvchi + a'zolik, audit va login statistikasi"""
+        # seed_users bilan bir xil ma'lumotlar (seed_chunk'dagi PRAGMA tranzaksiya ichida ishlamaydi)
+        now = timezone.now()
+        rng, users = build_chunk(42, start, start, count, self.password_hash, now)
+        users = [(user.pk, user.role) for user in CustomUser.objects.bulk_create(users)]
+        outstanding, blacklisted = build_tokens(rng, [pk for pk, _ in users], 0.3, 0.2, now)
+        by_jti = {token.jti: token for token in OutstandingToken.objects.bulk_create(outstanding)}
+        BlacklistedToken.objects.bulk_create(BlacklistedToken(token=by_jti[jti]) for jti in blacklisted)
+        warehouses = (self.main.pk, self.branch.pk)
+        WarehouseMembership.objects.bulk_create(
+            WarehouseMembership(user_id=pk, warehouse_id=warehouses[pk % 2], role=role)
+            for pk, role in users
+        )
+        AuditLog.objects.bulk_create(
+            AuditLog(target_id=pk, action='registered', source='register') for pk, _ in users
+        )
+        LoginStat.objects.bulk_create(
+            LoginStat(period=LoginStat.PERIOD_HOUR, bucket=now - timedelta(hours=(start + i) % 24),
+                      role=role, warehouse_id=warehouses[pk % 2], logins=1, active_users=1)
+            for i, (pk, role) in enumerate(users)
+        )
+
+    def requests(self, size):
+        """Byudjet kaliti -> (foydalanuvchi, metod, URL nomi, URL argumentlari, tana)"""
+        register = {
+            'first_name': 'Yangi', 'last_name': 'Xodim', 'email': f'new{size}@budget.uz',
+            'role': 'warehouse_receiver', 'password': PASSWORD, 'password_confirm': PASSWORD,
+            'warehouse': self.main.pk,
+        }
+        create = {
+            'username': f'created{size}', 'email': f'created{size}@budget.uz', 'password': PASSWORD,
+            'role': 'warehouse_receiver', 'warehouse': self.main.pk,
+        }
+        batch = {'requests': [{'path': 'check-auth/'}, {'path': 'profile/'}, {'path': 'users/pending/'}]}
+        report = {'report_id': self.report_id}
+        pending = {'user_id': self.pending.pk}
+        return {
+            'login': (None, 'post', 'login', {}, {'username': 'storekeeper', 'password': PASSWORD}),
+            'token_refresh': (None, 'post', 'token_refresh', {}, {'refresh': self.refresh}),
+            'user_profile': (self.storekeeper, 'get', 'user_profile', {}, None),
+            'logout': (self.storekeeper, 'post', 'logout', {}, {'refresh': self.refresh}),
+            'check_auth': (self.storekeeper, 'get', 'check_auth', {}, None),
+            'batch': (self.manager, 'post', 'batch', {}, batch),
+            'user_list': (self.manager, 'get', 'user_list', {}, None),
+            'user_list:super_admin': (self.root, 'get', 'user_list', {}, None),
+            'create_user': (self.root, 'post', 'create_user', {}, create),
+            'register': (None, 'post', 'register', {}, register),
+            'activate_user': (self.root, 'post', 'activate_user', pending, None),
+            'deactivate_user': (self.root, 'post', 'deactivate_user', {'user_id': self.storekeeper.pk}, None),
+            'reject_user': (self.root, 'post', 'reject_user', pending, None),
+            'pending_users': (self.manager, 'get', 'pending_users', {}, None),
+            'user_audit_log': (self.root, 'get', 'user_audit_log', pending, None),
+            'audit_log': (self.root, 'get', 'audit_log', {}, None),
+            'login_stats': (self.manager, 'get', 'login_stats', {}, None),
+            'profile_reports': (self.root, 'get', 'profile_reports', {}, None),
+            'profile_report': (self.root, 'get', 'profile_report', report, None),
+            'profile_report_pstats': (self.root, 'get', 'profile_report_pstats', report, None),
+            'async_user_profile': (self.storekeeper, 'get', 'async_user_profile', {}, None),
+            'async_check_auth': (self.storekeeper, 'get', 'async_check_auth', {}, None),
+            'async_user_list': (self.manager, 'get', 'async_user_list', {}, None),
+            'async_pending_users': (self.manager, 'get', 'async_pending_users', {}, None),
+        }
+
+    def measure(self, user, method, name, kwargs, data):
+        client = APIClient()
+        if user is not None:
+            token = WarehouseRefreshToken.for_user(user).access_token
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        url = reverse(name, kwargs=kwargs)
+        recorder = BudgetRecorder()
+        # Har bir chaqiruv o'z savepoint'ida - keyingilari bir xil holatni ko'radi
+        with transaction.atomic():
+            with connection.execute_wrapper(recorder):
+                # on_commit'dagi yozuvlar (audit) ham so'rov narxiga kiradi
+                with self.captureOnCommitCallbacks(execute=True):
+                    start = time.perf_counter()
+                    response = getattr(client, method)(url, data, format='json')
+                    content = b''.join(response.streaming_content) if response.streaming else response.content
+                    elapsed = (time.perf_counter() - start) * 1000
+            transaction.set_rollback(True)
+        if response.status_code >= 400:
+            self.fail(f'{name}: {response.status_code} {content[:500]!r}')
+        return recorder, elapsed
+
+    def test_every_route_has_budget(self):
+        budgeted = {key.split(':', 1)[0] for key in BUDGETS}
+        self.assertEqual(route_names() - budgeted, set(), "Yangi marshrut uchun BUDGETS'ga yozuv qo'shing")
+        self.assertEqual(budgeted - route_names(), set(), "BUDGETS'da mavjud bo'lmagan marshrut")
+        self.assertEqual(set(self.requests(0)), set(BUDGETS))
+
+    def test_query_budgets(self):
+        self.password_hash = make_password(PASSWORD)
+        baseline, report = {}, []
+        seeded = 0
+        for size in SIZES:
+            self.seed(seeded, size - seeded)
+            seeded = size
+            for key, spec in self.requests(size).items():
+                with self.subTest(endpoint=key, size=size):
+                    recorder, elapsed = self.measure(*spec)
+                    report.append((key, size, len(recorder.queries), recorder.writes, recorder.rows, elapsed))
+                    baseline.setdefault(key, (size, recorder.statements()))
+                    self.check_budget(key, size, recorder, baseline[key])
+        if os.environ.get('QUERY_BUDGET_REPORT'):
+            write_report(os.environ['QUERY_BUDGET_REPORT'], report)
+
+    def check_budget(self, key, size, recorder, baseline):
+        budget = BUDGETS[key]
+        limits = {
+            'queries': (len(recorder.queries), budget['queries']),
+            'writes': (recorder.writes, budget.get('writes', 0)),
+            'rows': (recorder.rows, budget.get('rows', 0) + int(budget.get('rows_per_user', 0) * size)),
+        }
+        exceeded = [f'{metric} {value} > {limit}' for metric, (value, limit) in limits.items() if value > limit]
+        if exceeded:
+            self.fail(self.explain(key, size, recorder, baseline, exceeded))
+
+    @staticmethod
+    def explain(key, size, recorder, baseline, exceeded):
+        statements = recorder.statements()
+        lines = [f"{key} ({size} seed foydalanuvchi): {', '.join(exceeded)}"]
+        repeated = [(sql, count) for sql, count in Counter(statements).most_common() if count > 1]
+        if repeated:
+            lines.append('Takrorlangan so\'rovlar:')
+            lines += [f'  {count}x {sql}' for sql, count in repeated]
+        base_size, base_statements = baseline
+        if base_size != size and base_statements != statements:
+            lines.append(f'SQL diff ({base_size} -> {size} seed foydalanuvchi):')
+            lines += difflib.unified_diff(
+                collapse(base_statements), collapse(statements), f'{key}@{base_size}', f'{key}@{size}', lineterm='', n=1
+            )
+        else:
+            lines.append('SQL:')
+            lines += [
+                f"  {i:3d}. [{q['rows']} qator] {sql}"
+                for i, (q, sql) in enumerate(zip(recorder.queries, statements), 1)
+            ]
+        return '\n'.join(lines)
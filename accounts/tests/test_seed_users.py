@@ -0,0 +1,61 @@
+"""manage.py seed_users: bo'laklar, tokenlar va pk qaytarmaydigan bazalar"""
+import base64
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection, models
+from django.test import TransactionTestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+from accounts.models import CustomUser, WarehouseMembership
+
+
+class SeedUsersTests(TransactionTestCase):
+    def seed(self, count=40, **options):
+        options = {'chunk_size': 15, 'batch_size': 7, 'workers': 1, 'token_ratio': 0.5, **options}
+        call_command('seed_users', count=count, stdout=StringIO(), **options)
+
+    def check_tables(self, count):
+        self.assertEqual(CustomUser.objects.count(), count)
+        tokens = OutstandingToken.objects.all()
+        self.assertTrue(tokens.exists())
+        # Har bir token o'z foydalanuvchisiga (payload'dagi user_id) bog'langan
+        for token in tokens:
+            self.assertIn(f'"user_id": {token.user_id}', self.payload(token))
+        self.assertTrue(BlacklistedToken.objects.exists())
+        self.assertFalse(CustomUser.objects.filter(email_normalized__isnull=True).exists())
+        # Super admin'dan boshqa hamma kamida bitta omborga biriktirilgan, a'zolik roli - foydalanuvchiniki
+        staff = CustomUser.objects.exclude(role='super_admin')
+        self.assertFalse(staff.filter(warehouse_memberships__isnull=True).exists())
+        self.assertFalse(WarehouseMembership.objects.filter(user__role='super_admin').exists())
+        self.assertFalse(WarehouseMembership.objects.exclude(role=models.F('user__role')).exists())
+
+    def payload(self, token):
+        part = token.token.split('.')[1]
+        return base64.urlsafe_b64decode(part + '=' * (-len(part) % 4)).decode()
+
+    def test_seed(self):
+        self.seed()
+        self.check_tables(40)
+        # Keyingi ishga tushirish raqamlashni davom ettiradi (username'lar to'qnashmaydi)
+        self.seed(count=10)
+        self.assertEqual(CustomUser.objects.count(), 50)
+
+    def test_backend_without_returning_pks(self):
+        # MySQL kabi: bulk_create obyektlarga pk qo'ymaydi
+        with mock.patch.object(
+            type(connection.features), 'can_return_rows_from_bulk_insert',
+            new_callable=mock.PropertyMock, return_value=False,
+        ):
+            self.seed()
+        self.check_tables(40)
+
+    def test_deterministic(self):
+        self.seed(count=20, seed=7)
+        first = list(CustomUser.objects.order_by('pk').values_list('username', 'role', 'registration_status'))
+        OutstandingToken.objects.all().delete()
+        CustomUser.objects.all().delete()
+        self.seed(count=20, seed=7, start=0)
+        second = list(CustomUser.objects.order_by('pk').values_list('username', 'role', 'registration_status'))
+        self.assertEqual(first, second)
@@ -0,0 +1,64 @@
+"""?fields= : javob maydonlari va SELECT ustunlari birga qisqaradi"""
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import serializers
+from rest_framework.test import APIClient
+
+from accounts.models import CustomUser
+from accounts.serializers import UserSerializer
+from accounts.tokens import WarehouseRefreshToken
+
+
+class ParseFieldsTests(TestCase):
+    def test_parse(self):
+        self.assertIsNone(UserSerializer.parse_fields(None))
+        self.assertEqual(UserSerializer.parse_fields(' id, username,id ,'), ('id', 'username'))
+        for value in ('', ' , ', 'id,password'):
+            with self.assertRaises(serializers.ValidationError, msg=value):
+                UserSerializer.parse_fields(value)
+
+
+class SparseFieldsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create(
+            username='root', password=make_password(None), role='super_admin', email='root@example.com',
+        )
+        CustomUser.objects.create(
+            username='new', password=make_password(None), role='warehouse_receiver',
+            is_active=False, registration_status=CustomUser.STATUS_PENDING,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {WarehouseRefreshToken.for_user(self.admin).access_token}')
+
+    def test_list_selects_only_requested_columns(self):
+        for name in ('user_list', 'pending_users', 'async_user_list', 'async_pending_users'):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse(name), {'fields': 'id,username'})
+            self.assertEqual(response.status_code, 200, name)
+            self.assertTrue(response.json(), name)
+            for row in response.json():
+                self.assertEqual(list(row), ['id', 'username'])
+            select = [q['sql'] for q in queries if 'FROM "accounts_customuser"' in q['sql']][-1]
+            self.assertNotIn('"email"', select)
+            self.assertNotIn('"password"', select)
+
+    def test_full_list_by_default(self):
+        row = self.client.get(reverse('user_list')).json()[0]
+        self.assertEqual(list(row), list(UserSerializer.Meta.fields))
+
+    def test_profile(self):
+        for name in ('user_profile', 'async_user_profile'):
+            response = self.client.get(reverse(name), {'fields': 'username,email'})
+            self.assertEqual(response.json(), {'username': 'root', 'email': 'root@example.com'}, name)
+
+    def test_unknown_fields(self):
+        for name in ('user_list', 'pending_users', 'user_profile', 'async_user_list', 'async_user_profile'):
+            response = self.client.get(reverse(name), {'fields': 'username,password'})
+            self.assertEqual(response.status_code, 400, name)
+            self.assertIn('password', response.json()['fields'], name)
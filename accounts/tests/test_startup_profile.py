@@ -0,0 +1,73 @@
+"""manage.py startup_profile: importtime tahlili va JSON hisobot"""
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+import manage
+from accounts.management.commands.startup_profile import parse_importtime
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      1500 |       4200 | django.conf
+import time:        80 |       2700 |   django.utils.functional
+not an import line
+"""
+
+
+class StartupProfileTests(SimpleTestCase):
+    def test_parse_importtime(self):
+        self.assertEqual(parse_importtime(IMPORTTIME), [
+            ('_io', 120, 120, 1),
+            ('django.conf', 1500, 4200, 0),
+            ('django.utils.functional', 80, 2700, 1),
+        ])
+
+    def test_report(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        output = os.path.join(directory, 'startup.json')
+
+        call_command('startup_profile', '--output', output, '--top', '3', stdout=StringIO())
+        with open(output) as f:
+            report = json.load(f)
+
+        self.assertEqual(report['mode'], 'full')
+        self.assertIn('accounts', report['apps'])
+        self.assertLessEqual({'import_ms', 'models_ms', 'ready_ms', 'ready_kb'}, set(report['apps']['accounts']))
+        self.assertIn('urlconf', report['phases'])
+        self.assertIn('django', report['packages_ms'])
+        self.assertGreater(report['total_ms'], 0)
+        self.assertTrue(any(m['module'] == 'accounts.views' for m in report['modules']))
+
+    def test_cli_mode_skips_http_only_modules(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        output = os.path.join(directory, 'startup.json')
+
+        call_command('startup_profile', '--mode', 'cli', '--output', output, stdout=StringIO())
+        with open(output) as f:
+            report = json.load(f)
+
+        self.assertNotIn('urlconf', report['phases'])
+        self.assertNotIn('drf_yasg', report['apps'])
+        modules = {m['module'] for m in report['modules']}
+        for module in ('accounts.views', 'accounts.admin', 'rest_framework.response', 'django.test'):
+            self.assertNotIn(module, modules)
+
+    def test_cli_mode_skips_system_checks(self):
+        argv = ['manage.py', 'migrate', '--plan']
+        with mock.patch.dict(os.environ, {'DJANGO_STARTUP_MODE': 'cli'}):
+            self.assertEqual(manage.skip_system_checks(argv), ['manage.py', 'migrate', '--skip-checks', '--plan'])
+            self.assertEqual(manage.skip_system_checks(['manage.py', 'showmigrations'])[2:], ['--skip-checks'])
+            # check buyrug'ining o'zi va noma'lum buyruqlar o'zgarmaydi
+            for command in ('check', 'nosuch'):
+                self.assertEqual(manage.skip_system_checks(['manage.py', command]), ['manage.py', command])
+        with mock.patch.dict(os.environ, {'DJANGO_STARTUP_MODE': 'full'}):
+            self.assertEqual(manage.skip_system_checks(argv), argv)
@@ -0,0 +1,160 @@
+"""Token bucket: portlash, to'ldirish, siqib chiqarish, fayl xavfsizligi va jarayonlararo holat"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from accounts import login_events, throttling
+from accounts.throttling import SharedTokenBucketStore
+
+
+class StoreTestMixin:
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.path = os.path.join(self.directory, 'throttle.bin')
+
+
+class TokenBucketTests(StoreTestMixin, SimpleTestCase):
+    def test_burst_then_refill(self):
+        store = SharedTokenBucketStore(self.path, groups=16)
+        for _ in range(3):
+            self.assertEqual(store.consume('ip', rate=1, capacity=3, now=100), (True, 0.0))
+        allowed, wait = store.consume('ip', rate=1, capacity=3, now=100)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 1.0)
+
+        self.assertTrue(store.consume('ip', rate=1, capacity=3, now=101.5)[0])
+        self.assertFalse(store.consume('ip', rate=1, capacity=3, now=101.5)[0])
+        # Boshqa kalit alohida bucket
+        self.assertTrue(store.consume('other', rate=1, capacity=3, now=101.5)[0])
+
+    def test_refill_is_capped(self):
+        store = SharedTokenBucketStore(self.path, groups=16)
+        store.consume('ip', rate=1, capacity=2, now=0)
+        for _ in range(2):
+            self.assertTrue(store.consume('ip', rate=1, capacity=2, now=1000)[0])
+        self.assertFalse(store.consume('ip', rate=1, capacity=2, now=1000)[0])
+
+    def test_clock_going_back_does_not_refill(self):
+        store = SharedTokenBucketStore(self.path, groups=16)
+        store.consume('ip', rate=1, capacity=2, now=100)
+        store.consume('ip', rate=1, capacity=2, now=100)
+        self.assertFalse(store.consume('ip', rate=1, capacity=2, now=50)[0])
+        self.assertFalse(store.consume('ip', rate=1, capacity=2, now=50.5)[0])
+        self.assertTrue(store.consume('ip', rate=1, capacity=2, now=51)[0])
+
+    def test_clear(self):
+        store = SharedTokenBucketStore(self.path, groups=16)
+        store.consume('ip', rate=1, capacity=1, now=0)
+        store.clear()
+        self.assertTrue(store.consume('ip', rate=1, capacity=1, now=0)[0])
+
+    def test_cycling_keys_does_not_refill_own_bucket(self):
+        # Bitta guruh, 2 slot - har bir yangi kalit kimnidir siqib chiqaradi
+        store = SharedTokenBucketStore(self.path, groups=1, group_size=2)
+        self.assertTrue(store.consume('attacker', rate=0.1, capacity=1, now=0)[0])
+        self.assertFalse(store.consume('attacker', rate=0.1, capacity=1, now=1)[0])
+        for n in range(4):
+            store.consume(f'junk{n}', rate=0.1, capacity=1, now=2)
+        self.assertFalse(store.consume('attacker', rate=0.1, capacity=1, now=3)[0])
+
+    def test_full_buckets_are_evicted_first(self):
+        store = SharedTokenBucketStore(self.path, groups=1, group_size=2)
+        store.consume('idle', rate=1, capacity=1, now=0)
+        store.consume('busy', rate=0.01, capacity=1, now=0)
+        # 'idle' 1 soniyada to'ldi - uni unutish hech narsani yo'qotmaydi
+        self.assertTrue(store.consume('new', rate=1, capacity=1, now=5)[0])
+        self.assertFalse(store.consume('busy', rate=0.01, capacity=1, now=5)[0])
+
+    def test_shared_between_processes(self):
+        store = SharedTokenBucketStore(self.path, groups=16)
+        context = multiprocessing.get_context('fork')
+        child = context.Process(target=store.consume, args=('ip', 1e-6, 2), kwargs={'now': 0})
+        child.start()
+        child.join()
+        self.assertEqual(child.exitcode, 0)
+        self.assertTrue(store.consume('ip', rate=1e-6, capacity=2, now=0)[0])
+        self.assertFalse(store.consume('ip', rate=1e-6, capacity=2, now=0)[0])
+
+
+class StoreFileTests(StoreTestMixin, SimpleTestCase):
+    def test_file_is_private(self):
+        SharedTokenBucketStore(self.path, groups=16)
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+
+    def test_refuses_symlink(self):
+        target = os.path.join(self.directory, 'target')
+        open(target, 'w').close()
+        os.symlink(target, self.path)
+        with self.assertRaises(ImproperlyConfigured):
+            SharedTokenBucketStore(self.path, groups=16)
+
+    def test_refuses_loose_permissions(self):
+        SharedTokenBucketStore(self.path, groups=16)
+        os.chmod(self.path, 0o644)
+        with self.assertRaises(ImproperlyConfigured):
+            SharedTokenBucketStore(self.path, groups=16)
+
+    def test_refuses_shared_directory(self):
+        os.chmod(self.directory, 0o777)
+        with self.assertRaises(ImproperlyConfigured):
+            SharedTokenBucketStore(self.path, groups=16)
+
+    def test_resize_replaces_file_instead_of_truncating(self):
+        old = SharedTokenBucketStore(self.path, groups=16)
+        old.consume('ip', rate=1, capacity=1, now=0)
+        inode = os.stat(self.path).st_ino
+
+        new = SharedTokenBucketStore(self.path, groups=32)
+        self.assertNotEqual(os.stat(self.path).st_ino, inode)
+        self.assertEqual(os.path.getsize(self.path), new.size)
+        # Eski mapping (ishlayotgan worker) hali ham o'qiladi - SIGBUS yo'q
+        self.assertFalse(old.consume('ip', rate=1, capacity=1, now=0)[0])
+        self.assertTrue(new.consume('ip', rate=1, capacity=1, now=0)[0])
+
+    def test_path_is_required(self):
+        with override_settings(THROTTLE_STORE_PATH=None), mock.patch.object(throttling, '_store', None):
+            with self.assertRaises(ImproperlyConfigured):
+                throttling.get_store()
+
+
+class LoginThrottleTests(StoreTestMixin, TestCase):
+    def test_identifier_bucket_returns_429(self):
+        store = SharedTokenBucketStore(self.path, groups=64)
+        client = APIClient()
+        # Buferdagi login hodisalari test bazasi yopilishidan oldin yozilsin
+        self.addCleanup(login_events.flush)
+        with mock.patch.object(throttling, '_store', store):
+            # login_identifier: 10/min
+            for _ in range(10):
+                response = client.post(reverse('login'), {'username': 'ali', 'password': 'x'}, format='json')
+                self.assertEqual(response.status_code, 400)
+            response = client.post(reverse('login'), {'username': ' ali ', 'password': 'x'}, format='json')
+            self.assertEqual(response.status_code, 429)
+            self.assertIn('Retry-After', response)
+
+    @override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+    def test_forwarded_for_does_not_pick_ip_bucket(self):
+        store = SharedTokenBucketStore(self.path, groups=64)
+        client = APIClient()
+        self.addCleanup(login_events.flush)
+        with mock.patch.object(throttling, '_store', store):
+            # login_ip: 30/min; har safar boshqa username va boshqa X-Forwarded-For
+            for n in range(30):
+                response = client.post(
+                    reverse('login'), {'username': f'user{n}', 'password': 'x'}, format='json',
+                    HTTP_X_FORWARDED_FOR=f'10.0.0.{n}',
+                )
+                self.assertEqual(response.status_code, 400)
+            response = client.post(
+                reverse('login'), {'username': 'user30', 'password': 'x'}, format='json',
+                HTTP_X_FORWARDED_FOR='10.0.1.1', HTTP_X_REAL_IP='10.0.1.1',
+            )
+            self.assertEqual(response.status_code, 429)
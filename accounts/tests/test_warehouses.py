@@ -0,0 +1,149 @@
+"""Ombor a'zoligi: ro'yxatlarni cheklash, JWT 'warehouses' claim'i, rol nusxasi va backfill"""
+import importlib
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.apps import apps
+from django.contrib.auth.hashers import make_password
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from accounts import login_events, throttling
+from accounts.models import CustomUser, Warehouse, WarehouseMembership
+from accounts.tokens import ROLE_CLAIM, WAREHOUSES_CLAIM, WarehouseRefreshToken
+
+
+def create_user(username, role, *warehouses, password=None):
+    user = CustomUser.objects.create(
+        username=username, password=make_password(password), role=role,
+        registration_status=CustomUser.STATUS_APPROVED,
+    )
+    WarehouseMembership.objects.bulk_create([
+        WarehouseMembership(user=user, warehouse=warehouse, role=role) for warehouse in warehouses
+    ])
+    return user
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class WarehouseScopeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.main = Warehouse.objects.create(code='MAIN', name='Asosiy', is_main=True)
+        cls.branch = Warehouse.objects.create(code='B1', name='Filial 1')
+        cls.other = Warehouse.objects.create(code='B2', name='Filial 2')
+        cls.root = create_user('root', 'super_admin')
+        cls.manager = create_user('manager', 'main_warehouse_admin', cls.main, cls.branch, password='secret')
+        cls.receiver = create_user('receiver', 'warehouse_receiver', cls.branch)
+        cls.peer = create_user('peer', 'main_warehouse_admin', cls.branch)
+        cls.outsider = create_user('outsider', 'warehouse_admin', cls.other)
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        store = throttling.SharedTokenBucketStore(os.path.join(directory, 'throttle.bin'), groups=64)
+        patcher = mock.patch.object(throttling, '_store', store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(login_events.flush)
+        self.client = APIClient()
+
+    def usernames(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {WarehouseRefreshToken.for_user(user).access_token}')
+        return {row['username'] for row in self.client.get(reverse('user_list')).json()}
+
+    def test_main_warehouse_admin_sees_managed_roles_in_own_warehouses(self):
+        # peer - boshqariladigan rol emas, outsider - boshqa omborda
+        self.assertEqual(self.usernames(self.manager), {'receiver'})
+        self.assertEqual(
+            self.usernames(self.root), {'root', 'manager', 'receiver', 'peer', 'outsider'}
+        )
+
+    def test_login_and_refresh_carry_warehouses_claim(self):
+        response = self.client.post(reverse('login'), {'username': 'manager', 'password': 'secret'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        tokens = response.json()['tokens']
+        self.assertEqual(sorted(AccessToken(tokens['access'])[WAREHOUSES_CLAIM]), [self.main.pk, self.branch.pk])
+
+        # A'zolik va rol o'zgardi - refresh claim'larni bazadan qayta hisoblaydi
+        WarehouseMembership.objects.filter(user=self.manager, warehouse=self.branch).update(is_active=False)
+        WarehouseMembership.objects.create(user=self.manager, warehouse=self.other, role=self.manager.role)
+        CustomUser.objects.filter(pk=self.manager.pk).update(role='warehouse_admin')
+        response = self.client.post(reverse('token_refresh'), {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, 200)
+        access = AccessToken(response.json()['access'])
+        self.assertEqual(sorted(access[WAREHOUSES_CLAIM]), [self.main.pk, self.other.pk])
+        self.assertEqual(access[ROLE_CLAIM], 'warehouse_admin')
+
+    def test_new_users_need_warehouse(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {WarehouseRefreshToken.for_user(self.root).access_token}')
+        data = {'username': 'new', 'password': 'secret123', 'role': 'warehouse_receiver'}
+        response = self.client.post(reverse('create_user'), data, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('warehouse', response.json())
+        response = self.client.post(reverse('create_user'), {**data, 'role': 'super_admin'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post(reverse('create_user'), {**data, 'username': 'new2', 'warehouse': self.branch.pk},
+                                    format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('new2', self.usernames(self.manager))
+
+        self.client.credentials()
+        response = self.client.post(reverse('register'), {
+            'first_name': 'Ali', 'last_name': 'Valiyev', 'email': 'ali@example.com',
+            'role': 'warehouse_receiver', 'password': 'secret123', 'password_confirm': 'secret123',
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('warehouse', response.json())
+
+    def test_scope_uses_claim_from_token(self):
+        # Eski claim bilan so'rov bazadagi a'zolikni o'qimaydi
+        token = RefreshToken.for_user(self.manager).access_token
+        token[WAREHOUSES_CLAIM] = [self.other.pk]
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual({row['username'] for row in self.client.get(reverse('user_list')).json()}, {'outsider'})
+
+
+class MembershipRoleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.branch = Warehouse.objects.create(code='B1', name='Filial 1')
+        cls.user = create_user('receiver', 'warehouse_receiver', cls.branch)
+
+    def test_role_change_updates_memberships(self):
+        user = CustomUser.objects.get(pk=self.user.pk)
+        user.role = 'warehouse_admin'
+        user.save()
+        self.assertEqual(list(user.warehouse_memberships.values_list('role', flat=True)), ['warehouse_admin'])
+
+    def test_other_saves_do_not_touch_memberships(self):
+        user = CustomUser.objects.get(pk=self.user.pk)
+        user.first_name = 'Aziz'
+        with self.assertNumQueries(1):
+            user.save()
+        user.role = 'warehouse_admin'
+        # role update_fields'da bo'lmasa saqlanmaydi - a'zolik ham o'zgarmaydi
+        with self.assertNumQueries(1):
+            user.save(update_fields=['first_name'])
+        self.assertEqual(self.user.warehouse_memberships.get().role, 'warehouse_receiver')
+
+
+class BackfillMembershipsTests(TestCase):
+    def test_attaches_staff_without_membership_to_main_warehouse(self):
+        migration = importlib.import_module('accounts.migrations.0008_backfill_warehouse_memberships')
+        branch = Warehouse.objects.create(code='B1', name='Filial 1')
+        member = create_user('member', 'warehouse_admin', branch)
+        orphan = create_user('orphan', 'warehouse_receiver')
+        create_user('root', 'super_admin')
+
+        migration.backfill_memberships(apps, None)
+        migration.backfill_memberships(apps, None)
+
+        main = Warehouse.objects.get(is_main=True)
+        self.assertEqual(list(orphan.warehouse_memberships.values_list('warehouse', 'role')),
+                         [(main.pk, 'warehouse_receiver')])
+        self.assertEqual(list(member.warehouse_memberships.values_list('warehouse', flat=True)), [branch.pk])
+        self.assertEqual(WarehouseMembership.objects.count(), 2)
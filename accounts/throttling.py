@@ -0,0 +1,199 @@
+"""
+Login va ro'yxatdan o'tish uchun token-bucket throttling.
+
+Bucket'lar mmap qilingan faylda saqlanadi, shuning uchun bir serverdagi
+barcha worker jarayonlari bitta holatni ko'radi (tashqi servis kerak emas).
+Fayl ``THROTTLE_STORE_PATH`` da, faqat shu foydalanuvchiga tegishli papkada
+turadi (accounts.mmapfile).
+Throttle DRF ``initial()`` bosqichida, ya'ni serializer va parol
+xeshlashdan oldin ishlaydi.
+"""
+import hashlib
+import os
+import struct
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.throttling import SimpleRateThrottle
+
+from .idempotency import is_replay
+from .mmapfile import open_mapped
+from .utils import classify_identifier
+
+try:
+    import fcntl
+except ImportError:  # Windows: faqat bitta jarayon ichida himoya
+    fcntl = None
+
+_MAGIC = b'TBKT0002'
+_HEADER = struct.Struct('<8sQQ')     # magic, guruhlar soni, guruh hajmi
+# kalit xeshi, tokenlar, oxirgi yangilanish vaqti, bucket to'ladigan vaqt
+_SLOT = struct.Struct('<Qddd')
+
+
+class SharedTokenBucketStore:
+    """mmap fayldagi token bucket'lar jadvali.
+
+    Jadval guruhlarga bo'lingan; kalit o'z guruhidagi slotlardan birini
+    egallaydi. Guruh to'lsa, avval allaqachon to'lib bo'lgan bucket (uni
+    unutish hech narsani o'zgartirmaydi), bo'lmasa to'lishiga eng oz qolgani
+    qayta ishlatiladi - bu holda yangi kalit bo'sh bucket bilan boshlanadi.
+    Aks holda kalitlarni almashtirib o'z bucket'ini siqib chiqarish va uni
+    to'la holda qaytarish mumkin bo'lardi. Har bir guruh
+    jarayonlar orasida ``fcntl.lockf`` bayt-diapazon qulfi, jarayon ichida
+    esa ``threading.Lock`` bilan himoyalanadi.
+    """
+
+    def __init__(self, path, groups=8192, group_size=8, thread_locks=64):
+        self.path = str(path)
+        self.groups = groups
+        self.group_size = group_size
+        self.size = _HEADER.size + groups * group_size * _SLOT.size
+        self._thread_locks = [threading.Lock() for _ in range(thread_locks)]
+        self._open()
+
+    def _open(self):
+        header = _HEADER.pack(_MAGIC, self.groups, self.group_size)
+        self._fd, self._mm = open_mapped(self.path, header, self.size)
+        self._pid = os.getpid()
+
+    def _ensure_process(self):
+        # fork()dan keyin thread qulflari nusxalanadi - ularni yangilaymiz
+        if self._pid != os.getpid():
+            self._thread_locks = [threading.Lock() for _ in self._thread_locks]
+            self._pid = os.getpid()
+
+    def consume(self, key, rate, capacity, cost=1.0, now=None):
+        """Bucket'dan ``cost`` token olish.
+
+        ``rate`` - soniyasiga to'ldiriladigan tokenlar, ``capacity`` - maksimal
+        portlash. ``(ruxsat, kutish_soniyasi)`` juftligini qaytaradi.
+        """
+        self._ensure_process()
+        digest = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little') or 1
+        group = digest % self.groups
+        start = _HEADER.size + group * self.group_size * _SLOT.size
+        length = self.group_size * _SLOT.size
+        now = time.time() if now is None else now
+
+        with self._thread_locks[group % len(self._thread_locks)]:
+            if fcntl is not None:
+                fcntl.lockf(self._fd, fcntl.LOCK_EX, length, start)
+            try:
+                return self._consume_locked(digest, start, rate, capacity, cost, now)
+            finally:
+                if fcntl is not None:
+                    fcntl.lockf(self._fd, fcntl.LOCK_UN, length, start)
+
+    def _consume_locked(self, digest, start, rate, capacity, cost, now):
+        mm = self._mm
+        slot = free = None
+        victim, victim_full_at = start, float('inf')
+        for i in range(self.group_size):
+            offset = start + i * _SLOT.size
+            slot_key, tokens, updated, full_at = _SLOT.unpack_from(mm, offset)
+            if slot_key == digest:
+                slot = offset
+                break
+            if slot_key == 0:
+                if free is None:
+                    free = offset
+            elif full_at < victim_full_at:
+                victim, victim_full_at = offset, full_at
+
+        if slot is not None:
+            # Soat orqaga surilsa token qo'shilmaydi - aks holda bucket to'lib qolardi
+            elapsed = max(now - updated, 0)
+            tokens = min(capacity, tokens + elapsed * rate)
+        elif free is not None:
+            slot, tokens = free, capacity
+        else:
+            # To'lmagan bucket siqib chiqarilsa, yangi kalit bo'sh boshlanadi
+            slot, tokens = victim, capacity if victim_full_at <= now else 0.0
+
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        _SLOT.pack_into(mm, slot, digest, tokens, now, now + (capacity - tokens) / rate)
+        return (True, 0.0) if allowed else (False, (cost - tokens) / rate)
+
+    def clear(self):
+        self._mm[_HEADER.size:] = bytes(self.size - _HEADER.size)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                path = getattr(settings, 'THROTTLE_STORE_PATH', None)
+                if not path:
+                    raise ImproperlyConfigured(
+                        "THROTTLE_STORE_PATH shu foydalanuvchiga tegishli papkadagi fayl bo'lishi kerak"
+                    )
+                _store = SharedTokenBucketStore(path)
+    return _store
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """Token bucket: ``'10/min'`` - 10 ta portlash, daqiqasiga 10 ta to'ldiriladi"""
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        # Saqlangan javobni qayta olish parol xeshlamaydi - limitga kirmaydi
+        if is_replay(request, view):
+            return True
+
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+
+        allowed, self.retry_after = get_store().consume(
+            key, self.num_requests / self.duration, self.num_requests
+        )
+        return allowed
+
+    def wait(self):
+        return self.retry_after
+
+
+class LoginIPThrottle(TokenBucketThrottle):
+    """IP manzil bo'yicha.
+
+    ``get_ident`` X-Forwarded-For'dan faqat ``NUM_PROXIES`` ta ishonchli proksi
+    qo'shgan manzilni oladi; 0 bo'lsa REMOTE_ADDR - mijoz sarlavhani almashtirib
+    yangi bucket ocha olmaydi.
+    """
+    scope = 'login_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class LoginIdentifierThrottle(TokenBucketThrottle):
+    """Login identifikatori (username/email/telefon) bo'yicha"""
+    scope = 'login_identifier'
+    field = 'username'
+
+    def get_cache_key(self, request, view):
+        identifier = request.data.get(self.field) if hasattr(request.data, 'get') else None
+        if not identifier or not isinstance(identifier, str):
+            return None
+        _, value = classify_identifier(identifier)
+        return self.cache_format % {'scope': self.scope, 'ident': value or identifier}
+
+
+class RegisterIPThrottle(LoginIPThrottle):
+    scope = 'register_ip'
+
+
+class RegisterEmailThrottle(LoginIdentifierThrottle):
+    scope = 'register_email'
+    field = 'email'
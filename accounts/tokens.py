@@ -0,0 +1,41 @@
+"""
+Ombor doirasi JWT claim'i.
+
+Foydalanuvchi a'zo bo'lgan omborlar id'lari token ichida (``warehouses``)
+olib yuriladi, shuning uchun ro'yxatlarni omborlar bo'yicha cheklash har bir
+so'rovda qo'shimcha SQL talab qilmaydi. Claim'lar (rol bilan birga) login va
+token yangilashda qayta hisoblanadi - a'zolik yoki rol o'zgarishi eng ko'pi
+bilan access token muddati ichida kuchga kiradi.
+"""
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import CustomUser, WarehouseMembership
+
+WAREHOUSES_CLAIM = 'warehouses'
+# Login statistikasi uchun (refresh'da foydalanuvchini o'qimaslik)
+ROLE_CLAIM = 'role'
+
+
+def user_warehouse_ids(user_id):
+    return sorted(
+        WarehouseMembership.objects.filter(
+            user_id=user_id, is_active=True, warehouse__is_active=True
+        ).values_list('warehouse_id', flat=True)
+    )
+
+
+class WarehouseRefreshToken(RefreshToken):
+    """Access token'ga ham ko'chiriladigan ``warehouses`` claim'li refresh token"""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token[WAREHOUSES_CLAIM] = user_warehouse_ids(user.pk)
+        token[ROLE_CLAIM] = user.role
+        return token
+
+    def refresh_claims(self):
+        user_id = self[api_settings.USER_ID_CLAIM]
+        self[WAREHOUSES_CLAIM] = user_warehouse_ids(user_id)
+        self[ROLE_CLAIM] = CustomUser.objects.filter(pk=user_id).values_list('role', flat=True).first() or ''
@@ -1,6 +1,6 @@
 from django.urls import path
 from rest_framework_simplejwt.views import TokenRefreshView
-from . import views
+from . import async_views, views
 
 urlpatterns = [
     path('login/', views.login_view, name='login'),
@@ -8,10 +8,23 @@ urlpatterns = [
     path('profile/', views.user_profile, name='user_profile'),
     path('logout/', views.logout_view, name='logout'),
     path('check-auth/', views.check_auth, name='check_auth'),
+    path('batch/', views.batch_view, name='batch'),
     path('users/', views.UserListView.as_view(), name='user_list'),
     path('users/create/', views.create_user, name='create_user'),
     path('register/', views.register_view, name='register'),
     path('users/<int:user_id>/activate/', views.activate_user, name='activate_user'),
     path('users/<int:user_id>/deactivate/', views.deactivate_user, name='deactivate_user'),
+    path('users/<int:user_id>/reject/', views.reject_user, name='reject_user'),
     path('users/pending/', views.PendingUsersListView.as_view(), name='pending_users'),
+    path('users/<int:user_id>/audit/', views.AuditLogListView.as_view(), name='user_audit_log'),
+    path('audit/', views.AuditLogListView.as_view(), name='audit_log'),
+    path('stats/logins/', views.LoginStatsView.as_view(), name='login_stats'),
+    path('profiles/', views.profile_reports, name='profile_reports'),
+    path('profiles/<str:report_id>/', views.profile_report, name='profile_report'),
+    path('profiles/<str:report_id>/pstats/', views.profile_report_pstats, name='profile_report_pstats'),
+    # Native async variantlar (ASGI)
+    path('async/profile/', async_views.user_profile, name='async_user_profile'),
+    path('async/check-auth/', async_views.check_auth, name='async_check_auth'),
+    path('async/users/', async_views.user_list, name='async_user_list'),
+    path('async/users/pending/', async_views.pending_users, name='async_pending_users'),
 ]
\ No newline at end of file
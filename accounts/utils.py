@@ -0,0 +1,49 @@
+"""Login identifikatorlarini normallashtirish (email, telefon)"""
+import re
+
+from django.conf import settings
+
+_PHONE_JUNK = re.compile(r'[\s\-().]')
+_PHONE_RE = re.compile(r'^\+?\d{7,15}$')
+
+
+def normalize_email(value):
+    """Email manzilini kichik harflarga o'tkazish"""
+    if not value:
+        return None
+    return value.strip().lower() or None
+
+
+def normalize_phone(value):
+    """Telefon raqamini E.164 formatiga keltirish (+998901234567).
+
+    Noto'g'ri formatdagi qiymat uchun None qaytaradi.
+    """
+    if not value:
+        return None
+    value = _PHONE_JUNK.sub('', value.strip())
+    if value.startswith('00'):
+        value = '+' + value[2:]
+    if not _PHONE_RE.match(value):
+        return None
+    if value.startswith('+'):
+        return value
+
+    country_code = getattr(settings, 'DEFAULT_PHONE_COUNTRY_CODE', '998')
+    local_length = getattr(settings, 'LOCAL_PHONE_LENGTH', 9)
+    if value.startswith(country_code) and len(value) == len(country_code) + local_length:
+        return '+' + value
+    if len(value) == local_length:
+        return f'+{country_code}{value}'
+    return None
+
+
+def classify_identifier(identifier):
+    """Login identifikatorini (maydon, normallashtirilgan qiymat) juftligiga aylantirish"""
+    identifier = identifier.strip()
+    if '@' in identifier:
+        return 'email_normalized', normalize_email(identifier)
+    phone = normalize_phone(identifier)
+    if phone:
+        return 'phone_normalized', phone
+    return 'username', identifier
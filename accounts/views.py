@@ -1,16 +1,46 @@
-from rest_framework import status, generics
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework import serializers, status, generics
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.exceptions import TokenError
-from drf_yasg.utils import swagger_auto_schema
-from drf_yasg import openapi
+from datetime import timedelta
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from django.http import FileResponse, HttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
-from .models import CustomUser
-from .serializers import UserSerializer, UserLoginSerializer, UserCreateSerializer, RegisterSerializer
+from rest_framework.pagination import CursorPagination
+
+from . import audit
+from . import batch
+from . import login_events
+from .idempotency import idempotent
+from .jobs import enqueue
+from .tasks import enqueue_user_activated
+from .profiling import list_reports, report_path
+from .schema import openapi, swagger_auto_schema
+from .throttling import (
+    LoginIPThrottle, LoginIdentifierThrottle, RegisterIPThrottle, RegisterEmailThrottle,
+)
+from .models import AuditLog, CustomUser, LoginEvent, LoginStat
+from .tokens import ROLE_CLAIM, WAREHOUSES_CLAIM, WarehouseRefreshToken
+from .serializers import (
+    UserSerializer, UserLoginSerializer, UserCreateSerializer, RegisterSerializer,
+    AuditLogSerializer, LoginStatSerializer,
+)
 from .permissions import *
 
+IDEMPOTENCY_KEY_PARAMETER = openapi.Parameter(
+    'Idempotency-Key', openapi.IN_HEADER, type=openapi.TYPE_STRING, required=False,
+    description="Qayta yuborilgan so'rov birinchi javobni oladi"
+)
+USER_FIELDS_PARAMETER = openapi.Parameter(
+    'fields', openapi.IN_QUERY, type=openapi.TYPE_STRING, required=False,
+    description=f"Vergul bilan ajratilgan maydonlar: {','.join(UserSerializer.Meta.fields)}"
+)
+
 # ============ AUTHENTICATION VIEWS ============
 
 @swagger_auto_schema(
@@ -31,14 +61,16 @@ from .permissions import *
             )
         ),
         400: openapi.Response(description="Noto'g'ri ma'lumotlar"),
-        403: openapi.Response(description="Hisob faol emas")
+        403: openapi.Response(description="Hisob faol emas"),
+        429: openapi.Response(description="Juda ko'p urinish")
     }
 )
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([LoginIPThrottle, LoginIdentifierThrottle])
 def login_view(request):
     try:
-        serializer = UserLoginSerializer(data=request.data)
+        serializer = UserLoginSerializer(data=request.data, context={'request': request})
         
         if serializer.is_valid():
             user = serializer.validated_data['user']
@@ -49,8 +81,9 @@ def login_view(request):
                     'error': 'Hisobingiz hali faollashtirilmagan. Iltimos, admin bilan bog\'laning.'
                 }, status=status.HTTP_403_FORBIDDEN)
             
-            # JWT token yaratish
-            refresh = RefreshToken.for_user(user)
+            # JWT token yaratish (omborlar claim'i bilan)
+            refresh = WarehouseRefreshToken.for_user(user)
+            login_events.record(LoginEvent.KIND_LOGIN, user.pk, user.role, refresh[WAREHOUSES_CLAIM])
             
             user_data = UserSerializer(user).data
             
@@ -63,6 +96,7 @@ def login_view(request):
                 }
             }, status=status.HTTP_200_OK)
         
+        login_events.record_failed(getattr(request, '_login_candidate', None))
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
     except Exception as e:
@@ -76,6 +110,7 @@ def login_view(request):
     method='post',
     operation_description="Ro'yxatdan o'tish so'rovi yuborish",
     request_body=RegisterSerializer,
+    manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
     responses={
         201: openapi.Response(
             description="Ro'yxatdan o'tish so'rovi muvaffaqiyatli yuborildi",
@@ -88,17 +123,25 @@ def login_view(request):
                 }
             )
         ),
-        400: openapi.Response(description="Noto'g'ri ma'lumotlar")
+        400: openapi.Response(description="Noto'g'ri ma'lumotlar"),
+        429: openapi.Response(description="Juda ko'p urinish")
     }
 )
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([RegisterIPThrottle, RegisterEmailThrottle])
+@idempotent('register')
 def register_view(request):
     try:
         serializer = RegisterSerializer(data=request.data)
         
         if serializer.is_valid():
-            user = serializer.save()
+            with transaction.atomic():
+                user = serializer.save()
+                audit.record('registered', user.id, source='register')
+                # Adminlarni xabardor qilish fon rejimida bajariladi
+                enqueue('registration_received', {'user_id': user.id},
+                        key=f'registration_received:{user.id}')
             
             return Response({
                 'message': 'Ro\'yxatdan o\'tish so\'rovi muvaffaqiyatli yuborildi',
@@ -154,7 +197,12 @@ def refresh_token_view(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        token = RefreshToken(refresh_token)
+        token = WarehouseRefreshToken(refresh_token)
+        # A'zolik yoki rol o'zgargan bo'lishi mumkin - claim'lar yangilanadi
+        token.refresh_claims()
+        login_events.record(
+            LoginEvent.KIND_REFRESH, token.get('user_id'), token.get(ROLE_CLAIM, ''), token[WAREHOUSES_CLAIM]
+        )
         
         return Response({
             'access': str(token.access_token)
@@ -237,8 +285,10 @@ def logout_view(request):
 @swagger_auto_schema(
     method='get',
     operation_description="Joriy foydalanuvchi profilini olish",
+    manual_parameters=[USER_FIELDS_PARAMETER],
     responses={
         200: UserSerializer,
+        400: openapi.Response(description="Noma'lum maydonlar"),
         401: openapi.Response(description="Avtorizatsiyadan o'tilmagan")
     }
 )
@@ -246,9 +296,13 @@ def logout_view(request):
 @permission_classes([IsAuthenticated])
 def user_profile(request):
     try:
-        serializer = UserSerializer(request.user)
+        # request.user autentifikatsiyada to'liq o'qilgan - bu yerda faqat javob qisqaradi
+        fields = UserSerializer.parse_fields(request.query_params.get('fields'))
+        serializer = UserSerializer(request.user, fields=fields)
         return Response(serializer.data)
     
+    except serializers.ValidationError as e:
+        return Response(e.detail, status=status.HTTP_400_BAD_REQUEST)
     except Exception as e:
         return Response(
             {'error': f'Server xatosi: {str(e)}'}, 
@@ -291,6 +345,7 @@ def check_auth(request):
     method='post',
     operation_description="Yangi foydalanuvchi yaratish (faqat Super Admin)",
     request_body=UserCreateSerializer,
+    manual_parameters=[IDEMPOTENCY_KEY_PARAMETER],
     responses={
         201: openapi.Response(description="Foydalanuvchi yaratildi", schema=UserSerializer),
         400: openapi.Response(description="Noto'g'ri ma'lumotlar"),
@@ -299,11 +354,14 @@ def check_auth(request):
 )
 @api_view(['POST'])
 @permission_classes([IsSuperAdmin])
+@idempotent('create_user')
 def create_user(request):
     try:
         serializer = UserCreateSerializer(data=request.data)
         if serializer.is_valid():
-            user = serializer.save()
+            with transaction.atomic():
+                user = serializer.save()
+                audit.record('created', user.id, actor=request.user)
             return Response({
                 'message': 'User created successfully',
                 'user': UserSerializer(user).data
@@ -341,9 +399,15 @@ def create_user(request):
 def activate_user(request, user_id):
     """Admin tomonidan foydalanuvchini faollashtirish"""
     try:
-        user = CustomUser.objects.get(id=user_id)
-        user.is_active = True
-        user.save()
+        with transaction.atomic():
+            user = CustomUser.objects.select_for_update().get(id=user_id)
+            previous = user.registration_status
+            user.set_registration_status(CustomUser.STATUS_APPROVED)
+            user.save()
+            audit.record('activated', user.id, actor=request.user)
+            # Email/SMS xabarnomasi fon rejimida; allaqachon faol foydalanuvchiga qayta yuborilmaydi
+            if previous != CustomUser.STATUS_APPROVED:
+                enqueue_user_activated(user.id)
         
         return Response({
             'message': 'Foydalanuvchi muvaffaqiyatli faollashtirildi',
@@ -355,6 +419,11 @@ def activate_user(request, user_id):
             {'error': 'Foydalanuvchi topilmadi'}, 
             status=status.HTTP_404_NOT_FOUND
         )
+    except DjangoValidationError as e:
+        return Response(
+            {'error': e.messages[0]},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
 
 @swagger_auto_schema(
@@ -380,9 +449,11 @@ def activate_user(request, user_id):
 def deactivate_user(request, user_id):
     """Admin tomonidan foydalanuvchini faolsizlantirish"""
     try:
-        user = CustomUser.objects.get(id=user_id)
-        user.is_active = False
-        user.save()
+        with transaction.atomic():
+            user = CustomUser.objects.select_for_update().get(id=user_id)
+            user.set_registration_status(CustomUser.STATUS_DEACTIVATED)
+            user.save()
+            audit.record('deactivated', user.id, actor=request.user)
         
         return Response({
             'message': 'Foydalanuvchi muvaffaqiyatli faolsizlantirildi',
@@ -394,18 +465,92 @@ def deactivate_user(request, user_id):
             {'error': 'Foydalanuvchi topilmadi'}, 
             status=status.HTTP_404_NOT_FOUND
         )
+    except DjangoValidationError as e:
+        return Response(
+            {'error': e.messages[0]},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+
+@swagger_auto_schema(
+    method='post',
+    operation_description="Ro'yxatdan o'tish so'rovini rad etish (Admin)",
+    responses={
+        200: openapi.Response(
+            description="So'rov rad etildi",
+            schema=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'message': openapi.Schema(type=openapi.TYPE_STRING),
+                    'user': openapi.Schema(type=openapi.TYPE_OBJECT),
+                }
+            )
+        ),
+        400: openapi.Response(description="Holatni o'zgartirib bo'lmaydi"),
+        404: openapi.Response(description="Foydalanuvchi topilmadi"),
+        403: openapi.Response(description="Ruxsat etilmagan")
+    }
+)
+@api_view(['POST'])
+@permission_classes([IsSuperAdmin])
+def reject_user(request, user_id):
+    """Admin tomonidan ro'yxatdan o'tish so'rovini rad etish"""
+    try:
+        with transaction.atomic():
+            user = CustomUser.objects.select_for_update().get(id=user_id)
+            user.set_registration_status(CustomUser.STATUS_REJECTED)
+            user.save()
+            audit.record('rejected', user.id, actor=request.user)
+        
+        return Response({
+            'message': 'Ro\'yxatdan o\'tish so\'rovi rad etildi',
+            'user': UserSerializer(user).data
+        }, status=status.HTTP_200_OK)
+        
+    except CustomUser.DoesNotExist:
+        return Response(
+            {'error': 'Foydalanuvchi topilmadi'}, 
+            status=status.HTTP_404_NOT_FOUND
+        )
+    except DjangoValidationError as e:
+        return Response(
+            {'error': e.messages[0]},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
 
 # ============ USER LIST VIEWS ============
 
-class UserListView(generics.ListAPIView):
+class SparseUserFieldsMixin:
+    """``?fields=`` - serializer maydonlari va SELECT ustunlari birga qisqaradi"""
+    requested_fields = None
+
+    def list(self, request, *args, **kwargs):
+        self.requested_fields = UserSerializer.parse_fields(request.query_params.get('fields'))
+        return super().list(request, *args, **kwargs)
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.requested_fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        # values(): faqat kerakli ustunlar o'qiladi va model obyektlari yaratilmaydi
+        # (parol, ruxsatlar va h.k. hech qachon yuklanmaydi)
+        return super().filter_queryset(queryset).values(
+            *(self.requested_fields or UserSerializer.Meta.fields)
+        )
+
+
+class UserListView(SparseUserFieldsMixin, generics.ListAPIView):
     serializer_class = UserSerializer
     permission_classes = [CanManageUsers]
     
     @swagger_auto_schema(
         operation_description="Foydalanuvchilar ro'yxatini olish",
+        manual_parameters=[USER_FIELDS_PARAMETER],
         responses={
             200: UserSerializer(many=True),
+            400: openapi.Response(description="Noma'lum maydonlar"),
             403: openapi.Response(description="Ruxsat etilmagan")
         }
     )
@@ -417,21 +562,22 @@ class UserListView(generics.ListAPIView):
         if user.role == 'super_admin':
             return CustomUser.objects.all()
         elif user.role == 'main_warehouse_admin':
-            return CustomUser.objects.filter(
-                role__in=['warehouse_admin', 'main_warehouse_forwarder', 'warehouse_receiver']
-            )
+            # Faqat o'z omborlaridagi foydalanuvchilar
+            return scope_users(CustomUser.objects.all(), self.request, roles=MANAGED_ROLES)
         return CustomUser.objects.none()
 
 
-class PendingUsersListView(generics.ListAPIView):
+class PendingUsersListView(SparseUserFieldsMixin, generics.ListAPIView):
     """Faollashtirish kutilayotgan foydalanuvchilar ro'yxati"""
     serializer_class = UserSerializer
     permission_classes = [CanManageUsers]
     
     @swagger_auto_schema(
         operation_description="Faollashtirish kutilayotgan foydalanuvchilar ro'yxati",
+        manual_parameters=[USER_FIELDS_PARAMETER],
         responses={
             200: UserSerializer(many=True),
+            400: openapi.Response(description="Noma'lum maydonlar"),
             403: openapi.Response(description="Ruxsat etilmagan")
         }
     )
@@ -439,4 +585,238 @@ class PendingUsersListView(generics.ListAPIView):
         return super().get(request, *args, **kwargs)
     
     def get_queryset(self):
-        return CustomUser.objects.filter(is_active=False)
\ No newline at end of file
+        # Qisman indeks (user_pending_joined_idx) faqat kutilayotgan so'rovlarni qamraydi
+        queryset = CustomUser.objects.filter(
+            registration_status=CustomUser.STATUS_PENDING
+        ).order_by('date_joined')
+        return scope_users(queryset, self.request)
+
+
+# ============ BATCH VIEWS ============
+
+@swagger_auto_schema(
+    method='post',
+    operation_description="Bir nechta API chaqiruvini bitta so'rovda bajarish "
+                          "(masalan, ilova ochilganda check-auth/, profile/ va users/pending/)",
+    request_body=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        required=['requests'],
+        properties={
+            'requests': openapi.Schema(
+                type=openapi.TYPE_ARRAY,
+                items=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    required=['path'],
+                    properties={
+                        'method': openapi.Schema(type=openapi.TYPE_STRING, default='GET'),
+                        'path': openapi.Schema(type=openapi.TYPE_STRING, description="Masalan: profile/"),
+                        'body': openapi.Schema(type=openapi.TYPE_OBJECT),
+                        'headers': openapi.Schema(type=openapi.TYPE_OBJECT),
+                    }
+                )
+            )
+        }
+    ),
+    responses={
+        200: openapi.Response(
+            description="Har bir chaqiruv javobi (status, headers, body) shu tartibda",
+            schema=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'responses': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_OBJECT)),
+                }
+            )
+        ),
+        400: openapi.Response(description="Noto'g'ri ma'lumotlar"),
+        401: openapi.Response(description="Avtorizatsiyadan o'tilmagan")
+    }
+)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def batch_view(request):
+    calls = request.data.get('requests') if isinstance(request.data, dict) else None
+    if not isinstance(calls, list) or not calls:
+        return Response(
+            {'error': 'requests ro\'yxati kiritilishi shart'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    max_calls = batch.get_setting('MAX_CALLS')
+    if len(calls) > max_calls:
+        return Response(
+            {'error': f'Bitta batch\'da ko\'pi bilan {max_calls} ta chaqiruv bo\'lishi mumkin'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    # Ichki yo'llar batch endpoint'i bilan bir xil prefiks ostida (masalan, /api/auth/)
+    prefix = request.path[:request.path.rindex('batch/')]
+    return HttpResponse(batch.run_batch(request, prefix, calls), content_type='application/json')
+
+
+# ============ AUDIT VIEWS ============
+
+class AuditLogPagination(CursorPagination):
+    # Cursor pagination COUNT(*) bajarmaydi va (target, created_at) indeksidan foydalanadi
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = ('-created_at', '-id')
+
+
+class AuditLogListView(generics.ListAPIView):
+    """Foydalanuvchilarni boshqarish amallari tarixi"""
+    serializer_class = AuditLogSerializer
+    permission_classes = [IsSuperAdmin]
+    pagination_class = AuditLogPagination
+
+    @swagger_auto_schema(
+        operation_description="Audit jurnali (foydalanuvchi bo'yicha filtrlash mumkin)",
+        responses={
+            200: AuditLogSerializer(many=True),
+            403: openapi.Response(description="Ruxsat etilmagan")
+        }
+    )
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def get_queryset(self):
+        queryset = AuditLog.objects.select_related('actor').only(
+            'id', 'action', 'source', 'actor_id', 'actor__username', 'target_id', 'created_at'
+        )
+        user_id = self.kwargs.get('user_id')
+        if user_id is not None:
+            queryset = queryset.filter(target_id=user_id)
+        return queryset
+
+
+# ============ LOGIN STATS VIEWS ============
+
+class LoginStatPagination(CursorPagination):
+    page_size = 200
+    page_size_query_param = 'page_size'
+    max_page_size = 2000
+    ordering = ('-bucket', '-id')
+
+
+class LoginStatsView(generics.ListAPIView):
+    """Login statistikasi - faqat yig'indilardan (LoginStat) o'qiladi"""
+    serializer_class = LoginStatSerializer
+    permission_classes = [CanManageUsers]
+    pagination_class = LoginStatPagination
+
+    @swagger_auto_schema(
+        operation_description="Rol va ombor bo'yicha soatlik/kunlik login statistikasi",
+        manual_parameters=[
+            openapi.Parameter('period', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              enum=['hour', 'day'], description="Standart: hour"),
+            openapi.Parameter('since', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description="ISO vaqt (standart: hour uchun 24 soat, day uchun 30 kun oldin)"),
+            openapi.Parameter('until', openapi.IN_QUERY, type=openapi.TYPE_STRING, description="ISO vaqt"),
+            openapi.Parameter('role', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter('warehouse', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+        ],
+        responses={
+            200: LoginStatSerializer(many=True),
+            400: openapi.Response(description="Noto'g'ri parametrlar"),
+            403: openapi.Response(description="Ruxsat etilmagan")
+        }
+    )
+    def get(self, request, *args, **kwargs):
+        params = request.query_params
+        if params.get('period', LoginStat.PERIOD_HOUR) not in (LoginStat.PERIOD_HOUR, LoginStat.PERIOD_DAY):
+            return Response({'error': 'period hour yoki day bo\'lishi kerak'}, status=status.HTTP_400_BAD_REQUEST)
+        for name in ('since', 'until'):
+            if params.get(name) and self._parse_time(params[name]) is None:
+                return Response({'error': f'{name} noto\'g\'ri vaqt formati'}, status=status.HTTP_400_BAD_REQUEST)
+        if params.get('warehouse') and not params['warehouse'].isdigit():
+            return Response({'error': 'warehouse butun son bo\'lishi kerak'}, status=status.HTTP_400_BAD_REQUEST)
+        return super().get(request, *args, **kwargs)
+
+    @staticmethod
+    def _parse_time(value):
+        try:
+            parsed = parse_datetime(value)
+        except ValueError:
+            return None
+        if parsed is not None and timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+
+    def get_queryset(self):
+        params = self.request.query_params
+        period = params.get('period', LoginStat.PERIOD_HOUR)
+        default_range = timedelta(hours=24) if period == LoginStat.PERIOD_HOUR else timedelta(days=30)
+        since = self._parse_time(params['since']) if params.get('since') else timezone.now() - default_range
+        # (period, bucket) indeksi bo'yicha oraliq
+        queryset = LoginStat.objects.filter(period=period, bucket__gte=since)
+        if params.get('until'):
+            queryset = queryset.filter(bucket__lt=self._parse_time(params['until']))
+        if params.get('role'):
+            queryset = queryset.filter(role=params['role'])
+        if params.get('warehouse'):
+            queryset = queryset.filter(warehouse_id=int(params['warehouse']))
+        if self.request.user.role != 'super_admin':
+            queryset = queryset.filter(warehouse_id__in=get_warehouse_ids(self.request))
+        return queryset
+
+
+# ============ PROFILING VIEWS ============
+
+@swagger_auto_schema(
+    method='get',
+    operation_description="Saqlangan profil hisobotlari ro'yxati (faqat Super Admin)",
+    responses={
+        200: openapi.Response(
+            description="Hisobotlar (yangilari birinchi)",
+            schema=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    'reports': openapi.Schema(type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_STRING)),
+                }
+            )
+        ),
+        403: openapi.Response(description="Ruxsat etilmagan")
+    }
+)
+@api_view(['GET'])
+@permission_classes([IsSuperAdmin])
+def profile_reports(request):
+    """Profil hisobotlari ro'yxati"""
+    return Response({'reports': list_reports()})
+
+
+@swagger_auto_schema(
+    method='get',
+    operation_description="Profil hisobotini yuklab olish: JSON (SQL, dublikatlar, eng sekin funksiyalar)",
+    responses={
+        200: openapi.Response(description="Hisobot (JSON)"),
+        404: openapi.Response(description="Hisobot topilmadi"),
+        403: openapi.Response(description="Ruxsat etilmagan")
+    }
+)
+@api_view(['GET'])
+@permission_classes([IsSuperAdmin])
+def profile_report(request, report_id):
+    """Bitta profil hisoboti (JSON)"""
+    path = report_path(report_id, '.json')
+    if path is None:
+        return Response({'error': 'Hisobot topilmadi'}, status=status.HTTP_404_NOT_FOUND)
+    return FileResponse(open(path, 'rb'), content_type='application/json')
+
+
+@swagger_auto_schema(
+    method='get',
+    operation_description="cProfile natijasini yuklab olish (pstats/snakeviz uchun .prof fayl)",
+    responses={
+        200: openapi.Response(description=".prof fayl"),
+        404: openapi.Response(description="Hisobot topilmadi"),
+        403: openapi.Response(description="Ruxsat etilmagan")
+    }
+)
+@api_view(['GET'])
+@permission_classes([IsSuperAdmin])
+def profile_report_pstats(request, report_id):
+    """Bitta profil hisobotining .prof fayli"""
+    path = report_path(report_id, '.prof')
+    if path is None:
+        return Response({'error': 'Hisobot topilmadi'}, status=status.HTTP_404_NOT_FOUND)
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=f'{report_id}.prof')
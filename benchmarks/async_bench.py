@@ -0,0 +1,118 @@
+"""
+Sinxron (DRF) va native async o'qish endpoint'larining ASGI ostidagi o'tkazuvchanligi.
+
+    python manage.py migrate && python manage.py seed_users --count 200
+    python benchmarks/async_bench.py [--clients 500] [--requests 5000]
+
+ASGI ilovasi shu jarayonning o'zida chaqiriladi (server va tarmoq yo'q),
+shuning uchun natija faqat Django ichidagi farqni ko'rsatadi: sinxron
+view'lar yagona thread'da navbat bilan bajariladi, async view'lar esa event
+loop'da. Har bir yo'l uchun ``--clients`` ta bir vaqtdagi mijoz jami
+``--requests`` ta so'rov yuboradi.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'warehouse_project.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from warehouse_project.asgi import application  # noqa: E402
+
+from accounts.models import CustomUser  # noqa: E402
+from accounts.tokens import WarehouseRefreshToken  # noqa: E402
+
+PAIRS = [
+    ('/api/auth/check-auth/', '/api/auth/async/check-auth/'),
+    ('/api/auth/profile/', '/api/auth/async/profile/'),
+    ('/api/auth/users/pending/', '/api/auth/async/users/pending/'),
+]
+
+
+def bench_token():
+    user, created = CustomUser.objects.get_or_create(
+        username='async_bench_admin', defaults={'role': 'super_admin', 'email': 'async_bench@x.uz'}
+    )
+    return str(WarehouseRefreshToken.for_user(user).access_token)
+
+
+async def request(path, token):
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+        'query_string': b'', 'root_path': '',
+        'headers': [(b'host', b'localhost'), (b'authorization', f'Bearer {token}'.encode())],
+        'client': ('127.0.0.1', 50000), 'server': ('localhost', 80),
+    }
+    messages = iter([{'type': 'http.request', 'body': b'', 'more_body': False}])
+    status = None
+
+    async def receive():
+        return next(messages, {'type': 'http.disconnect'})
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    await application(scope, receive, send)
+    return status
+
+
+async def run(path, token, clients, total):
+    latencies, errors = [], 0
+    remaining = total
+
+    async def client():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            if await request(path, token) != 200:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'rps': total / elapsed,
+        'p50': statistics.median(latencies),
+        'p99': latencies[int(len(latencies) * 0.99) - 1],
+        'errors': errors,
+    }
+
+
+async def main_async(args, token):
+    # Birinchi so'rovlar (import, URL resolver) o'lchovga kirmasligi uchun
+    for pair in PAIRS:
+        for path in pair:
+            await request(path, token)
+
+    print(f"{args.clients} mijoz, har bir yo'lga {args.requests} so'rov")
+    print(f"{'':36s} {'req/s':>8s} {'p50 ms':>9s} {'p99 ms':>9s} {'xato':>5s}")
+    for pair in PAIRS:
+        for label, path in zip(('sync ', 'async'), pair):
+            result = await run(path, token, args.clients, args.requests)
+            print(f"{label} {path:30s} {result['rps']:8.0f} {result['p50']:9.1f} "
+                  f"{result['p99']:9.1f} {result['errors']:5d}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=500)
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main_async(args, bench_token()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Cache backend benchmark: SharedMemoryCache vs LocMemCache vs FileBasedCache.
+
+    python benchmarks/cache_bench.py [--iterations N] [--keys K] [--processes P]
+
+Bitta jarayonda set / get (topildi) / get (yo'q) / incr uchun bitta amal
+vaqti, keyin P ta jarayon: har biri kalitlarning o'z qismini yozadi va
+hammasini o'qiydi. LocMemCache'da boshqa jarayon yozgan kalit ko'rinmaydi -
+topilish ulushi taxminan 1/P bo'ladi.
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'warehouse_project.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.cache.backends.filebased import FileBasedCache  # noqa: E402
+from django.core.cache.backends.locmem import LocMemCache  # noqa: E402
+
+from warehouse_project.cache import SharedMemoryCache  # noqa: E402
+
+TMP = tempfile.mkdtemp(prefix='cache_bench_')
+# Keshlanadigan foydalanuvchi holatiga o'xshash qiymat (UserSerializer natijasi)
+VALUE = {
+    'id': 12345, 'username': 'dilshod.karimov.12345', 'email': 'dilshod.karimov.12345@seed.warehouse.uz',
+    'first_name': 'Dilshod', 'last_name': 'Karimov', 'role': 'warehouse_receiver',
+    'phone_number': '+998900012345', 'is_active': True, 'date_joined': '2025-03-14T09:26:53+05:00',
+    'registration_status': 'approved', 'warehouses': [1, 4],
+}
+
+
+def make_cache(name, keys):
+    params = {'TIMEOUT': 300, 'OPTIONS': {'MAX_ENTRIES': keys * 4}}
+    if name == 'shared':
+        return SharedMemoryCache(os.path.join(TMP, 'shared.bin'), params)
+    if name == 'locmem':
+        return LocMemCache('bench', params)
+    return FileBasedCache(os.path.join(TMP, 'filebased'), params)
+
+
+def timed(function, iterations):
+    start = time.perf_counter()
+    for i in range(iterations):
+        function(i)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def bench_single(name, iterations, keys):
+    cache = make_cache(name, keys)
+    cache.clear()
+    results = {
+        'set': timed(lambda i: cache.set(f'user:{i % keys}', VALUE), iterations),
+        'get (hit)': timed(lambda i: cache.get(f'user:{i % keys}'), iterations),
+        'get (miss)': timed(lambda i: cache.get(f'absent:{i % keys}'), iterations),
+    }
+    cache.set('counter', 0)
+    results['incr'] = timed(lambda i: cache.incr('counter'), iterations)
+    return results
+
+
+def worker(name, index, processes, keys, barrier, results):
+    cache = make_cache(name, keys)
+    for i in range(index, keys, processes):
+        cache.set(f'user:{i}', VALUE)
+    barrier.wait()
+    start = time.perf_counter()
+    hits = sum(cache.get(f'user:{i}') is not None for i in range(keys))
+    results.put((hits, (time.perf_counter() - start) / keys * 1e6))
+
+
+def bench_processes(name, processes, keys):
+    make_cache(name, keys).clear()
+    context = multiprocessing.get_context('fork')
+    # Barrier faqat meros orqali uzatiladi - Pool emas, Process
+    barrier, results = context.Barrier(processes), context.Queue()
+    workers = [
+        context.Process(target=worker, args=(name, n, processes, keys, barrier, results))
+        for n in range(processes)
+    ]
+    for process in workers:
+        process.start()
+    results = [results.get() for _ in workers]
+    for process in workers:
+        process.join()
+    hits = sum(hits for hits, _ in results)
+    return hits / (keys * processes), max(us for _, us in results)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iterations', type=int, default=5000)
+    parser.add_argument('--keys', type=int, default=2000)
+    parser.add_argument('--processes', type=int, default=4)
+    args = parser.parse_args()
+    backends = ('shared', 'locmem', 'filebased')
+
+    try:
+        print(f"1 jarayon, us/amal ({args.iterations} amal, {args.keys} kalit):")
+        print(f"  {'':12s}" + ''.join(f'{name:>12s}' for name in backends))
+        single = {name: bench_single(name, args.iterations, args.keys) for name in backends}
+        for operation in single['shared']:
+            print(f"  {operation:12s}" + ''.join(f'{single[name][operation]:12.2f}' for name in backends))
+
+        print(f"\n{args.processes} jarayon: har biri 1/{args.processes} kalitni yozadi, hammasini o'qiydi:")
+        for name in backends:
+            ratio, us = bench_processes(name, args.processes, args.keys)
+            print(f"  {name:12s} topildi {ratio:6.1%}   get {us:8.2f} us/amal (eng sekin jarayon)")
+    finally:
+        shutil.rmtree(TMP, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
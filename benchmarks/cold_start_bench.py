@@ -0,0 +1,84 @@
+"""
+Worker'dagi birinchi so'rov: sovuq start va warm-up'dan keyin.
+
+    python benchmarks/cold_start_bench.py [--runs N]
+
+Har bir o'lchov yangi Python jarayonida bajariladi (yangi worker kabi).
+So'rovlar ``bench_admin`` (super_admin, kerak bo'lsa yaratiladi) access
+token'i bilan yuboriladi - aks holda himoyalangan endpoint'lar view'gacha
+yetmay 401 qaytaradi. Avval ``python manage.py migrate`` bajarilgan bo'lishi kerak.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import json, os, sys, time
+sys.path.insert(0, %(root)r)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'warehouse_project.settings')
+import django
+django.setup()
+from django.test import Client
+from warehouse_project.wsgi import application
+if %(warm)r:
+    from warehouse_project.warmup import warm_up_app, warm_up_worker
+    warm_up_app()
+    warm_up_worker()
+client = Client(HTTP_HOST='localhost', HTTP_AUTHORIZATION=%(authorization)r)
+result = {}
+for path in %(paths)r:
+    start = time.perf_counter()
+    response = client.get(path)
+    result[path] = (time.perf_counter() - start) * 1000
+    if response.status_code >= 400:
+        sys.exit(f'{path}: {response.status_code}')
+print(json.dumps(result))
+"""
+
+PATHS = ['/api/auth/check-auth/', '/api/auth/users/', '/swagger/?format=openapi']
+
+
+def bench_token():
+    """Access token (ota jarayonda - bolada simplejwt importi o'lchovga qo'shilmasin)"""
+    sys.path.insert(0, ROOT)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'warehouse_project.settings')
+    import django
+    django.setup()
+    from accounts.models import CustomUser
+    from accounts.tokens import WarehouseRefreshToken
+
+    user, _ = CustomUser.objects.get_or_create(
+        username='bench_admin',
+        defaults={'email': 'bench_admin@warehouse.local', 'role': 'super_admin', 'is_staff': True},
+    )
+    return f'Bearer {WarehouseRefreshToken.for_user(user).access_token}'
+
+
+def measure(warm, authorization):
+    code = CHILD % {'root': ROOT, 'warm': warm, 'paths': PATHS, 'authorization': authorization}
+    output = subprocess.run(
+        [sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=ROOT
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    authorization = bench_token()
+    for label, warm in (('sovuq', False), ('isitilgan', True)):
+        runs = [measure(warm, authorization) for _ in range(args.runs)]
+        print(f"{label}:")
+        for path in PATHS:
+            print(f"  {path:28s} median {statistics.median(r[path] for r in runs):7.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
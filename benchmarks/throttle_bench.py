@@ -0,0 +1,93 @@
+"""
+Token-bucket throttle overhead benchmark.
+
+    python benchmarks/throttle_bench.py [--iterations N] [--processes P]
+
+Ruxsat etilgan so'rov uchun qo'shimcha vaqtni o'lchaydi: SharedTokenBucketStore.consume()
+bitta jarayonda, bir nechta jarayon bir vaqtda, hamda login_view throttle'lari
+(IP + identifikator) to'liq DRF Request ustida.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from multiprocessing import Pool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'warehouse_project.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from accounts.throttling import (  # noqa: E402
+    LoginIdentifierThrottle, LoginIPThrottle, SharedTokenBucketStore,
+)
+
+# Store faqat shu foydalanuvchiga tegishli papkani qabul qiladi (mkdtemp - 0700)
+PATH = os.path.join(tempfile.mkdtemp(prefix='throttle_bench_'), 'throttle.bin')
+RATE, CAPACITY = 1e9, 1e9   # har doim ruxsat - faqat overhead o'lchanadi
+
+
+def bench_store(iterations, offset=0):
+    store = SharedTokenBucketStore(PATH)
+    start = time.perf_counter()
+    for i in range(iterations):
+        store.consume(f'login_ip:10.0.{(i + offset) % 256}.{i % 200}', RATE, CAPACITY)
+    return (time.perf_counter() - start) / iterations
+
+
+def bench_throttles(iterations):
+    factory = APIRequestFactory()
+    throttles = [LoginIPThrottle(), LoginIdentifierThrottle()]
+    for throttle in throttles:
+        throttle.num_requests, throttle.duration = int(CAPACITY), 1
+    start = time.perf_counter()
+    for i in range(iterations):
+        wsgi_request = factory.post(
+            '/api/auth/login/', {'username': f'user{i % 1000}@x.uz', 'password': 'x'},
+            format='json', REMOTE_ADDR=f'10.1.{i % 256}.1'
+        )
+        request = Request(wsgi_request, parsers=[JSONParser()])
+        for throttle in throttles:
+            assert throttle.allow_request(request, None)
+    per_request = (time.perf_counter() - start) / iterations
+
+    # Solishtirish uchun: throttle'siz xuddi shu Request yaratish va parse qilish
+    start = time.perf_counter()
+    for i in range(iterations):
+        wsgi_request = factory.post(
+            '/api/auth/login/', {'username': f'user{i % 1000}@x.uz', 'password': 'x'},
+            format='json', REMOTE_ADDR=f'10.1.{i % 256}.1'
+        )
+        Request(wsgi_request, parsers=[JSONParser()]).data
+    baseline = (time.perf_counter() - start) / iterations
+    return per_request - baseline
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--iterations', type=int, default=100000)
+    parser.add_argument('--processes', type=int, default=4)
+    args = parser.parse_args()
+
+    single = bench_store(args.iterations)
+    print(f"consume(), 1 jarayon:          {single * 1e6:.2f} us/op")
+
+    with Pool(args.processes) as pool:
+        results = pool.starmap(bench_store, [(args.iterations, n * 7) for n in range(args.processes)])
+    print(f"consume(), {args.processes} jarayon parallel: {max(results) * 1e6:.2f} us/op (eng sekin jarayon)")
+
+    overhead = bench_throttles(args.iterations // 10)
+    print(f"login_view throttle'lari (IP + identifikator): {overhead * 1e6:.2f} us/so'rov")
+    shutil.rmtree(os.path.dirname(PATH))
+
+
+if __name__ == '__main__':
+    main()
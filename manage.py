@@ -4,6 +4,28 @@ import os
 import sys
 
 
+def skip_system_checks(argv):
+    """DJANGO_STARTUP_MODE=cli: buyruqqa ``--skip-checks`` qo'shish.
+
+    System check'lar URLconf'ni va u orqali barcha view'larni import qiladi
+    (~110 ms) - cron/maintenance buyruqlari uchun bu ortiqcha. Check'lar
+    deploy paytida 'full' rejimda (``manage.py check``) bajariladi.
+    """
+    if os.environ.get('DJANGO_STARTUP_MODE') != 'cli' or len(argv) < 2:
+        return argv
+    import django
+    from django.core.management import ManagementUtility, get_commands
+
+    django.setup()
+    if argv[1] not in get_commands():
+        return argv
+    # migrate o'z --skip-checks'iga ega; check, runserver va boshqalarda u yo'q
+    parser = ManagementUtility(argv).fetch_command(argv[1]).create_parser(argv[0], argv[1])
+    if '--skip-checks' not in parser._option_string_actions:
+        return argv
+    return argv[:2] + ['--skip-checks'] + argv[2:]
+
+
 def main():
     """Run administrative tasks."""
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'warehouse_project.settings')
@@ -15,7 +37,7 @@ def main():
             "available on your PYTHONPATH environment variable? Did you "
             "forget to activate a virtual environment?"
         ) from exc
-    execute_from_command_line(sys.argv)
+    execute_from_command_line(skip_system_checks(sys.argv))
 
 
 if __name__ == '__main__':
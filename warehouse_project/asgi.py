@@ -11,6 +11,9 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from warehouse_project.warmup import lifespan
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'warehouse_project.settings')
 
-application = get_asgi_application()
+# lifespan.startup'da worker warm-up (gunicorn'siz uvicorn uchun)
+application = lifespan(get_asgi_application())
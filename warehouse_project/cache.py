@@ -0,0 +1,290 @@
+"""
+Bir serverdagi barcha worker jarayonlari uchun umumiy kesh (Django cache backend).
+
+Yozuvlar mmap qilingan faylda saqlanadi, shuning uchun gunicorn worker'lari,
+``run_workers`` va ``manage.py`` buyruqlari bitta holatni ko'radi:
+LocMemCache'dagi kabi har jarayonda alohida nusxa va eskirgan qiymatlar
+bo'lmaydi, tashqi servis (Redis, memcached) ham kerak emas.
+
+Jadval ``accounts.throttling.SharedTokenBucketStore`` kabi guruhlarga
+bo'lingan: kalit o'z guruhidagi ``GROUP_SIZE`` ta slotdan birini egallaydi,
+guruh to'lsa eng uzoq ishlatilmagan (LRU) yoki muddati o'tgan yozuv
+almashtiriladi. Slotlar qat'iy ``SLOT_SIZE`` baytli: kalit va pickle
+qilingan qiymat sig'masa, qiymat keshlanmaydi (eski qiymat o'chiriladi).
+Muddat (TTL) har bir yozuvda saqlanadi. ``clear()`` sarlavhadagi avlod
+raqamini oshiradi - barcha jarayonlardagi yozuvlar bir zumda eskiradi;
+alohida kalitlar Django'ning ``version`` / ``incr_version()`` bilan
+eskirtiriladi.
+
+Qiymatlar ``pickle`` bilan o'qiladi, shuning uchun fayl
+``accounts.mmapfile.open_mapped`` orqali ochiladi (egasi va ``0600``
+tekshiruvi, symlink'siz) va ``LOCATION`` aniq ko'rsatilishi shart.
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'warehouse_project.cache.SharedMemoryCache',
+            'LOCATION': '/srv/warehouse_crm/var/cache.bin',   # papka shu foydalanuvchiniki
+            'OPTIONS': {'MAX_ENTRIES': 16384, 'SLOT_SIZE': 1024, 'GROUP_SIZE': 8},
+        }
+    }
+"""
+import hashlib
+import math
+import os
+import pickle
+import struct
+import threading
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.exceptions import ImproperlyConfigured
+
+from accounts.mmapfile import open_mapped
+
+try:
+    import fcntl
+except ImportError:  # Windows: faqat bitta jarayon ichida himoya
+    fcntl = None
+
+_MAGIC = b'SHMC0001'
+_HEADER = struct.Struct('<8sQQQ')   # magic, guruhlar soni, guruh hajmi, slot hajmi
+_GENERATION = struct.Struct('<Q')   # clear() oshiradigan avlod raqami
+_DATA = _HEADER.size + _GENERATION.size
+# kalit xeshi, avlod, tugash vaqti (0 - cheksiz), oxirgi murojaat, kalit va qiymat uzunligi
+_SLOT = struct.Struct('<QQddHI')
+_TIME = struct.Struct('<d')
+_EXPIRES_OFFSET = 16
+_ACCESSED_OFFSET = 24
+
+
+class SharedMemoryStore:
+    """mmap fayldagi set-assotsiativ kalit-qiymat jadvali (qiymatlar - baytlar)"""
+
+    def __init__(self, path, groups, group_size=8, slot_size=1024, thread_locks=64):
+        self.path = str(path)
+        self.groups = groups
+        self.group_size = group_size
+        self.slot_size = slot_size
+        self.capacity = slot_size - _SLOT.size
+        self.size = _DATA + groups * group_size * slot_size
+        self._thread_locks = [threading.Lock() for _ in range(thread_locks)]
+        self._open()
+
+    def _open(self):
+        header = _HEADER.pack(_MAGIC, self.groups, self.group_size, self.slot_size)
+        self._fd, self._mm = open_mapped(self.path, header, self.size, initial=_GENERATION.pack(1))
+        self._pid = os.getpid()
+
+    def _ensure_process(self):
+        # fork()dan keyin thread qulflari nusxalanadi - ularni yangilaymiz
+        if self._pid != os.getpid():
+            self._thread_locks = [threading.Lock() for _ in self._thread_locks]
+            self._pid = os.getpid()
+
+    def _locked(self, key, operation, *args):
+        """``operation(digest, guruh boshi, ...)`` ni kalit guruhi qulfi ostida bajarish"""
+        self._ensure_process()
+        digest = int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little') or 1
+        group = digest % self.groups
+        start = _DATA + group * self.group_size * self.slot_size
+        length = self.group_size * self.slot_size
+
+        with self._thread_locks[group % len(self._thread_locks)]:
+            if fcntl is not None:
+                fcntl.lockf(self._fd, fcntl.LOCK_EX, length, start)
+            try:
+                return operation(digest, start, key, *args)
+            finally:
+                if fcntl is not None:
+                    fcntl.lockf(self._fd, fcntl.LOCK_UN, length, start)
+
+    def _scan(self, digest, start, key, now):
+        """(topilgan slot yoki None, almashtiriladigan slot, joriy avlod)"""
+        mm = self._mm
+        generation = _GENERATION.unpack_from(mm, _HEADER.size)[0]
+        victim, victim_accessed = start, float('inf')
+        for i in range(self.group_size):
+            offset = start + i * self.slot_size
+            slot_hash, slot_generation, expires, accessed, key_length, _ = _SLOT.unpack_from(mm, offset)
+            live = slot_hash != 0 and slot_generation == generation and (expires == 0 or expires > now)
+            if not live:
+                # Bo'sh, eskirgan yoki muddati o'tgan slot har doim birinchi almashtiriladi
+                accessed = -1.0
+            elif slot_hash == digest:
+                key_start = offset + _SLOT.size
+                if mm[key_start:key_start + key_length] == key:
+                    return offset, offset, generation
+            if accessed < victim_accessed:
+                victim, victim_accessed = offset, accessed
+        return None, victim, generation
+
+    def _read(self, offset):
+        _, _, expires, _, key_length, value_length = _SLOT.unpack_from(self._mm, offset)
+        value_start = offset + _SLOT.size + key_length
+        return expires, self._mm[value_start:value_start + value_length]
+
+    def _write(self, offset, digest, generation, key, value, expires, now):
+        mm = self._mm
+        _SLOT.pack_into(mm, offset, digest, generation, expires, now, len(key), len(value))
+        key_start = offset + _SLOT.size
+        mm[key_start:key_start + len(key)] = key
+        mm[key_start + len(key):key_start + len(key) + len(value)] = value
+
+    def get(self, key):
+        return self._locked(key, self._get, time.time())
+
+    def _get(self, digest, start, key, now):
+        found, _, _ = self._scan(digest, start, key, now)
+        if found is None:
+            return None
+        _TIME.pack_into(self._mm, found + _ACCESSED_OFFSET, now)
+        return self._read(found)[1]
+
+    def set(self, key, value, expires, only_new=False):
+        """Yozish; ``only_new`` - kalit mavjud bo'lsa tegmaslik (add). Yozildimi?"""
+        return self._locked(key, self._set, value, expires, only_new, time.time())
+
+    def _set(self, digest, start, key, value, expires, only_new, now):
+        found, victim, generation = self._scan(digest, start, key, now)
+        if found is not None and only_new:
+            return False
+        if len(key) + len(value) > self.capacity:
+            # Sig'maydi: eski qiymat qolib ketmasligi kerak
+            if found is not None:
+                _SLOT.pack_into(self._mm, found, 0, 0, 0.0, 0.0, 0, 0)
+            return False
+        self._write(victim, digest, generation, key, value, expires, now)
+        return True
+
+    def touch(self, key, expires):
+        return self._locked(key, self._touch, expires, time.time())
+
+    def _touch(self, digest, start, key, expires, now):
+        found, _, _ = self._scan(digest, start, key, now)
+        if found is None:
+            return False
+        _TIME.pack_into(self._mm, found + _EXPIRES_OFFSET, expires)
+        return True
+
+    def delete(self, key):
+        return self._locked(key, self._delete, time.time())
+
+    def _delete(self, digest, start, key, now):
+        found, _, _ = self._scan(digest, start, key, now)
+        if found is None:
+            return False
+        _SLOT.pack_into(self._mm, found, 0, 0, 0.0, 0.0, 0, 0)
+        return True
+
+    def update(self, key, function):
+        """Qiymatni qulf ostida ``function(eski) -> yangi`` bilan almashtirish (incr uchun).
+
+        Kalit bo'lmasa ``KeyError``; yangi qiymat sig'masa ``ValueError``.
+        """
+        return self._locked(key, self._update, function, time.time())
+
+    def _update(self, digest, start, key, function, now):
+        found, _, generation = self._scan(digest, start, key, now)
+        if found is None:
+            raise KeyError(key)
+        expires, value = self._read(found)
+        new_value = function(value)
+        if len(key) + len(new_value) > self.capacity:
+            raise ValueError('Qiymat slotga sig\'maydi')
+        self._write(found, digest, generation, key, new_value, expires, now)
+        return new_value
+
+    def clear(self):
+        """Avlodni oshirish: barcha yozuvlar barcha jarayonlarda birdaniga eskiradi"""
+        self._ensure_process()
+        with self._thread_locks[0]:
+            if fcntl is not None:
+                fcntl.lockf(self._fd, fcntl.LOCK_EX, _GENERATION.size, _HEADER.size)
+            try:
+                generation = _GENERATION.unpack_from(self._mm, _HEADER.size)[0]
+                _GENERATION.pack_into(self._mm, _HEADER.size, generation + 1)
+            finally:
+                if fcntl is not None:
+                    fcntl.lockf(self._fd, fcntl.LOCK_UN, _GENERATION.size, _HEADER.size)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path, groups, group_size, slot_size):
+    """Jarayon ichida bitta fayl uchun bitta store (Django har thread uchun backend yaratadi)"""
+    config = (path, groups, group_size, slot_size)
+    store = _stores.get(config)
+    if store is None:
+        with _stores_lock:
+            store = _stores.get(config)
+            if store is None:
+                store = _stores[config] = SharedMemoryStore(path, groups, group_size, slot_size)
+    return store
+
+
+class SharedMemoryCache(BaseCache):
+    """Jarayonlar orasida umumiy, LRU va TTL'li kesh (``SharedMemoryStore`` ustida)"""
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        group_size = int(options.get('GROUP_SIZE', 8))
+        if not location:
+            # Umumiy vaqtinchalik papkada boshqa foydalanuvchi faylni oldindan yaratib qo'yishi mumkin
+            raise ImproperlyConfigured(
+                "SharedMemoryCache LOCATION shu foydalanuvchiga tegishli papkadagi fayl bo'lishi kerak"
+            )
+        self._store = get_store(
+            location,
+            max(1, math.ceil(self._max_entries / group_size)),
+            group_size,
+            int(options.get('SLOT_SIZE', 1024)),
+        )
+
+    def _key(self, key, version):
+        return self.make_and_validate_key(key, version=version).encode()
+
+    def _expires(self, timeout):
+        expires = self.get_backend_timeout(timeout)
+        return 0.0 if expires is None else expires
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._store.set(
+            self._key(key, version), pickle.dumps(value, self.pickle_protocol),
+            self._expires(timeout), only_new=True,
+        )
+
+    def get(self, key, default=None, version=None):
+        value = self._store.get(self._key(key, version))
+        return default if value is None else pickle.loads(value)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._store.set(
+            self._key(key, version), pickle.dumps(value, self.pickle_protocol), self._expires(timeout)
+        )
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self._store.touch(self._key(key, version), self._expires(timeout))
+
+    def delete(self, key, version=None):
+        return self._store.delete(self._key(key, version))
+
+    def has_key(self, key, version=None):
+        return self._store.get(self._key(key, version)) is not None
+
+    def incr(self, key, delta=1, version=None):
+        # get + set emas: o'qish va yozish bitta qulf ostida (jarayonlar orasida atomar)
+        try:
+            value = self._store.update(
+                self._key(key, version),
+                lambda old: pickle.dumps(pickle.loads(old) + delta, self.pickle_protocol),
+            )
+        except KeyError:
+            raise ValueError("Key '%s' not found" % key)
+        return pickle.loads(value)
+
+    def clear(self):
+        self._store.clear()
@@ -0,0 +1,161 @@
+"""
+Javoblarni siqish (brotli / gzip).
+
+Mijoz ``Accept-Encoding`` da ruxsat bergan eng yaxshi kodlash tanlanadi
+(q-qiymatlar hisobga olinadi). ``MIN_SIZE`` dan kichik javoblar va
+siqilmaydigan turlar (rasmlar, arxivlar) o'zgartirilmaydi. Oqimli
+javoblar (``StreamingHttpResponse``, ``FileResponse``) bo'laklab siqiladi
+va har bo'lak darhol mijozga yuboriladi.
+
+brotli requirements.txt'da; u o'rnatilmagan muhitda (import xatosi)
+faqat gzip ishlatiladi. gzip Django'ning ``compress_string`` /
+``compress_sequence`` funksiyalari orqali (BREACH'ga qarshi tasodifiy
+to'ldirish bilan).
+"""
+import secrets
+from gzip import GzipFile
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import StreamingBuffer, compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULTS = {
+    'MIN_SIZE': 1024,
+    'BROTLI_QUALITY': 4,
+    'CONTENT_TYPES': (
+        'application/json', 'application/javascript', 'application/xml',
+        'application/openapi', 'application/yaml', 'image/svg+xml', 'text/',
+    ),
+}
+# gzip fayl nomiga qo'shiladigan tasodifiy baytlar (django.middleware.gzip bilan bir xil)
+MAX_RANDOM_BYTES = 100
+
+
+def get_setting(name):
+    return getattr(settings, 'COMPRESSION', {}).get(name, DEFAULTS[name])
+
+
+def available_encodings():
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def choose_encoding(accept_encoding, available=None):
+    """``Accept-Encoding`` bo'yicha eng yaxshi kodlash yoki None"""
+    if not accept_encoding:
+        return None
+    weights = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.partition(';')
+        weight = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    # Teng vazn bo'lsa tartib bo'yicha (br gzip'dan oldin)
+    for coding in available or available_encodings():
+        weight = weights.get(coding, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def brotli_compress(data):
+    return brotli.compress(data, quality=get_setting('BROTLI_QUALITY'))
+
+
+def brotli_compress_sequence(sequence):
+    compressor = brotli.Compressor(quality=get_setting('BROTLI_QUALITY'))
+    for chunk in sequence:
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def brotli_compress_async_sequence(sequence):
+    compressor = brotli.Compressor(quality=get_setting('BROTLI_QUALITY'))
+    async for chunk in sequence:
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def gzip_compress_async_sequence(sequence):
+    # compress_sequence kabi bitta gzip oqimi; flush() (Z_SYNC_FLUSH) bo'lakni darhol chiqaradi
+    buf = StreamingBuffer()
+    filename = b'a' * secrets.randbelow(MAX_RANDOM_BYTES)
+    with GzipFile(filename=filename, mode='wb', compresslevel=6, fileobj=buf, mtime=0) as zfile:
+        yield buf.read()
+        async for chunk in sequence:
+            zfile.write(chunk)
+            zfile.flush()
+            data = buf.read()
+            if data:
+                yield data
+    yield buf.read()
+
+
+def is_compressible(content_type):
+    content_type = content_type.split(';', 1)[0].strip().lower()
+    return any(content_type.startswith(prefix) for prefix in get_setting('CONTENT_TYPES'))
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Muzokara asosida brotli/gzip siqish (GZipMiddleware o'rnini bosadi)"""
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or response.status_code in (204, 304):
+            return response
+        if not is_compressible(response.get('Content-Type', '')):
+            return response
+        if not response.streaming and len(response.content) < get_setting('MIN_SIZE'):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                original = response.streaming_content
+                response.streaming_content = (
+                    brotli_compress_async_sequence(original) if encoding == 'br'
+                    else gzip_compress_async_sequence(original)
+                )
+            elif encoding == 'br':
+                response.streaming_content = brotli_compress_sequence(response.streaming_content)
+            else:
+                response.streaming_content = compress_sequence(
+                    response.streaming_content, max_random_bytes=MAX_RANDOM_BYTES
+                )
+            # Siqilgan hajm oqim tugaguncha noma'lum
+            del response.headers['Content-Length']
+        else:
+            if encoding == 'br':
+                compressed = brotli_compress(response.content)
+            else:
+                compressed = compress_string(response.content, max_random_bytes=MAX_RANDOM_BYTES)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,131 @@
+"""
+Production launcher (gunicorn asosida).
+
+    python -m warehouse_project.launcher --bind 0.0.0.0:8000 --workers 4
+    python -m warehouse_project.launcher --asgi          # uvicorn worker'lari bilan (uvicorn-worker paketi)
+
+Django ilovasi fork'dan oldin master jarayonda yuklanadi va isitiladi
+(``preload_app``), shuning uchun import qilingan modullar xotirasi
+worker'lar orasida copy-on-write orqali ulashiladi. Har bir worker
+fork'dan keyin o'z ulanishlarini ochadi va birinchi so'rov vaqtini
+logga yozadi (sovuq va isitilgan holatni solishtirish uchun).
+
+DB ulanishi thread'ga bog'langan, shuning uchun uni oldindan ochish faqat
+so'rovlar worker'ning asosiy thread'ida bajariladigan ``sync`` worker'da
+foyda beradi. ``--threads > 1`` (gthread) va ``--asgi`` rejimida so'rovlar
+boshqa thread'larda ishlaydi - har bir thread birinchi so'rovda ulanadi,
+warm-up esa faqat jarayon ichidagi keshlarni tayyorlaydi. ``--asgi``
+rejimida UvicornWorker ``pre_request``/``post_request`` hook'larini
+chaqirmaydi - birinchi so'rov vaqti logga yozilmaydi. Gunicorn'siz
+uvicorn'da warm-up ``warehouse_project.asgi`` dagi lifespan orqali bo'ladi.
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import time
+
+from gunicorn.app.base import BaseApplication
+
+logger = logging.getLogger('warehouse_project.launcher')
+
+
+def post_fork(server, worker):
+    from django.db import connections
+
+    from warehouse_project.warmup import warm_up_worker
+
+    if os.environ.get('WAREHOUSE_WARMUP', '1') == '1':
+        # gthread/uvicorn'da asosiy thread'dagi ulanish so'rovlarga o'tmaydi
+        connect = server.cfg.worker_class_str == 'sync'
+        timings = warm_up_worker(connect=connect)
+        if not connect:
+            connections.close_all()
+        server.log.info("Worker %s warm-up (ms): %s", worker.pid, timings)
+    worker.first_request_logged = False
+
+
+def pre_request(worker, req):
+    req.started_at = time.perf_counter()
+
+
+def post_request(worker, req, environ, resp):
+    if getattr(worker, 'first_request_logged', True):
+        return
+    worker.first_request_logged = True
+    elapsed = (time.perf_counter() - req.started_at) * 1000
+    state = 'warm' if os.environ.get('WAREHOUSE_WARMUP', '1') == '1' else 'cold'
+    worker.log.info(
+        "Worker %s first request (%s): %s %s %.1f ms",
+        worker.pid, state, req.method, req.path, elapsed
+    )
+
+
+class WarehouseApplication(BaseApplication):
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'warehouse_project.settings')
+        if self.cfg.worker_class_str.startswith('uvicorn'):
+            from warehouse_project.asgi import application
+        else:
+            from warehouse_project.wsgi import application
+
+        from django.contrib.staticfiles.storage import staticfiles_storage
+        if getattr(staticfiles_storage, 'manifest_hash', None) == '':
+            logger.warning(
+                "staticfiles manifest topilmadi - avval 'manage.py collectstatic' ishga tushiring "
+                "(hozircha hash'siz va siqilmagan statik nomlar ishlatiladi)"
+            )
+
+        if os.environ.get('WAREHOUSE_WARMUP', '1') == '1':
+            from warehouse_project.warmup import warm_up_app
+            start = time.perf_counter()
+            timings = warm_up_app()
+            logger.warning(
+                "App preloaded and warmed up in %.1f ms: %s",
+                (time.perf_counter() - start) * 1000, timings
+            )
+        return application
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Warehouse CRM production server")
+    parser.add_argument('--bind', default=os.environ.get('BIND', '127.0.0.1:8000'))
+    parser.add_argument('--workers', type=int,
+                        default=int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1)))
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--timeout', type=int, default=30)
+    parser.add_argument('--max-requests', type=int, default=0)
+    parser.add_argument('--asgi', action='store_true', help="uvicorn_worker.UvicornWorker bilan ishga tushirish")
+    parser.add_argument('--no-warmup', action='store_true', help="Warm-up'siz (sovuq start) - solishtirish uchun")
+    args = parser.parse_args(argv)
+
+    if args.no_warmup:
+        os.environ['WAREHOUSE_WARMUP'] = '0'
+
+    options = {
+        'bind': args.bind,
+        'workers': args.workers,
+        'threads': args.threads,
+        'timeout': args.timeout,
+        'max_requests': args.max_requests,
+        'max_requests_jitter': args.max_requests // 10 if args.max_requests else 0,
+        'preload_app': True,
+        'post_fork': post_fork,
+        'pre_request': pre_request,
+        'post_request': post_request,
+        'worker_class': 'uvicorn_worker.UvicornWorker' if args.asgi else 'sync',
+        'accesslog': '-',
+    }
+    WarehouseApplication(options).run()
+
+
+if __name__ == '__main__':
+    main()
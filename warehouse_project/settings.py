@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -54,18 +55,36 @@ INSTALLED_APPS = [
     'rest_framework_simplejwt.token_blacklist', 
 ]
 
+# Ishga tushish rejimi: 'full' - veb-server, 'cli' - management/cron buyruqlari.
+# CLI rejimida faqat HTTP uchun kerak bo'lgan ilovalar (Swagger, CORS, simplejwt
+# tarjimalari) yuklanmaydi, admin.py'lar autodiscover qilinmaydi va manage.py
+# system check'larni (URLconf va barcha view'lar importi) o'tkazib yuboradi:
+#   DJANGO_STARTUP_MODE=cli python manage.py migrate
+# Eslatma: collectstatic va 'manage.py check'ni 'full' rejimda ishga tushiring.
+STARTUP_MODE = os.environ.get('DJANGO_STARTUP_MODE', 'full')
+OPTIONAL_APPS = ['drf_yasg', 'corsheaders', 'rest_framework_simplejwt']
+if STARTUP_MODE == 'cli':
+    INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in OPTIONAL_APPS]
+    # admin.autodiscover() barcha admin.py'larni (simplejwt sozlamalari, django.test) import qiladi
+    INSTALLED_APPS[INSTALLED_APPS.index('django.contrib.admin')] = 'django.contrib.admin.apps.SimpleAdminConfig'
+
 MIDDLEWARE = [
 
     'corsheaders.middleware.CorsMiddleware',
 
     'django.middleware.security.SecurityMiddleware',
+    # Javob tanasini o'zgartiruvchi middleware'lardan oldin (GZipMiddleware kabi)
+    'warehouse_project.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'accounts.profiling.RequestProfilerMiddleware',
 ]
+if 'corsheaders' not in INSTALLED_APPS:
+    MIDDLEWARE.remove('corsheaders.middleware.CorsMiddleware')
 
 SWAGGER_SETTINGS = {
     'SECURITY_DEFINITIONS': {
@@ -132,6 +151,22 @@ AUTH_PASSWORD_VALIDATORS = [
 # Custom User modelni ko'rsating
 AUTH_USER_MODEL = 'accounts.CustomUser'
 
+# Login: foydalanuvchi nomi, email yoki telefon raqami
+AUTHENTICATION_BACKENDS = [
+    'accounts.backends.IdentifierBackend',
+]
+# Django standart ro'yxati + parolsiz kuchaytirilgan eski xeshlar (manage.py password_hashes --upgrade)
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+    'accounts.hashers.PBKDF2WrappedPBKDF2PasswordHasher',
+]
+DEFAULT_PHONE_COUNTRY_CODE = '998'
+LOCAL_PHONE_LENGTH = 9
+
 # DRF sozlamalari
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -139,9 +174,23 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
-    ]
+    ],
+    # accounts.throttling (token bucket): son - portlash hajmi, davr - to'ldirilish tezligi
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '30/min',
+        'login_identifier': '10/min',
+        'register_ip': '10/hour',
+        'register_email': '5/hour',
+    },
+    # Ilova oldidagi ishonchli proksilar soni. 0 - IP faqat REMOTE_ADDR'dan olinadi,
+    # mijoz yuborgan X-Forwarded-For throttle kalitiga ta'sir qilmaydi
+    'NUM_PROXIES': int(os.environ.get('DJANGO_NUM_PROXIES', '0')),
 }
 
+# Throttle bucket'lari saqlanadigan umumiy mmap fayl. Papka faqat shu foydalanuvchiga
+# tegishli bo'lishi kerak (/tmp emas) - boshqa foydalanuvchi bucket'larni o'zgartira olmasin
+THROTTLE_STORE_PATH = os.environ.get('DJANGO_THROTTLE_PATH', str(BASE_DIR / 'var' / 'throttle.bin'))
+
 # JWT sozlamalari
 from datetime import timedelta
 SIMPLE_JWT = {
@@ -163,6 +212,67 @@ SIMPLE_JWT = {
     'USER_ID_CLAIM': 'user_id',
 }
 
+# Bir serverdagi barcha worker jarayonlari uchun umumiy kesh (warehouse_project.cache).
+# LOCATION majburiy (papka shu foydalanuvchiniki, fayl 0600); hajmi ~ MAX_ENTRIES * SLOT_SIZE.
+CACHES = {
+    'default': {
+        'BACKEND': 'warehouse_project.cache.SharedMemoryCache',
+        'LOCATION': os.environ.get('DJANGO_CACHE_PATH', str(BASE_DIR / 'var' / 'cache.bin')),
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': 16384,
+            'SLOT_SIZE': 1024,      # kalit + pickle qilingan qiymat; kattaroqlari keshlanmaydi
+            'GROUP_SIZE': 8,        # LRU shu slotlar ichida ishlaydi
+        },
+    }
+}
+
+# Batch endpoint (accounts.batch) - har bir ichki chaqiruv uchun cheklovlar
+BATCH_API = {
+    'MAX_CALLS': 10,
+    'MAX_CALL_BODY_BYTES': 16 * 1024,
+    'MAX_CALL_RESPONSE_BYTES': 1024 * 1024,
+}
+
+# Login hodisalari va statistikasi (accounts.login_events)
+LOGIN_EVENTS = {
+    'BATCH_SIZE': 200,              # bufer shu hajmga yetganda yoziladi
+    'FLUSH_INTERVAL': 5,            # yoki shuncha soniyadan keyin
+    'RETENTION_DAYS': 7,            # xom hodisalar saqlanadigan muddat
+    'ROLLUP_LOOKBACK_HOURS': 2,     # har rollup'da qayta hisoblanadigan oyna
+}
+
+# Fon vazifalari navbati (accounts.jobs)
+JOB_QUEUE = {
+    'MAX_ATTEMPTS': 5,
+    'BACKOFF_BASE': 5,      # soniya, har urinishda ikki barobar oshadi
+    'BACKOFF_MAX': 3600,
+    'LOCK_TIMEOUT': 600,    # shu vaqtdan keyin band qilingan vazifa qayta navbatga qaytadi
+}
+
+# Idempotency-Key bo'yicha saqlangan javoblar (accounts.idempotency)
+IDEMPOTENCY = {
+    'TTL': 24 * 3600,       # javob shuncha vaqt saqlanadi
+    'LOCK_TIMEOUT': 60,     # to'xtab qolgan so'rov kaliti shu vaqtdan keyin bo'shaydi
+}
+
+# So'rov profilerlash (accounts.profiling): super admin uchun X-Profile: 1 yoki ?_profile=1
+REQUEST_PROFILING = {
+    'SAMPLE_RATE': 0.0,     # tasodifiy tanlanadigan so'rovlar ulushi (0.001 = 0.1%)
+    'DIR': os.environ.get('DJANGO_PROFILE_DIR', str(BASE_DIR / 'var' / 'profiles')),  # 0700, shu foydalanuvchiniki
+    'MAX_REPORTS': 50,      # diskda saqlanadigan hisobotlar soni
+}
+
+# Javoblarni siqish (warehouse_project.compression); brotli o'rnatilmagan bo'lsa faqat gzip
+COMPRESSION = {
+    'MIN_SIZE': 1024,       # bundan kichik javoblar siqilmaydi (bayt)
+    'BROTLI_QUALITY': 4,    # dinamik javoblar uchun tezlik/hajm muvozanati
+}
+
+# Email xabarnomalari (production'da SMTP sozlanadi)
+EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
+DEFAULT_FROM_EMAIL = 'noreply@warehouse.local'
+
 # CORS sozlamalari
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
@@ -195,6 +305,20 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')  # Bu qatorni qo'shing
 STATICFILES_DIRS = [
     os.path.join(BASE_DIR, 'static'),  # Agar qo'shimcha static papkalar bo'lsa
 ]
+# collectstatic hash'langan nomlar va .gz/.br nusxalarini yozadi (warehouse_project.staticfiles).
+# Manifest bo'lmasa (collectstatic ishlamagan) hash'siz nomlar ishlatiladi; production'da
+# collectstatic deploy bosqichi - launcher manifest yo'qligida ogohlantiradi.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'warehouse_project.staticfiles.PrecompressedManifestStaticFilesStorage',
+    },
+}
+# DJANGO_SERVE_STATIC=1 - STATIC_ROOT'ni Django o'zi beradi (immutable kesh, oldindan siqilgan
+# variantlar). Standart o'chiq: /static/ ni veb-server (nginx / PythonAnywhere static mapping) beradi.
+SERVE_STATIC = os.environ.get('DJANGO_SERVE_STATIC', '0') == '1'
 
 
 
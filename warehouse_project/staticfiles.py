@@ -0,0 +1,117 @@
+"""
+Hash'langan va oldindan siqilgan statik fayllar.
+
+``collectstatic`` ``PrecompressedManifestStaticFilesStorage`` bilan har bir
+fayl nomiga kontent hash'ini qo'shadi (``base.css`` -> ``base.5af6.css``)
+va siqiladigan fayllar yoniga ``.gz`` hamda (brotli o'rnatilgan bo'lsa)
+``.br`` nusxalarini yozadi. ``serve_static`` ulardan mijoz qabul qiladigan
+eng kichigini beradi; hash'langan nomlar o'zgarmaydi, shuning uchun ular
+bir yillik ``immutable`` kesh sarlavhasi bilan yuboriladi.
+
+nginx ham shu fayllardan foydalana oladi (``gzip_static on; brotli_static on;``).
+
+collectstatic hali ishlamagan bo'lsa (manifest yo'q - dev/test muhiti)
+storage hash'siz nomlarni qaytaradi: DEBUG=False'da ham sahifalar 500 bermaydi.
+Production'da collectstatic deploy bosqichi - launcher manifest yo'qligida ogohlantiradi.
+"""
+import gzip
+import mimetypes
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .compression import brotli, choose_encoding, get_setting, is_compressible
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+# Hash'siz nomlar (masalan, to'g'ridan-to'g'ri havolalar) qisqa muddat keshlanadi
+DEFAULT_CACHE_CONTROL = 'public, max-age=300'
+EXTENSIONS = {'br': '.br', 'gzip': '.gz'}
+
+
+class PrecompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    # Manifest'da yo'q fayl (collectstatic'dan keyin qo'shilgan) xato emas - hash'siz nom ishlatiladi
+    manifest_strict = False
+
+    def stored_name(self, name):
+        # Manifest umuman yo'q: hash'lash uchun STATIC_ROOT'da fayl ham yo'q (aks holda ValueError -> 500)
+        if not self.manifest_hash:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        names = set(paths) | set(self.hashed_files.values())
+        candidates = [
+            name for name in names
+            if not name.endswith(('.gz', '.br')) and is_compressible(mimetypes.guess_type(name)[0] or '')
+        ]
+        # zlib va brotli GIL'ni bo'shatadi - thread'lar yetarli
+        with ThreadPoolExecutor() as executor:
+            for name, written in zip(candidates, executor.map(self.compress_file, candidates)):
+                if written:
+                    yield name, f"{name} ({', '.join(written)})", True
+
+    def compress_file(self, name):
+        """``name.gz`` / ``name.br`` yozish (faqat sezilarli kichraysa); yozilgan kengaytmalar"""
+        path = self.path(name)
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < get_setting('MIN_SIZE'):
+            return []
+        variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants['.br'] = brotli.compress(data, quality=11)
+        written = []
+        for ext, compressed in variants.items():
+            if len(compressed) < len(data) * 0.95:
+                with open(path + ext, 'wb') as f:
+                    f.write(compressed)
+                written.append(ext)
+        return written
+
+
+def serve_static(request, path):
+    """STATIC_ROOT'dan fayl berish: oldindan siqilgan variant va kesh sarlavhalari bilan"""
+    # STATIC_ROOT'dan tashqariga chiqish (../) SuspiciousFileOperation -> 400
+    full_path = safe_join(settings.STATIC_ROOT, path)
+    if not os.path.isfile(full_path):
+        raise Http404
+
+    stat = os.stat(full_path)
+    hashed_names = getattr(staticfiles_storage, 'hashed_files', {}).values()
+    immutable = path in hashed_names
+    if not immutable and not was_modified_since(
+        request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime
+    ):
+        return HttpResponseNotModified()
+
+    content_type, _ = mimetypes.guess_type(full_path)
+    encoding = None
+    available = tuple(
+        coding for coding, ext in EXTENSIONS.items() if os.path.isfile(full_path + ext)
+    )
+    if available:
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''), available)
+
+    file_path = full_path + EXTENSIONS[encoding] if encoding else full_path
+    response = FileResponse(
+        open(file_path, 'rb'),
+        content_type=content_type or 'application/octet-stream',
+        filename=os.path.basename(full_path),
+    )
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = IMMUTABLE_CACHE_CONTROL if immutable else DEFAULT_CACHE_CONTROL
+    if available:
+        patch_vary_headers(response, ('Accept-Encoding',))
+    if encoding:
+        response['Content-Encoding'] = encoding
+    return response
@@ -0,0 +1,152 @@
+"""SharedMemoryCache: Django cache API, TTL, LRU, clear, sig'maydigan qiymatlar va jarayonlararo ko'rinish"""
+import itertools
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+
+from warehouse_project import cache as cache_module
+from warehouse_project.cache import SharedMemoryCache
+
+
+def incr_many(location, params, times):
+    cache = SharedMemoryCache(location, params)
+    for _ in range(times):
+        cache.incr('counter')
+    cache.set(f'child:{os.getpid()}', os.getpid())
+
+
+class SharedMemoryCacheTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.location = os.path.join(directory, 'cache.bin')
+        patcher = mock.patch.dict(cache_module._stores, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_cache(self, location=None, **options):
+        options = {'MAX_ENTRIES': 64, 'SLOT_SIZE': 256, 'GROUP_SIZE': 8, **options}
+        self.params = {'TIMEOUT': 300, 'OPTIONS': options}
+        return SharedMemoryCache(location or self.location, self.params)
+
+    def clock(self):
+        # Har chaqiruvda bir soniya oldinga - LRU tartibi aniq bo'ladi
+        return mock.patch('time.time', side_effect=itertools.count(time.time()))
+
+    def test_set_get_delete(self):
+        cache = self.make_cache()
+        cache.set('user:1', {'id': 1, 'warehouses': [1, 4]})
+        self.assertEqual(cache.get('user:1'), {'id': 1, 'warehouses': [1, 4]})
+        self.assertTrue(cache.has_key('user:1'))
+        self.assertEqual(cache.get('missing', 'default'), 'default')
+        self.assertTrue(cache.delete('user:1'))
+        self.assertFalse(cache.delete('user:1'))
+        self.assertIsNone(cache.get('user:1'))
+        # Versiya kalitning bir qismi
+        cache.set('key', 'v1', version=1)
+        self.assertIsNone(cache.get('key', version=2))
+
+    def test_add_and_incr(self):
+        cache = self.make_cache()
+        self.assertTrue(cache.add('n', 1))
+        self.assertFalse(cache.add('n', 5))
+        self.assertEqual(cache.incr('n', 10), 11)
+        self.assertEqual(cache.decr('n'), 10)
+        self.assertEqual(cache.get('n'), 10)
+        with self.assertRaises(ValueError):
+            cache.incr('missing')
+
+    def test_ttl_and_touch(self):
+        cache = self.make_cache()
+        with mock.patch('time.time', return_value=1000.0):
+            cache.set('short', 1, timeout=10)
+            cache.set('forever', 2, timeout=None)
+            cache.set('touched', 3, timeout=10)
+            self.assertTrue(cache.touch('touched', 100))
+        with mock.patch('time.time', return_value=1050.0):
+            self.assertIsNone(cache.get('short'))
+            self.assertFalse(cache.touch('short'))
+            self.assertEqual(cache.get('forever'), 2)
+            self.assertEqual(cache.get('touched'), 3)
+            # Muddati o'tgan kalitga add() yoza oladi
+            self.assertTrue(cache.add('short', 4))
+
+    def test_lru_eviction_within_group(self):
+        # Bitta guruh, 8 slot
+        cache = self.make_cache(MAX_ENTRIES=8)
+        with self.clock():
+            for i in range(8):
+                cache.set(f'k{i}', i)
+            cache.get('k0')
+            cache.set('k8', 8)
+        self.assertEqual(cache.get('k0'), 0)
+        self.assertIsNone(cache.get('k1'))
+        self.assertEqual([cache.get(f'k{i}') for i in range(2, 9)], list(range(2, 9)))
+
+    def test_clear(self):
+        cache = self.make_cache()
+        cache.set_many({'a': 1, 'b': 2})
+        other = SharedMemoryCache(self.location, self.params)
+        other.clear()
+        self.assertEqual(cache.get_many(['a', 'b']), {})
+        cache.set('a', 3)
+        self.assertEqual(other.get('a'), 3)
+
+    def test_oversize_value_is_not_cached(self):
+        cache = self.make_cache()
+        cache.set('big', 'small')
+        cache.set('big', 'x' * 1000)
+        # Eski qiymat qolib ketmaydi
+        self.assertIsNone(cache.get('big'))
+        self.assertFalse(cache.add('big2', 'x' * 1000))
+        cache.set('n', 1)
+        with self.assertRaises(ValueError):
+            cache._store.update(cache._key('n', None), lambda old: old * 1000)
+        self.assertEqual(cache.get('n'), 1)
+
+    def test_visible_across_processes(self):
+        cache = self.make_cache()
+        cache.set('counter', 0)
+        context = multiprocessing.get_context('fork')
+        processes = [context.Process(target=incr_many, args=(self.location, self.params, 50)) for _ in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join(30)
+            self.assertEqual(process.exitcode, 0)
+        # incr jarayonlar orasida atomar
+        self.assertEqual(cache.get('counter'), 200)
+        for process in processes:
+            self.assertEqual(cache.get(f'child:{process.pid}'), process.pid)
+
+    def test_requires_location(self):
+        with self.assertRaises(ImproperlyConfigured):
+            SharedMemoryCache('', {})
+
+    def test_rejects_unsafe_files(self):
+        self.make_cache()
+        os.chmod(self.location, 0o644)
+        cache_module._stores.clear()
+        with self.assertRaises(ImproperlyConfigured):
+            self.make_cache()
+
+        link = os.path.join(os.path.dirname(self.location), 'link.bin')
+        os.symlink(self.location, link)
+        with self.assertRaises(ImproperlyConfigured):
+            self.make_cache(link)
+
+    def test_layout_change_replaces_file(self):
+        old = self.make_cache()
+        old.set('a', 1)
+        inode = os.stat(self.location).st_ino
+        new = self.make_cache(SLOT_SIZE=512)
+        self.assertNotEqual(os.stat(self.location).st_ino, inode)
+        self.assertIsNone(new.get('a'))
+        # Eski worker qayta ishga tushguncha o'z nusxasidan foydalanadi (SIGBUS yo'q)
+        self.assertEqual(old.get('a'), 1)
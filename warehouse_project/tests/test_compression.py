@@ -0,0 +1,167 @@
+"""Javoblarni siqish: Accept-Encoding muzokarasi, Vary, oqimlar va oldindan siqilgan statik fayllar"""
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import zlib
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.utils.http import http_date
+
+from warehouse_project import compression, staticfiles
+from warehouse_project.compression import CompressionMiddleware, choose_encoding
+from warehouse_project.staticfiles import PrecompressedManifestStaticFilesStorage
+
+BODY = b'{"users": [' + b','.join(b'{"id": %d, "username": "user%d"}' % (i, i) for i in range(200)) + b']}'
+
+
+class ChooseEncodingTests(SimpleTestCase):
+    def test_negotiation(self):
+        available = ('br', 'gzip')
+        self.assertEqual(choose_encoding('gzip, deflate, br', available), 'br')
+        self.assertEqual(choose_encoding('br;q=0.5, gzip', available), 'gzip')
+        self.assertEqual(choose_encoding('br;q=0, gzip;q=0.1', available), 'gzip')
+        self.assertEqual(choose_encoding('*;q=0.3', available), 'br')
+        self.assertEqual(choose_encoding('*, br;q=0', available), 'gzip')
+        self.assertIsNone(choose_encoding('identity, deflate', available))
+        self.assertIsNone(choose_encoding('gzip;q=0, br;q=bad', available))
+        self.assertIsNone(choose_encoding('', available))
+
+    def test_brotli_is_optional(self):
+        with mock.patch.object(compression, 'brotli', None):
+            self.assertEqual(choose_encoding('br, gzip'), 'gzip')
+            self.assertIsNone(choose_encoding('br'))
+
+
+@mock.patch.object(compression, 'brotli', None)
+class CompressionMiddlewareTests(SimpleTestCase):
+    def process(self, response, accept_encoding='gzip'):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_gzip(self):
+        response = HttpResponse(BODY, content_type='application/json')
+        response['ETag'] = '"abc"'
+        response = self.process(response)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(response['ETag'], 'W/"abc"')
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertEqual(gzip.decompress(response.content), BODY)
+
+    def test_not_accepted_still_varies(self):
+        response = self.process(HttpResponse(BODY, content_type='application/json'), 'identity')
+        self.assertNotIn('Content-Encoding', response)
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(response.content, BODY)
+
+    def test_skipped_responses(self):
+        for response in (
+            HttpResponse(b'{}', content_type='application/json'),
+            HttpResponse(BODY, content_type='image/png'),
+            HttpResponse(status=204),
+        ):
+            response = self.process(response)
+            self.assertNotIn('Content-Encoding', response)
+            self.assertFalse(response.has_header('Vary'))
+
+    def test_async_stream_is_one_gzip_member(self):
+        chunks = [BODY[:500], BODY[500:1500], BODY[1500:]]
+
+        async def content():
+            for chunk in chunks:
+                yield chunk
+
+        response = self.process(StreamingHttpResponse(content(), content_type='application/json'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+        async def collect():
+            return [part async for part in response.streaming_content]
+
+        parts = async_to_sync(collect)()
+        decompressor = zlib.decompressobj(wbits=31)
+        received = b''
+        for part in parts[:2]:
+            received += decompressor.decompress(part)
+        # Sync flush: birinchi bo'lak oqim tugashini kutmasdan yechiladi
+        self.assertEqual(received, chunks[0])
+        for part in parts[2:]:
+            received += decompressor.decompress(part)
+        self.assertEqual(received, BODY)
+        self.assertTrue(decompressor.eof)
+        self.assertEqual(decompressor.unused_data, b'')
+
+
+@override_settings(DEBUG=False)
+class ManifestStorageTests(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+    def storage(self):
+        return PrecompressedManifestStaticFilesStorage(location=self.root, base_url='/static/')
+
+    def test_without_manifest_uses_plain_names(self):
+        # collectstatic ishlamagan: 500 o'rniga hash'siz URL
+        self.assertEqual(self.storage().url('css/app.css'), '/static/css/app.css')
+
+    def test_with_manifest_uses_hashed_names(self):
+        with open(os.path.join(self.root, 'staticfiles.json'), 'w') as f:
+            json.dump({'version': '1.1', 'paths': {'css/app.css': 'css/app.5af6.css'}, 'hash': 'abc'}, f)
+        self.assertEqual(self.storage().url('css/app.css'), '/static/css/app.5af6.css')
+
+
+class ServeStaticTests(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        settings = override_settings(STATIC_ROOT=self.root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        os.makedirs(os.path.join(self.root, 'css'))
+        self.css = os.path.join(self.root, 'css', 'app.css')
+        with open(self.css, 'wb') as f:
+            f.write(b'body { color: red; }\n' * 100)
+        with open(self.css + '.gz', 'wb') as f:
+            f.write(gzip.compress(b'body { color: red; }\n' * 100))
+
+    def get(self, path, **headers):
+        return staticfiles.serve_static(RequestFactory().get('/static/' + path, **headers), path)
+
+    def test_precompressed_variant(self):
+        response = self.get('css/app.css', HTTP_ACCEPT_ENCODING='br, gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(response['Cache-Control'], staticfiles.DEFAULT_CACHE_CONTROL)
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), b'body { color: red; }\n' * 100)
+
+        plain = self.get('css/app.css', HTTP_ACCEPT_ENCODING='gzip;q=0')
+        self.assertNotIn('Content-Encoding', plain)
+        self.assertEqual(plain['Vary'], 'Accept-Encoding')
+        self.assertEqual(b''.join(plain.streaming_content), b'body { color: red; }\n' * 100)
+        for response in (response, plain):
+            response.close()
+
+    def test_without_variants_and_immutable(self):
+        os.remove(self.css + '.gz')
+        storage = mock.Mock(hashed_files={'css/app.css': 'css/app.css'})
+        with mock.patch.object(staticfiles, 'staticfiles_storage', storage):
+            response = self.get('css/app.css', HTTP_ACCEPT_ENCODING='gzip')
+        response.close()
+        self.assertNotIn('Content-Encoding', response)
+        self.assertFalse(response.has_header('Vary'))
+        self.assertEqual(response['Cache-Control'], staticfiles.IMMUTABLE_CACHE_CONTROL)
+
+    def test_not_modified_and_missing(self):
+        mtime = os.stat(self.css).st_mtime
+        self.assertEqual(self.get('css/app.css', HTTP_IF_MODIFIED_SINCE=http_date(mtime)).status_code, 304)
+        with self.assertRaises(Http404):
+            self.get('css/missing.css')
+        with self.assertRaises(SuspiciousFileOperation):
+            self.get('../settings.py')
@@ -0,0 +1,25 @@
+"""Launcher: worker warm-up DB ulanishini faqat sync worker'da oldindan ochadi"""
+from unittest import mock
+
+from django.test import SimpleTestCase
+from gunicorn.config import Config
+
+from warehouse_project import launcher
+
+
+class PostForkTests(SimpleTestCase):
+    def post_fork(self, **options):
+        cfg = Config()
+        for key, value in options.items():
+            cfg.set(key, value)
+        server = mock.Mock(cfg=cfg)
+        with mock.patch('warehouse_project.warmup.warm_up_worker', return_value={}) as warm_up, \
+                mock.patch('django.db.connections.close_all') as close_all:
+            launcher.post_fork(server, mock.Mock(pid=1))
+        return warm_up.call_args.kwargs['connect'], close_all.called
+
+    def test_connects_only_in_sync_worker(self):
+        self.assertEqual(self.post_fork(), (True, False))
+        # gthread: so'rovlar pool thread'larida - asosiy thread ulanishi yopiladi
+        self.assertEqual(self.post_fork(threads=4), (False, True))
+        self.assertEqual(self.post_fork(worker_class='uvicorn_worker.UvicornWorker'), (False, True))
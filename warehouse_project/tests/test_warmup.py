@@ -0,0 +1,61 @@
+"""Worker warm-up: URL resolver bo'ylab yurish va ASGI lifespan"""
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase
+from django.urls import get_resolver, resolve
+
+from warehouse_project import warmup
+
+
+class WarmUrlsTests(SimpleTestCase):
+    def test_walks_every_included_urlconf(self):
+        paths = list(warmup._walk_urls(get_resolver().url_patterns, '/'))
+        self.assertIn('/api/auth/users/1/activate/', paths)
+        self.assertIn('/admin/', paths)
+        self.assertIn('/swagger/', paths)
+        for path in paths:
+            if path.startswith('/api/'):
+                resolve(path)
+
+
+class LifespanTests(SimpleTestCase):
+    def run_lifespan(self, app):
+        messages = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        async_to_sync(app)({'type': 'lifespan'}, receive, send)
+        return [message['type'] for message in sent]
+
+    def test_startup_warms_worker_once(self):
+        inner = mock.AsyncMock()
+        with mock.patch.object(warmup, '_warmed', set()), \
+                mock.patch.object(warmup, 'warm_up_app', side_effect=lambda: warmup._warmed.add('app')) as app, \
+                mock.patch.object(warmup, 'warm_up_worker') as worker:
+            sent = self.run_lifespan(warmup.lifespan(inner))
+            self.run_lifespan(warmup.lifespan(inner))
+
+        self.assertEqual(sent, ['lifespan.startup.complete', 'lifespan.shutdown.complete'])
+        app.assert_called_once_with()
+        worker.assert_called_with(connect=False)
+        inner.assert_not_called()
+
+    def test_skips_stages_done_by_launcher(self):
+        with mock.patch.object(warmup, '_warmed', {'app', 'worker'}), \
+                mock.patch.object(warmup, 'warm_up_app') as app, \
+                mock.patch.object(warmup, 'warm_up_worker') as worker:
+            self.run_lifespan(warmup.lifespan(mock.AsyncMock()))
+        app.assert_not_called()
+        worker.assert_not_called()
+
+    def test_http_is_passed_through(self):
+        inner = mock.AsyncMock()
+        scope = {'type': 'http'}
+        async_to_sync(warmup.lifespan(inner))(scope, None, None)
+        inner.assert_awaited_once_with(scope, None, None)
@@ -1,29 +1,43 @@
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from rest_framework import permissions
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-
-# Swagger sozlamalari
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Warehouse CRM API",
-        default_version='v1',
-        description="Qurilish mollari CRM tizimi API dokumentatsiyasi",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="contact@warehouse.local"),
-        license=openapi.License(name="BSD License"),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
-)
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/auth/', include('accounts.urls')),
-    
-    # Swagger URLs
-    path('swagger<format>/', schema_view.without_ui(cache_timeout=0), name='schema-json'),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
-]
\ No newline at end of file
+]
+
+# collectstatic natijasini immutable kesh va .br/.gz variantlari bilan berish
+if getattr(settings, 'SERVE_STATIC', False):
+    from warehouse_project.staticfiles import serve_static
+
+    urlpatterns += [
+        re_path(r'^%s(?P<path>.*)$' % settings.STATIC_URL.lstrip('/'), serve_static),
+    ]
+
+# Swagger faqat drf_yasg yuklangan bo'lsa (CLI rejimida yo'q)
+if 'drf_yasg' in settings.INSTALLED_APPS:
+    from drf_yasg.views import get_schema_view
+    from drf_yasg import openapi
+
+    # Swagger sozlamalari
+    schema_view = get_schema_view(
+        openapi.Info(
+            title="Warehouse CRM API",
+            default_version='v1',
+            description="Qurilish mollari CRM tizimi API dokumentatsiyasi",
+            terms_of_service="https://www.google.com/policies/terms/",
+            contact=openapi.Contact(email="contact@warehouse.local"),
+            license=openapi.License(name="BSD License"),
+        ),
+        public=True,
+        permission_classes=(permissions.AllowAny,),
+    )
+
+    urlpatterns += [
+        # Swagger URLs
+        path('swagger<format>/', schema_view.without_ui(cache_timeout=0), name='schema-json'),
+        path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
+        path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    ]
\ No newline at end of file
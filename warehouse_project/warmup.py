@@ -0,0 +1,174 @@
+"""
+Worker "isitish" (warm-up) rutinlari.
+
+Birinchi so'rov URL resolver'ni kompilyatsiya qilish, drf_yasg va
+serializer klasslarini qurish, bazaga ulanish va hasher importi uchun
+to'lamasligi uchun shu ishlarni oldindan bajaradi.
+
+``warm_up_app()`` fork'dan oldin master jarayonda (copy-on-write bilan
+barcha worker'larga ulashiladi), ``warm_up_worker()`` esa har bir worker
+ichida fork'dan keyin chaqiriladi (``warehouse_project.launcher``).
+
+Gunicorn'siz ASGI server (``uvicorn warehouse_project.asgi:application``)
+bu hook'larni chaqirmaydi - u yerda ``lifespan()`` o'ramasi worker'ni
+``lifespan.startup`` hodisasida isitadi.
+"""
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+_CONVERTER_RE = re.compile(r'<(?:\w+:)?\w+>')
+# fork'dan keyin ham saqlanadi: launcher isitgan bosqich lifespan'da takrorlanmaydi
+_warmed = set()
+
+
+@contextmanager
+def _timed(timings, name):
+    # Warm-up xatosi serverni to'xtatmasligi kerak - faqat logga yoziladi
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        logger.exception("Warm-up bosqichi bajarilmadi: %s", name)
+    finally:
+        timings[name] = round((time.perf_counter() - start) * 1000, 2)
+
+
+def _walk_urls(patterns, prefix):
+    """Barcha regex'larni kompilyatsiya qilish; ``path()`` marshrutlari uchun namunaviy URL'lar"""
+    from django.urls import URLResolver
+    from django.urls.resolvers import RoutePattern
+
+    for pattern in patterns:
+        pattern.pattern.regex  # birinchi murojaatda kompilyatsiya qilinadi va keshlanadi
+        # re_path() ichidagilar uchun URL yasab bo'lmaydi - faqat kompilyatsiya
+        route = prefix + _CONVERTER_RE.sub('1', str(pattern.pattern)) \
+            if prefix is not None and isinstance(pattern.pattern, RoutePattern) else None
+        if isinstance(pattern, URLResolver):
+            yield from _walk_urls(pattern.url_patterns, route)
+        elif route is not None:
+            yield route
+
+
+def _warm_urls():
+    from django.urls import Resolver404, get_resolver, resolve
+
+    resolver = get_resolver()
+    resolver.reverse_dict  # reverse() jadvallarini to'ldirish
+    for path in _walk_urls(resolver.url_patterns, '/'):
+        try:
+            resolve(path)
+        except Resolver404:
+            pass
+
+
+def _warm_serializers():
+    from accounts import serializers
+
+    for name in dir(serializers):
+        cls = getattr(serializers, name)
+        if isinstance(cls, type) and issubclass(cls, serializers.serializers.BaseSerializer) \
+                and cls.__module__ == serializers.__name__:
+            # .fields ModelSerializer maydonlarini model metadata'sidan quradi
+            cls().fields
+
+
+def _warm_schema():
+    from django.conf import settings
+    if 'drf_yasg' not in settings.INSTALLED_APPS:
+        return
+    from drf_yasg import openapi
+    from drf_yasg.generators import OpenAPISchemaGenerator
+
+    # Barcha view'lar uchun inspector va serializer sxemalarini quradi
+    info = openapi.Info(title="Warehouse CRM API", default_version='v1')
+    OpenAPISchemaGenerator(info).get_schema(request=None, public=True)
+
+
+def _warm_hashers():
+    from django.contrib.auth.hashers import get_hasher, get_hashers
+
+    get_hashers()
+    get_hasher('default')
+
+
+def warm_up_app():
+    """Fork'dan oldin: faqat jarayonlar orasida xavfsiz ulashiladigan holat"""
+    _warmed.add('app')
+    timings = {}
+    with _timed(timings, 'urls'):
+        _warm_urls()
+    with _timed(timings, 'serializers'):
+        _warm_serializers()
+    with _timed(timings, 'schema'):
+        _warm_schema()
+    with _timed(timings, 'hashers'):
+        _warm_hashers()
+
+    # Fork'dan oldin ochilgan ulanishlar worker'lar orasida ulashilmasligi kerak
+    from django.db import connections
+    connections.close_all()
+    logger.info("App warm-up (ms): %s", timings)
+    return timings
+
+
+def warm_up_worker(connect=True):
+    """Fork'dan keyin: ulanishlar va jarayon ichidagi keshlar"""
+    from django.contrib.contenttypes.models import ContentType
+    from django.db import connections
+
+    from accounts.throttling import get_store
+
+    _warmed.add('worker')
+    timings = {}
+    if connect:
+        with _timed(timings, 'database'):
+            for connection in connections.all():
+                connection.ensure_connection()
+    with _timed(timings, 'contenttypes'):
+        from django.apps import apps
+        ContentType.objects.get_for_models(*apps.get_models())
+    with _timed(timings, 'throttle_store'):
+        get_store()
+    logger.info("Worker warm-up (ms): %s", timings)
+    return timings
+
+
+def _warm_up_asgi_worker():
+    from django.db import connections
+
+    if 'app' not in _warmed:
+        warm_up_app()
+    if 'worker' not in _warmed:
+        # ASGI'da sync view'lar har so'rovda o'z thread'ida ishlaydi, ulanish
+        # esa thread'ga bog'langan - oldindan ochilgan ulanish ularga o'tmaydi
+        warm_up_worker(connect=False)
+        connections.close_all()
+
+
+def lifespan(application):
+    """Django ASGI ilovasiga ``lifespan`` protokolini qo'shish (startup'da warm-up).
+
+    Django'ning o'zi lifespan'ni qo'llamaydi (uvicorn faqat ogohlantiradi),
+    shuning uchun u yerdagi worker'lar birinchi so'rovda sovuq edi.
+    """
+    async def app(scope, receive, send):
+        if scope['type'] != 'lifespan':
+            return await application(scope, receive, send)
+
+        from asgiref.sync import sync_to_async
+
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                if os.environ.get('WAREHOUSE_WARMUP', '1') == '1':
+                    await sync_to_async(_warm_up_asgi_worker, thread_sensitive=False)()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    return app